@@ -0,0 +1,655 @@
+"""
+Benchmark.py
+Microbenchmarks for the data structures used by the WGUPS Routing Program.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Benchmark.py
+# Purpose: Times the program's data structures against simpler alternatives
+
+# Standard Library
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+# Created Imports
+import Clock
+import Cluster
+import Fleet
+import Generator
+import Snapshot
+from Clock import BASE_DATE
+from Context import RoutingContext
+from HashTable import HashTable
+from Package import Package, PackageStatus, load_truck, read_packages, stream_packages
+from PackageRepository import PackageRepository
+from Simulation import EventKind, EventLog
+
+# Most seconds importing main may take. Importing it must not read the data files or start the optimizer.
+IMPORT_TIME_BUDGET = 0.1
+
+
+# The original fixed-size hash table with separate chaining. Kept here only as a baseline to
+# compare the open addressing table against.
+class ChainedHashTable:
+    """
+    Hash table with a fixed number of buckets and a singly linked list in each bucket.
+    """
+
+    # Holds the key, value, and next node in a bucket
+    class Node:
+        """
+        Represents a node in a singly linked list for hash table buckets.
+        """
+        def __init__(self, key=-1, value=None):
+            """
+            Initializes a Node.
+            Args:
+                key (int): Key for the node.
+                value (any): Value stored in the node.
+            """
+            self.key = key
+            self.value = value
+            self.next = None
+
+    def __init__(self, capacity=10):
+        """
+        Initializes the hash table with a given capacity.
+        Args:
+            capacity (int): Number of buckets in the hash table.
+        """
+        self.capacity = capacity
+        self.table = [ChainedHashTable.Node() for _ in range(capacity)]
+
+    # Inserts a key and value, replacing the value if the key exists
+    def insert(self, key: int, value: any) -> None:
+        """
+        Inserts a Node into the hash table.
+        Args:
+            key (int): Key for the node.
+            value (any): Value to store.
+        """
+        current = self.table[key % self.capacity]
+        if current.key == -1:
+            current.key = key
+            current.value = value
+            return
+
+        while current.key != key and current.next is not None:
+            current = current.next
+
+        if current.key == key:
+            current.value = value
+        else:
+            current.next = ChainedHashTable.Node(key, value)
+
+    # Returns the value of the key found or None
+    def lookup(self, key: int) -> any:
+        """
+        Returns the value of the key found or None.
+        Args:
+            key (int): Key to look up.
+        Returns:
+            any: Value associated with the key, or None if not found.
+        """
+        current = self.table[key % self.capacity]
+        while current is not None and current.key != key:
+            current = current.next
+
+        return current.value if current is not None else None
+
+
+# Wraps a dict with the same insert and lookup methods as the hash tables
+class DictTable:
+    """
+    Built-in dict behind the hash table's insert and lookup methods.
+    """
+    def __init__(self):
+        """
+        Initializes an empty dict.
+        """
+        self.table = {}
+
+    # Inserts a key and value
+    def insert(self, key: int, value: any) -> None:
+        """
+        Inserts a key and value.
+        Args:
+            key (int): Key to insert.
+            value (any): Value to store.
+        """
+        self.table[key] = value
+
+    # Returns the value of the key found or None
+    def lookup(self, key: int) -> any:
+        """
+        Returns the value of the key found or None.
+        Args:
+            key (int): Key to look up.
+        Returns:
+            any: Value associated with the key, or None if not found.
+        """
+        return self.table.get(key)
+
+
+# Times inserting and looking up num_keys keys in each kind of table
+def benchmark_hash_tables(num_keys: int = 10000, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Times insert and lookup for the open addressing table, the chained table, and a dict.
+    Args:
+        num_keys (int): Number of keys to insert and look up.
+        repeat (int): Number of runs to take the best time from.
+    Returns:
+        Dict[str, Dict[str, float]]: Best insert and lookup seconds for each table.
+    """
+    tables: Dict[str, Callable[[], any]] = {
+        "HashTable": HashTable,
+        "ChainedHashTable": ChainedHashTable,
+        "dict": DictTable,
+    }
+    keys = list(range(1, num_keys + 1))
+    results: Dict[str, Dict[str, float]] = {}
+
+    for name, create_table in tables.items():
+        def insert_all():
+            table = create_table()
+            for key in keys:
+                table.insert(key, key)
+            return table
+
+        filled = insert_all()
+
+        def lookup_all():
+            for key in keys:
+                filled.lookup(key)
+
+        results[name] = {
+            "insert": min(timeit.repeat(insert_all, number=1, repeat=repeat)),
+            "lookup": min(timeit.repeat(lookup_all, number=1, repeat=repeat)),
+        }
+
+    return results
+
+
+# Prints the hash table benchmark as a table
+def print_hash_table_benchmark(num_keys: int) -> None:
+    """
+    Runs the hash table benchmark and prints the results.
+    Args:
+        num_keys (int): Number of keys to insert and look up.
+    """
+    print("Hash tables with " + str(num_keys) + " keys")
+    print(f"{'Table':<18} {'insert (ms)':>12} {'lookup (ms)':>12}")
+    for name, times in benchmark_hash_tables(num_keys).items():
+        print(f"{name:<18} {times['insert'] * 1000:12.2f} {times['lookup'] * 1000:12.2f}")
+    print()
+
+
+# The original Package with a __dict__, datetime fields, and its own copy of every string. Kept here
+# only as a baseline to measure the compact Package against.
+class DictPackage:
+    """
+    Package that stores every field in its __dict__.
+    """
+    def __init__(self, package_id: int, address: str, city: str, state: str, zip_code: int,
+                 deadline: datetime.datetime, weight: int, special_notes: str, status: str,
+                 delivery_time: datetime.datetime):
+        """
+        Initializes a DictPackage.
+        Args:
+            package_id (int): Package ID.
+            address (str): Delivery address.
+            city (str): Delivery city.
+            state (str): Delivery state.
+            zip_code (int): Delivery zip code.
+            deadline (datetime.datetime): Delivery deadline.
+            weight (int): Package weight.
+            special_notes (str): Special notes or constraints.
+            status (str): Current status.
+            delivery_time (datetime.datetime): Delivery time.
+        """
+        self.id = package_id
+        self.address = address
+        self.city = city
+        self.state = state
+        self.zip_code = zip_code
+        self.deadline = deadline
+        self.weight = weight
+        self.special_notes = special_notes
+        self.status = status
+        self.delivery_time = delivery_time
+
+
+# Measures the bytes allocated per package for each package class
+def benchmark_package_memory(num_packages: int = 100000) -> Dict[str, float]:
+    """
+    Builds num_packages packages of each kind from freshly split CSV lines, like read_packages does,
+    and measures the memory they take with tracemalloc.
+    Args:
+        num_packages (int): Number of packages to build.
+    Returns:
+        Dict[str, float]: Bytes per package for each class.
+    """
+    lines = [str(package_id) + ",4580 S 2300 E,Salt Lake City,UT,84117,At the Hub"
+             for package_id in range(num_packages)]
+    deadline = datetime.datetime(year=1900, month=1, day=1, hour=10, minute=30)
+    delivery_time = datetime.datetime(year=1900, month=1, day=1, hour=9, minute=15)
+    classes = {"DictPackage": DictPackage, "Package": Package}
+    results: Dict[str, float] = {}
+
+    for name, package_class in classes.items():
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        packages: List[any] = []
+        for line in lines:
+            fields = line.split(",")
+
+            # Each package gets its own datetime objects, as they would from parsing. The old package kept
+            # its status as a string.
+            status = fields[5] if package_class is DictPackage else PackageStatus.AT_HUB
+            packages.append(package_class(int(fields[0]), fields[1], fields[2], fields[3], int(fields[4]),
+                                          deadline.replace(), 2, "", status, delivery_time.replace()))
+
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results[name] = (after - before) / num_packages
+        del packages
+
+    return results
+
+
+# Prints the package memory benchmark
+def print_package_memory_benchmark(num_packages: int) -> None:
+    """
+    Runs the package memory benchmark and prints the results.
+    Args:
+        num_packages (int): Number of packages to build.
+    """
+    print("Package memory with " + str(num_packages) + " packages")
+    print(f"{'Class':<18} {'bytes/package':>14}")
+    for name, size in benchmark_package_memory(num_packages).items():
+        print(f"{name:<18} {size:14.1f}")
+    print()
+
+
+# Times packing a large day onto a large fleet
+def benchmark_fleet_loading(num_packages: int = 50000, num_trucks: int = 500, num_stops: int = 2000,
+                            repeat: int = 3) -> Dict[str, float]:
+    """
+    Times packing every package onto the fleet at once, the way the simulation splits the hub's
+    packages into loads, and loading the trucks one after another from the front of the package list
+    the way a run is filled from its load.
+    Args:
+        num_packages (int): Number of packages.
+        num_trucks (int): Number of trucks.
+        num_stops (int): Number of different stops the packages go to.
+        repeat (int): Number of runs to take the best time from.
+    Returns:
+        Dict[str, float]: Best seconds for each way of loading.
+    """
+    rng = random.Random(0)
+    packages = []
+    for package_id in range(1, num_packages + 1):
+        package = Package(package_id, weight=rng.randint(1, 50))
+        package.vertex_id = rng.randrange(num_stops)
+        packages.append(package)
+
+    # Leave about a fifth of each truck free, so the weight limit matters as much as the count
+    max_packages = num_packages // num_trucks * 6 // 5 + 1
+    fleet = Fleet.make_fleet(num_trucks, max_packages, max_packages * 25)
+
+    def load_one_by_one():
+        remaining = list(packages)
+        for spec in fleet:
+            load_truck([], remaining, spec.max_packages, spec.number, spec.max_weight)
+
+    return {
+        "pack_fleet": min(timeit.repeat(lambda: Fleet.pack_fleet(packages, fleet), number=1, repeat=repeat)),
+        "load_truck": min(timeit.repeat(load_one_by_one, number=1, repeat=repeat)),
+    }
+
+
+# Prints the fleet loading benchmark
+def print_fleet_loading_benchmark(num_packages: int, num_trucks: int) -> None:
+    """
+    Runs the fleet loading benchmark and prints the results.
+    Args:
+        num_packages (int): Number of packages.
+        num_trucks (int): Number of trucks.
+    """
+    print("Loading " + str(num_packages) + " packages onto " + str(num_trucks) + " trucks")
+    print(f"{'Loader':<18} {'time (ms)':>12}")
+    for name, seconds in benchmark_fleet_loading(num_packages, num_trucks).items():
+        print(f"{name:<18} {seconds * 1000:12.2f}")
+    print()
+
+
+# Times reading a large package file, and how soon the first package comes out of the stream
+def benchmark_package_ingestion(num_packages: int = 200000) -> Dict[str, float]:
+    """
+    Writes a package file with num_packages rows and times streaming the first package out of it,
+    streaming all of it, and loading all of it into a repository.
+    Args:
+        num_packages (int): Number of rows in the file.
+    Returns:
+        Dict[str, float]: Seconds for each step.
+    """
+    deadlines = ["EOD", "10:30 AM", "9:00 AM", "EOD", "5:00 PM"]
+    with tempfile.NamedTemporaryFile(mode='w', suffix=".csv", delete=False) as file:
+        file.write("Package ID,Address,City,State,Zip,Delivery Deadline,Weight KILO,Special Notes\n")
+        for package_id in range(1, num_packages + 1):
+            file.write(str(package_id) + ",4580 S 2300 E,Salt Lake City,UT,84117,"
+                       + deadlines[package_id % len(deadlines)] + "," + str(package_id % 50 + 1) + ",\n")
+
+    try:
+        start = timeit.default_timer()
+        stream = stream_packages(file.name)
+        next(stream)
+        first = timeit.default_timer() - start
+        stream.close()
+
+        start = timeit.default_timer()
+        for _ in stream_packages(file.name):
+            pass
+        streamed = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        read_packages(file.name)
+        loaded = timeit.default_timer() - start
+    finally:
+        os.remove(file.name)
+
+    return {"first package": first, "stream all": streamed, "read_packages": loaded}
+
+
+# Prints the package ingestion benchmark
+def print_package_ingestion_benchmark(num_packages: int) -> None:
+    """
+    Runs the package ingestion benchmark and prints the results.
+    Args:
+        num_packages (int): Number of rows in the file.
+    """
+    print("Reading " + str(num_packages) + " packages")
+    print(f"{'Step':<18} {'time (ms)':>12}")
+    for name, seconds in benchmark_package_ingestion(num_packages).items():
+        print(f"{name:<18} {seconds * 1000:12.2f}")
+    print()
+
+
+# Times checkpointing a large day and restoring it
+def benchmark_snapshot(num_packages: int = 1000000) -> Dict[str, float]:
+    """
+    Builds a day of num_packages packages, with half of them delivered between 9:00 and 17:00, and
+    times a full snapshot at 12:00, an incremental one at 13:00, reading the full one, restoring the
+    chain of both, and building the packages and event log back out of the restored columns.
+    Args:
+        num_packages (int): Number of packages.
+    Returns:
+        Dict[str, float]: Seconds for each step.
+    """
+    rng = random.Random(0)
+    addresses = [str(number) + " Main St" for number in range(500)]
+    packages = PackageRepository()
+    packages.insert_many((package_id, Package(package_id, addresses[package_id % 500], "Salt Lake City", "UT",
+                                              84100 + package_id % 100, BASE_DATE, package_id % 50 + 1, "",
+                                              PackageStatus.AT_HUB))
+                         for package_id in range(1, num_packages + 1))
+
+    log = EventLog(18)
+    log.capture(packages)
+    for package_id in range(1, num_packages + 1, 2):
+        log.record(Clock.parse_seconds("09:00") + rng.random() * 8 * 3600, EventKind.DELIVER, package_id % 3 + 1,
+                   package_id, 0.5)
+    log.finish()
+
+    steps: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        full_file = os.path.join(directory, "full.snap")
+        incremental_file = os.path.join(directory, "incremental.snap")
+
+        state = log.apply(packages, Clock.parse_seconds("12:00"))
+        start = time.perf_counter()
+        full = Snapshot.capture(packages, state, log)
+        Snapshot.write_snapshot(full_file, full)
+        steps["save full"] = time.perf_counter() - start
+
+        state = log.apply(packages, Clock.parse_seconds("13:00"))
+        start = time.perf_counter()
+        current = Snapshot.capture(packages, state, log)
+        Snapshot.write_snapshot(incremental_file, Snapshot.diff(full, current))
+        steps["save incremental"] = time.perf_counter() - start
+        del packages, log, state, full, current
+
+        start = time.perf_counter()
+        Snapshot.read_snapshot(full_file)
+        steps["read full"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = Snapshot.restore([full_file, incremental_file])
+        steps["restore chain"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    restored.to_state(restored.to_packages())
+    steps["build packages"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    restored.to_log()
+    steps["build event log"] = time.perf_counter() - start
+    return steps
+
+
+# Prints the snapshot benchmark
+def print_snapshot_benchmark(num_packages: int) -> None:
+    """
+    Runs the snapshot benchmark and prints the results.
+    Args:
+        num_packages (int): Number of packages.
+    """
+    print("Snapshots of " + str(num_packages) + " packages")
+    print(f"{'Step':<18} {'time (ms)':>12}")
+    for name, seconds in benchmark_snapshot(num_packages).items():
+        print(f"{name:<18} {seconds * 1000:12.2f}")
+    print()
+
+
+# Measures how long importing a module takes in a fresh interpreter
+def benchmark_import_time(module: str = "main", repeat: int = 5) -> float:
+    """
+    Imports the module in a new interpreter with -X importtime and reads the module's own cumulative
+    time from the report, so interpreter startup isn't counted.
+    Args:
+        module (str): Name of the module to import.
+        repeat (int): Number of runs to take the best time from.
+    Returns:
+        float: Best seconds the import took, including everything it imported.
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best = float("inf")
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + module], cwd=directory,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError("Importing " + module + " failed:\n" + result.stderr)
+
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                best = min(best, int(fields[1]) / 1000000)
+
+    return best
+
+
+# Prints the import time benchmark against the budget
+def print_import_time_benchmark(module: str = "main") -> None:
+    """
+    Runs the import time benchmark and prints it next to IMPORT_TIME_BUDGET.
+    Args:
+        module (str): Name of the module to import.
+    """
+    seconds = benchmark_import_time(module)
+    verdict = "within" if seconds <= IMPORT_TIME_BUDGET else "over"
+    print("Importing " + module)
+    print(f"{'time (ms)':>12} {'budget (ms)':>12}")
+    print(f"{seconds * 1000:12.2f} {IMPORT_TIME_BUDGET * 1000:12.2f} " + verdict + " budget")
+    print()
+
+
+# Times each phase of a full run on a generated instance
+def benchmark_phases(num_packages: int, seed: int = 0, kind: str = "euclidean",
+                     num_addresses: int | None = None) -> Dict[str, any]:
+    """
+    Generates an instance and times its phases separately:
+    - load_distances: parsing the distance table, with no cache
+    - load_packages: parsing the package file
+    - partition: clustering the packages into truck loads with k-medoids
+    - route: planning a route for every truck load
+    - simulate: simulating the whole day, with enough trucks and drivers for about three runs each
+    Args:
+        num_packages (int): Number of packages.
+        seed (int): Seed for the generator.
+        kind (str): "euclidean" or "road" distances.
+        num_addresses (int | None): Number of addresses. Defaults to Generator.generate_instance's default.
+    Returns:
+        Dict[str, any]: The instance size, seconds for each phase, and the simulated day's miles and deliveries.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        distance_file, package_file = Generator.generate_instance(
+            os.path.join(directory, "distances.csv"), os.path.join(directory, "packages.csv"), num_packages,
+            num_addresses, seed, kind)
+
+        context = RoutingContext(distance_file, package_file, None)
+        phases: Dict[str, float] = {}
+
+        start = time.perf_counter()
+        context.preload()
+        phases["load_distances"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        packages = context.read_packages()
+        phases["load_packages"] = time.perf_counter() - start
+
+        normal_packages = sorted(packages.with_status(PackageStatus.AT_HUB),
+                                 key=lambda package: package.deadline_seconds)
+        start = time.perf_counter()
+        clusters = Cluster.partition_packages(context.graph, context.hub, normal_packages, context.max_packages)
+        phases["partition"] = time.perf_counter() - start
+
+        start_seconds = Clock.parse_seconds("08:00")
+        start = time.perf_counter()
+        for cluster in clusters:
+            for first in range(0, len(cluster), context.max_packages):
+                context.plan_route(cluster[first:first + context.max_packages], start_seconds)
+        phases["route"] = time.perf_counter() - start
+
+        # The simulation changes the packages, so it gets its own copy
+        num_trucks = max(3, math.ceil(num_packages / (context.max_packages * 3)))
+        day = context.derive(num_trucks=num_trucks, num_drivers=num_trucks)
+        packages = day.read_packages()
+        start = time.perf_counter()
+        engine = day.simulate_day(packages, Clock.to_datetime(start_seconds), Clock.to_datetime(24 * 3600 - 1))
+        phases["simulate"] = time.perf_counter() - start
+
+        return {
+            "packages": num_packages,
+            "addresses": context.graph.num_vertices,
+            "kind": kind,
+            "seed": seed,
+            "trucks": num_trucks,
+            "phases": phases,
+            "miles": round(sum(truck.miles for truck in engine.trucks), 1),
+            "delivered": len(packages.with_status(PackageStatus.DELIVERED)),
+        }
+
+
+# Returns the commit the benchmark ran on, or None outside a git checkout
+def current_commit() -> str | None:
+    """
+    Returns the current git commit of the program's directory.
+    Returns:
+        str | None: Commit hash, or None if git or the repository isn't available.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+# Runs the phase benchmark for every size and saves the results as JSON
+def run_suite(sizes: Sequence[int], seed: int = 0, kind: str = "euclidean",
+              output_file: str | None = None) -> Dict[str, any]:
+    """
+    Runs benchmark_phases on every size, prints each phase, and optionally saves everything as JSON
+    with the commit and Python version, so runs on different commits can be compared.
+    Args:
+        sizes (Sequence[int]): Numbers of packages.
+        seed (int): Seed for the generator.
+        kind (str): "euclidean" or "road" distances.
+        output_file (str | None): Path to save the JSON results to.
+    Returns:
+        Dict[str, any]: The saved results.
+    """
+    suite = {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "results": [],
+    }
+
+    phase_names = ("load_distances", "load_packages", "partition", "route", "simulate")
+    print("Phases on " + kind + " instances, seed " + str(seed) + " (ms)")
+    print(f"{'packages':>9} {'addresses':>9} " + " ".join(f"{name:>14}" for name in phase_names))
+    for size in sizes:
+        result = benchmark_phases(size, seed, kind)
+        suite["results"].append(result)
+        print(f"{result['packages']:>9} {result['addresses']:>9} "
+              + " ".join(f"{result['phases'][name] * 1000:14.1f}" for name in phase_names))
+    print()
+
+    if output_file is not None:
+        with open(output_file, mode='w') as file:
+            json.dump(suite, file, indent=2)
+            file.write("\n")
+
+    return suite
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the WGUPS Routing Program.")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000], help="hash table sizes")
+    parser.add_argument("--suite", nargs="+", type=int, metavar="PACKAGES",
+                        help="time each phase on generated instances of these sizes instead")
+    parser.add_argument("--kind", choices=("euclidean", "road"), default="euclidean", help="generated distances")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated instances")
+    parser.add_argument("--json", help="file to save the suite's results to")
+    arguments = parser.parse_args()
+
+    if arguments.suite:
+        run_suite(arguments.suite, arguments.seed, arguments.kind, arguments.json)
+    else:
+        for size in arguments.sizes:
+            print_hash_table_benchmark(size)
+
+        print_package_memory_benchmark(100000)
+        print_fleet_loading_benchmark(50000, 500)
+        print_package_ingestion_benchmark(100000)
+        print_snapshot_benchmark(1000000)
+        print_import_time_benchmark("main")
@@ -0,0 +1,122 @@
+"""
+Clock.py
+Parses and converts the clock times used by the packages, the simulation, and the user interface.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Clock.py
+# Purpose: Parses every clock time in one place, once per distinct string, into whole minutes
+
+# Standard Library
+import datetime
+import functools
+
+# Every datetime view of a clock time is on this date, the one strptime gives a bare clock time,
+# so they compare directly with each other.
+BASE_DATE = datetime.datetime(year=1900, month=1, day=1)
+
+# End of the delivery day in minutes since midnight. "EOD" parses to this.
+END_OF_DAY_MINUTES = 17 * 60
+
+
+# Parses a clock time into whole minutes since midnight. Manifests and notes repeat the same few
+# times on every row, so each distinct string is only parsed once.
+@functools.lru_cache(maxsize=1024)
+def parse_minutes(text: str) -> int:
+    """
+    Parses a clock time in the "hh:mm AM", "hh:mm PM", or 24-hour "hh:mm" format, or "EOD".
+    Case and surrounding spaces don't matter.
+    Args:
+        text (str): Time to parse.
+    Returns:
+        int: Minutes since midnight.
+    Raises:
+        ValueError: If the text isn't a valid time.
+    """
+    value = text.strip().upper()
+    if value == "EOD":
+        return END_OF_DAY_MINUTES
+
+    # Split off the AM or PM, if there is one
+    meridiem = ""
+    if value.endswith("AM") or value.endswith("PM"):
+        meridiem = value[-2:]
+        value = value[:-2].rstrip()
+
+    hours, separator, minutes = value.partition(":")
+    if not separator or not hours.isdigit() or not minutes.isdigit() or len(hours) > 2 or len(minutes) > 2:
+        raise ValueError("\"" + text + "\" is not a valid time")
+
+    hour = int(hours)
+    minute = int(minutes)
+    if minute > 59 or (meridiem and not 1 <= hour <= 12) or (not meridiem and hour > 23):
+        raise ValueError("\"" + text + "\" is not a valid time")
+
+    # 12 AM is midnight and 12 PM is noon
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem == "PM" else 0)
+
+    return hour * 60 + minute
+
+
+# Parses a clock time into whole seconds since midnight
+def parse_seconds(text: str) -> int:
+    """
+    Parses a clock time like parse_minutes does.
+    Args:
+        text (str): Time to parse.
+    Returns:
+        int: Seconds since midnight.
+    Raises:
+        ValueError: If the text isn't a valid time.
+    """
+    return parse_minutes(text) * 60
+
+
+# Formats minutes since midnight as a 24-hour "hh:mm" string
+def format_minutes(minutes: int) -> str:
+    """
+    Formats a clock time.
+    Args:
+        minutes (int): Minutes since midnight.
+    Returns:
+        str: Time as "hh:mm".
+    """
+    return str(minutes // 60).zfill(2) + ":" + str(minutes % 60).zfill(2)
+
+
+# Converts a datetime to whole seconds since midnight
+def to_seconds(time: datetime.datetime) -> int:
+    """
+    Converts the clock time of a datetime to whole seconds since midnight.
+    Args:
+        time (datetime.datetime): Time to convert.
+    Returns:
+        int: Seconds since midnight.
+    """
+    return time.hour * 3600 + time.minute * 60 + time.second
+
+
+# Converts seconds since midnight back to a datetime on BASE_DATE
+def to_datetime(seconds: int) -> datetime.datetime:
+    """
+    Converts seconds since midnight to a datetime on BASE_DATE.
+    Args:
+        seconds (int): Seconds since midnight.
+    Returns:
+        datetime.datetime: Matching datetime.
+    """
+    return BASE_DATE + datetime.timedelta(seconds=seconds)
+
+
+# Converts a datetime to seconds since midnight, keeping fractions of a second
+def clock_seconds(time: datetime.datetime) -> float:
+    """
+    Converts the clock time of a datetime to seconds since midnight, keeping microseconds.
+    Args:
+        time (datetime.datetime): Time to convert.
+    Returns:
+        float: Seconds since midnight.
+    """
+    return time.hour * 3600 + time.minute * 60 + time.second + time.microsecond / 1000000
@@ -0,0 +1,128 @@
+"""
+Cluster.py
+Partitions delivery stops into geographic clusters with k-medoids on the distance matrix.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Cluster.py
+# Purpose: Groups nearby packages so each truck routes a compact part of the city
+
+# Standard Library
+import math
+from typing import Dict, List, Sequence, Tuple
+
+# Created Imports
+from Graph import Graph
+from Package import END_OF_DAY, Package
+
+
+# Clusters vertices around k medoids
+def k_medoids(graph: Graph, vertices: Sequence[int], k: int, weights: Dict[int, int] | None = None,
+              max_iterations: int = 20) -> Tuple[List[int], Dict[int, int]]:
+    """
+    Clusters vertices with k-medoids. The medoids start spread out by farthest-first traversal,
+    then each vertex joins its closest medoid and each cluster's medoid moves to the member with
+    the smallest weighted distance to the rest, until nothing changes. It only needs distances,
+    so it works straight off the distance matrix.
+    Args:
+        graph (Graph): Graph holding the distances.
+        vertices (Sequence[int]): Vertices to cluster.
+        k (int): Number of clusters.
+        weights (Dict[int, int] | None): How much each vertex counts, such as its number of packages. Defaults to 1.
+        max_iterations (int): Most assignment and update rounds to run.
+    Returns:
+        Tuple[List[int], Dict[int, int]]: Medoid of each cluster, and the cluster index of each vertex.
+    """
+    vertices = list(dict.fromkeys(vertices))
+    if not vertices:
+        return [], {}
+
+    weights = weights or {}
+    k = max(1, min(k, len(vertices)))
+
+    # Farthest-first start: the first medoid is the vertex farthest from everything else, then each
+    # new medoid is the vertex farthest from the medoids picked so far. Ties go to the earlier vertex.
+    rows = {vertex: graph.get_row(vertex) for vertex in vertices}
+    first = max(vertices, key=lambda vertex: sum(rows[vertex][other] for other in vertices))
+    medoids = [first]
+    closest = {vertex: rows[first][vertex] for vertex in vertices}
+    while len(medoids) < k:
+        next_medoid = max(vertices, key=lambda vertex: closest[vertex])
+        medoids.append(next_medoid)
+        row = rows[next_medoid]
+        for vertex in vertices:
+            closest[vertex] = min(closest[vertex], row[vertex])
+
+    assignment: Dict[int, int] = {}
+    for _ in range(max_iterations):
+        # Assign each vertex to its closest medoid
+        new_assignment = {}
+        for vertex in vertices:
+            row = rows[vertex]
+            new_assignment[vertex] = min(range(len(medoids)), key=lambda index: row[medoids[index]])
+
+        # Move each medoid to the member closest to the rest of its cluster
+        members: List[List[int]] = [[] for _ in medoids]
+        for vertex, index in new_assignment.items():
+            members[index].append(vertex)
+
+        new_medoids = []
+        for index, cluster in enumerate(members):
+            if not cluster:
+                new_medoids.append(medoids[index])
+                continue
+
+            new_medoids.append(min(cluster, key=lambda vertex: sum(rows[vertex][other] * weights.get(other, 1)
+                                                                   for other in cluster)))
+
+        if new_assignment == assignment and new_medoids == medoids:
+            break
+
+        assignment = new_assignment
+        medoids = new_medoids
+
+    return medoids, assignment
+
+
+# Splits packages into geographic clusters, one for every truck load of packages
+def partition_packages(graph: Graph, hub: int, packages: List[Package], capacity: int) -> List[List[Package]]:
+    """
+    Partitions packages into clusters of nearby stops with k-medoids. There's one cluster for
+    every truck load of packages, and each medoid is placed by its members' package counts. The
+    clusters aren't limited in size, so one can hold more than a truck load and has to be split.
+    Clusters with the earliest deadlines come first, then the ones closest to the hub. Inside a
+    cluster, packages are in deadline order.
+    Args:
+        graph (Graph): Graph holding the distances.
+        hub (int): Vertex id of the hub.
+        packages (List[Package]): Packages to partition.
+        capacity (int): Packages in one truck load.
+    Returns:
+        List[List[Package]]: Packages in each cluster.
+    """
+    if not packages:
+        return []
+
+    counts: Dict[int, int] = {}
+    for package in packages:
+        counts[package.vertex_id] = counts.get(package.vertex_id, 0) + 1
+
+    k = math.ceil(len(packages) / max(capacity, 1))
+    medoids, assignment = k_medoids(graph, list(counts), k, counts)
+
+    clusters: List[List[Package]] = [[] for _ in medoids]
+    for package in packages:
+        clusters[assignment[package.vertex_id]].append(package)
+
+    hub_row = graph.get_row(hub)
+    order = sorted(range(len(clusters)),
+                   key=lambda index: (min((package.deadline_seconds for package in clusters[index]),
+                                          default=END_OF_DAY), hub_row[medoids[index]]))
+
+    result = []
+    for index in order:
+        if clusters[index]:
+            result.append(sorted(clusters[index], key=lambda package: package.deadline_seconds))
+
+    return result
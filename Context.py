@@ -0,0 +1,394 @@
+"""
+Context.py
+Holds the routing data and settings for one run of the WGUPS Routing Program and loads the data on first use.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Context.py
+# Purpose: Plans routes and simulates the day from data files that are only read when they're needed
+
+# Standard Library
+import datetime
+import os
+from typing import Callable, Dict, List
+
+# Created Imports
+import Clock
+import Cluster
+import Fleet
+import Graph
+import Instrument
+import Package
+import Route
+import Simulation
+from Package import PackageStatus
+from PackageRepository import PackageRepository
+from RouteCache import CachedRoute, RouteCache
+
+# Settings that change how the distance table is read, so a derived context can't change them
+_LOADING_SETTINGS = ("distance_file", "cache_directory", "shortest_paths", "binary_distances")
+
+
+# Routing data, settings, and the route planner for one distance table and package file
+class RoutingContext:
+    """
+    Plans routes and simulates the delivery day. Creating a context doesn't read anything. The distance
+    table is loaded the first time it's used, so importing the routing code stays cheap, and the file
+    paths can point anywhere.
+    A context can be pickled to send it to a worker process. The loaded data isn't pickled, so the worker
+    loads it again from the memory-mapped binary table. Workers that fork after preload() share the parent's
+    pages instead.
+    """
+    def __init__(self, distance_file: str = "WGUPS Distance Table.csv", package_file: str = "WGUPS Package File.csv",
+                 cache_directory: str | None = ".cache", max_packages: int = 16, speed: float = 18,
+                 num_trucks: int = 3, num_drivers: int = 2, max_weight: float = float("inf"),
+                 improve_routes: bool = True, route_move_budget: int = 1000, insertion_routes: bool = True,
+                 multi_start_seeds: int = 0, cluster_packages: bool = False, shortest_paths: bool = False,
+                 binary_distances: bool = True, warn_late: Callable[[Package.Package], None] | None = None,
+                 route_cache_size: int = 256,
+                 route_time_limit: float | None = None):
+        """
+        Initializes a RoutingContext without reading any files.
+        Args:
+            distance_file (str): Path to the distance table CSV.
+            package_file (str): Path to the package CSV.
+            cache_directory (str | None): Directory for the binary table and the shortest-path cache. None turns
+                                          both caches off.
+            max_packages (int): Most packages a truck can carry.
+            speed (float): Truck speed in miles per hour.
+            num_trucks (int): Number of trucks.
+            num_drivers (int): Number of drivers.
+            max_weight (float): Most total weight a truck can carry, in kg.
+            improve_routes (bool): Improves each route with 2-opt and Or-opt before the truck leaves.
+            route_move_budget (int): Most moves the local search may make on one route.
+            insertion_routes (bool): Builds routes by deadline-aware cheapest insertion.
+            multi_start_seeds (int): Randomized starts for the multi-start optimizer. 0 plans in this process.
+            cluster_packages (bool): Partitions the packages into k-medoids clusters before loading.
+            shortest_paths (bool): Routes on the shortest-path closure of the distance table. Building it is
+                                   O(n^3) in Python for a complete table, so it's off unless asked for.
+            binary_distances (bool): Loads the distance table from its memory-mapped binary copy.
+            warn_late (Callable[[Package], None] | None): Called with every package a planned route will deliver
+                                                         late, before the truck leaves. None ignores them.
+            route_cache_size (int): Most planned routes remembered for truck loads that leave again. 0 turns it off.
+            route_time_limit (float | None): Seconds after which the local search on one route stops even if it
+                                             has moves left. None never stops on time, so routes are repeatable.
+        """
+        self.distance_file = distance_file
+        self.package_file = package_file
+        self.cache_directory = cache_directory
+        self.max_packages = max_packages
+        self.speed = speed
+        self.num_trucks = num_trucks
+        self.num_drivers = num_drivers
+        self.max_weight = max_weight
+        self.improve_routes = improve_routes
+        self.route_move_budget = route_move_budget
+        self.route_time_limit = route_time_limit
+        self.insertion_routes = insertion_routes
+        self.multi_start_seeds = multi_start_seeds
+        self.cluster_packages = cluster_packages
+        self.shortest_paths = shortest_paths
+        self.binary_distances = binary_distances
+        self.warn_late = warn_late
+
+        # Planned routes by truck load and departure. Derived contexts share it, since the planner
+        # settings are part of every key.
+        self.route_cache = RouteCache(route_cache_size)
+
+        self._graph: Graph.Graph | None = None
+        self._address_to_ids: Dict[str, int] | None = None
+        self._ids_to_address: Dict[int, str] | None = None
+        self._optimizer = None
+
+    # Leaves the loaded data and the worker pool behind when the context is pickled
+    def __getstate__(self) -> dict:
+        """
+        Returns the context's settings for pickling.
+        Returns:
+            dict: Attributes to pickle. The graph, address dicts, and optimizer are left unloaded, and the
+                  route cache starts empty.
+        """
+        state = self.__dict__.copy()
+        state["_graph"] = None
+        state["_address_to_ids"] = None
+        state["_ids_to_address"] = None
+        state["_optimizer"] = None
+        state["route_cache"] = RouteCache(self.route_cache.max_size)
+        return state
+
+    # Reads the distance table, through the binary table and shortest-path cache when they're on
+    @Instrument.timed("load_distances")
+    def _load_distances(self) -> None:
+        """
+        Loads the graph and address dicts from the distance file.
+        """
+        # Both caches are keyed on the CSV's SHA-256, so it's hashed once for the two of them
+        digest = None
+        if self.cache_directory is not None and (self.binary_distances or self.shortest_paths):
+            digest = Graph.file_digest(self.distance_file)
+
+        if self.binary_distances and self.cache_directory is not None:
+            sidecar_file = os.path.join(self.cache_directory,
+                                        os.path.splitext(os.path.basename(self.distance_file))[0] + ".wgdm")
+            graph, address_to_ids, ids_to_address = Graph.load_distances(self.distance_file, sidecar_file,
+                                                                         digest=digest)
+        else:
+            graph, address_to_ids, ids_to_address = Graph.read_distances_to_graph(self.distance_file)
+
+        if self.shortest_paths:
+            if self.cache_directory is not None:
+                graph = Graph.cached_shortest_path_closure(graph, self.distance_file, self.cache_directory,
+                                                           digest)
+            else:
+                graph = graph.shortest_path_closure()
+
+        self._graph = graph
+        self._address_to_ids = address_to_ids
+        self._ids_to_address = ids_to_address
+
+    # The graph of distances between addresses
+    @property
+    def graph(self) -> Graph.Graph:
+        """
+        Returns the distance graph, loading it on first use.
+        Returns:
+            Graph: Graph the routes are planned on.
+        """
+        if self._graph is None:
+            self._load_distances()
+        return self._graph
+
+    # Address to vertex id dict
+    @property
+    def address_to_ids(self) -> Dict[str, int]:
+        """
+        Returns the address to vertex id dict, loading the distance table on first use.
+        Returns:
+            Dict[str, int]: Vertex id of each address.
+        """
+        if self._address_to_ids is None:
+            self._load_distances()
+        return self._address_to_ids
+
+    # Vertex id to address dict
+    @property
+    def ids_to_address(self) -> Dict[int, str]:
+        """
+        Returns the vertex id to address dict, loading the distance table on first use.
+        Returns:
+            Dict[int, str]: Address of each vertex id.
+        """
+        if self._ids_to_address is None:
+            self._load_distances()
+        return self._ids_to_address
+
+    # Vertex id of the hub
+    @property
+    def hub(self) -> int:
+        """
+        Returns the vertex id of the hub.
+        Returns:
+            int: Vertex id of "HUB".
+        """
+        return self.address_to_ids["HUB"]
+
+    # Loads everything up front, such as before forking worker processes
+    def preload(self) -> "RoutingContext":
+        """
+        Loads the distance table now instead of on first use.
+        Returns:
+            RoutingContext: This context.
+        """
+        if self._graph is None:
+            self._load_distances()
+        return self
+
+    # Makes a context with some settings changed that shares this context's loaded data
+    def derive(self, **settings) -> "RoutingContext":
+        """
+        Copies the context with new settings. The distance table is loaded once and shared by the copy,
+        so only settings that don't change how it's read should be given.
+        Args:
+            **settings: Settings to change, named like the constructor's arguments.
+        Returns:
+            RoutingContext: New context. Its optimizer isn't started.
+        Raises:
+            TypeError: If a setting isn't one of the constructor's arguments, or changes how the table is read.
+        """
+        context = RoutingContext.__new__(RoutingContext)
+        context.__dict__.update(self.__dict__)
+        context._optimizer = None
+        for name, value in settings.items():
+            if name.startswith("_") or name not in self.__dict__ or name in _LOADING_SETTINGS:
+                raise TypeError("\"" + name + "\" can't be changed on a derived context")
+            setattr(context, name, value)
+
+        return context
+
+    # Reads the package file into a repository
+    def read_packages(self, rejects: Callable[[Package.RejectedRow], None] | None = None) -> PackageRepository:
+        """
+        Reads the package file, matching every address to its vertex id.
+        Args:
+            rejects (Callable[[RejectedRow], None] | None): Called with every row that can't be loaded.
+                                                             None raises a ValueError listing them instead.
+        Returns:
+            PackageRepository: Packages keyed by id.
+        """
+        return Package.read_packages(self.package_file, self.address_to_ids, rejects)
+
+    # Plans the order a truck visits its stops in, starting and ending at the hub.
+    @Instrument.timed("plan_route")
+    def plan_route(self, current_truck: List[Package.Package], start_seconds: float) -> List[int] | None:
+        """
+        Plans a truck's route with nearest-neighbor or deadline-aware insertion, then shortens it with
+        2-opt and Or-opt moves that don't make any package later for its deadline. Every package the planned
+        route will deliver late is passed to warn_late, if it's set, before the truck leaves.
+        Args:
+            current_truck (List[Package]): List of packages on the truck.
+            start_seconds (float): Time the truck leaves the hub in seconds since midnight.
+        Returns:
+            List[int] | None: Location IDs in the order they should be visited, or None if improve_routes and
+                              insertion_routes are off and the truck should pick the closest location at every stop.
+        """
+        # The latest arrival for each stop is the earliest deadline of the packages going there
+        deadlines: dict[int, float] = {}
+        for next_package in current_truck:
+            minutes_left = (next_package.deadline_seconds - start_seconds) / 60
+            if next_package.vertex_id not in deadlines or minutes_left < deadlines[next_package.vertex_id]:
+                deadlines[next_package.vertex_id] = minutes_left
+
+        # The same load leaving at the same time always gets the same route, so it's only planned once.
+        # The time limit is left out of the key, since it's only a safety cap on the move budget.
+        key = RouteCache.make_key(deadlines, start_seconds, (self.speed, self.improve_routes, self.insertion_routes,
+                                                             self.multi_start_seeds, self.route_move_budget))
+        cached = self.route_cache.get(key)
+        if cached is None:
+            Instrument.count("route_cache.misses")
+            cached = self._plan_stops(deadlines, start_seconds)
+            self.route_cache.put(key, cached)
+        else:
+            Instrument.count("route_cache.hits")
+
+        if self.warn_late is not None:
+            for next_package in current_truck:
+                # A stop is late for its earliest deadline, so each package is checked against its own
+                arrival = cached.late.get(next_package.vertex_id)
+                if arrival is not None and start_seconds + arrival * 60 > next_package.deadline_seconds + Route.EPSILON:
+                    self.warn_late(next_package)
+
+        return list(cached.route) if cached.route is not None else None
+
+    # Plans the route for a set of stops and finds the stops it reaches late
+    def _plan_stops(self, deadlines: Dict[int, float], start_seconds: float) -> CachedRoute:
+        """
+        Plans a route for plan_route.
+        Args:
+            deadlines (Dict[int, float]): Latest arrival for each stop in minutes after departure.
+            start_seconds (float): Time the truck leaves the hub in seconds since midnight.
+        Returns:
+            CachedRoute: Route and the stops it reaches late.
+        """
+        graph = self.graph
+        hub = self.hub
+
+        # Search from many starts across the worker pool and keep the shortest route
+        route = None
+        if self.improve_routes and self.multi_start_seeds > 0:
+            route = self.optimizer().best_tour(hub, list(deadlines), deadlines, self.speed, self.multi_start_seeds,
+                                               self.route_move_budget, self.route_time_limit)
+
+        elif self.insertion_routes:
+            # Only deadlines before the end of the day go first. The rest are inserted wherever they're cheapest.
+            end_of_day_minutes = (Package.END_OF_DAY - start_seconds) / 60
+            urgent = {vertex: minutes for vertex, minutes in deadlines.items() if minutes < end_of_day_minutes}
+            route, _ = Route.insertion_tour(graph, hub, list(deadlines), urgent, self.speed)
+
+        elif self.improve_routes:
+            route = Route.nearest_neighbor_tour(graph, hub, list(deadlines))
+
+        if route is not None and self.improve_routes and self.multi_start_seeds <= 0:
+            route = Route.improve_tour(graph, hub, route, deadlines, self.speed, self.route_move_budget,
+                                       time_limit=self.route_time_limit)
+
+        # Without a planned route the truck goes to the closest stop every time, which is the nearest-neighbor tour
+        stops = route if route is not None else Route.nearest_neighbor_tour(graph, hub, list(deadlines))
+        late = Route.late_stops(graph, hub, stops, deadlines, self.speed)
+        return CachedRoute(route, late)
+
+    # Simulates the whole delivery day from the start time to the finish time, recording every load, departure,
+    # delivery, and hub return in the event log.
+    @Instrument.timed("simulate_day")
+    def simulate_day(self, packages: PackageRepository, start_time: datetime.datetime,
+                     finish_time: datetime.datetime,
+                     log: Simulation.EventLog | None = None) -> Simulation.DeliveryEngine:
+        """
+        Queues the constrained packages for their trucks, then runs the trucks and drivers through the day
+        until finish_time.
+        Args:
+            packages (PackageRepository): Packages at the start of the day.
+            start_time (datetime.datetime): Time the day starts.
+            finish_time (datetime.datetime): Time to stop the simulation.
+            log (Simulation.EventLog | None): Event log to record the day in.
+        Returns:
+            Simulation.DeliveryEngine: Engine holding each truck's remaining packages and mileage.
+        Raises:
+            ValueError: If a package is heavier than a truck can carry, must be on a truck the fleet doesn't
+                        have, or is in a co-delivery group that doesn't fit on one truck.
+        """
+        # A package heavier than a truck can carry would never leave the hub
+        heavy = [str(package.id) for package in packages.values() if package.weight > self.max_weight]
+        if heavy:
+            raise ValueError("Packages " + ", ".join(heavy) + " are heavier than a truck can carry")
+
+        # Separate normal and constrained packages
+        normal_packages, constrained_packages = Package.separate_packages(packages)
+
+        # Queue packages for the trucks they're required to be on
+        trucks = Package.filter_constrained_packages(normal_packages, constrained_packages, packages,
+                                                     self.max_packages, self.num_trucks, self.max_weight)
+
+        # Sort the packages by deadline so the packages with the shortest deadline get loaded first.
+        normal_packages.sort(key=lambda package_to_sort: package_to_sort.deadline_seconds)
+
+        # Pack the packages into truck loads by stop, count, and weight. Clusters are packed one at a time,
+        # so no load crosses from one part of the city into another.
+        fleet = Fleet.make_fleet(self.num_trucks, self.max_packages, self.max_weight)
+        clusters = [normal_packages]
+        if self.cluster_packages:
+            with Instrument.phase("partition"):
+                clusters = Cluster.partition_packages(self.graph, self.hub, normal_packages, self.max_packages)
+        loads = [load for cluster in clusters for load in Fleet.split_loads(cluster, fleet[0])]
+
+        # Delayed packages and the package with the wrong address join the others when they're ready
+        late_packages = [package for package in constrained_packages
+                         if package.status == PackageStatus.DELAYED
+                         or package.status == PackageStatus.UPDATING_ADDRESS]
+
+        engine = Simulation.DeliveryEngine(self.graph, self.hub, fleet, trucks, loads, late_packages,
+                                           self.num_drivers, self.speed, self.plan_route, log)
+        engine.run(Clock.clock_seconds(start_time), Clock.clock_seconds(finish_time))
+        return engine
+
+    # Returns the multi-start optimizer, starting its worker pool the first time it's needed
+    def optimizer(self):
+        """
+        Returns the multi-start route optimizer. Its module pulls in multiprocessing, so it's only
+        imported when the optimizer is first used.
+        Returns:
+            Optimizer.MultiStartOptimizer: Optimizer sharing this context's graph with its workers.
+        """
+        if self._optimizer is None:
+            import Optimizer
+            self._optimizer = Optimizer.MultiStartOptimizer(self.graph)
+        return self._optimizer
+
+    # Stops the worker pool if it was started
+    def close(self) -> None:
+        """
+        Shuts down the optimizer's worker pool, if there is one.
+        """
+        if self._optimizer is not None:
+            self._optimizer.close()
+            self._optimizer = None
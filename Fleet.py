@@ -0,0 +1,146 @@
+"""
+Fleet.py
+Describes the trucks in the fleet and packs packages onto them by stop, count, and weight.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Fleet.py
+# Purpose: Loads any number of trucks with their own package and weight limits
+
+# Standard Library
+from collections import deque
+from typing import Dict, List, Tuple
+
+# Created Imports
+from Package import Package
+
+
+# The limits of one truck in the fleet
+class TruckSpec:
+    """
+    Holds a truck's number and how many packages and how much weight it can carry.
+    """
+    __slots__ = ("number", "max_packages", "max_weight")
+
+    def __init__(self, number: int, max_packages: int, max_weight: float = float("inf")):
+        """
+        Initializes a TruckSpec.
+        Args:
+            number (int): Truck number, starting at 1.
+            max_packages (int): Most packages the truck can carry.
+            max_weight (float): Most total weight the truck can carry, in kg.
+        """
+        self.number = number
+        self.max_packages = max_packages
+        self.max_weight = max_weight
+
+
+# Builds a fleet of identical trucks
+def make_fleet(num_trucks: int, max_packages: int, max_weight: float = float("inf")) -> List[TruckSpec]:
+    """
+    Builds a fleet where every truck has the same limits.
+    Args:
+        num_trucks (int): Number of trucks.
+        max_packages (int): Most packages each truck can carry.
+        max_weight (float): Most total weight each truck can carry, in kg.
+    Returns:
+        List[TruckSpec]: Trucks numbered from 1.
+    """
+    return [TruckSpec(number, max_packages, max_weight) for number in range(1, num_trucks + 1)]
+
+
+# Packs packages onto the whole fleet at once
+def pack_fleet(packages: List[Package], fleet: List[TruckSpec],
+               window: int = 4) -> Tuple[List[List[Package]], List[Package]]:
+    """
+    Packs packages onto the fleet with a next-fit heuristic that keeps a few trucks open.
+    Packages are first grouped by stop, so everything going to one address rides on one truck
+    whenever it fits. Stops are packed in the order their first package appears, so earlier
+    packages end up on lower numbered trucks. A stop that doesn't fit in any open truck opens
+    the next one, and a stop too big for an empty truck is split across trucks package by package.
+    Runs in O(packages * window).
+    Args:
+        packages (List[Package]): Packages to load, most urgent first.
+        fleet (List[TruckSpec]): Trucks to load. Packages are marked with their truck's number unless it's 0.
+        window (int): Number of partly filled trucks kept open for later stops.
+    Returns:
+        Tuple[List[List[Package]], List[Package]]: Packages on each truck in fleet order, and the
+                                                   packages that didn't fit anywhere.
+    """
+    loads: List[List[Package]] = [[] for _ in fleet]
+    counts = [0] * len(fleet)
+    weights = [0.0] * len(fleet)
+    open_trucks: deque = deque()
+    next_truck = 0
+    leftover: List[Package] = []
+
+    # Returns the position of the first open truck with room, opening new trucks as needed
+    def find_truck(count: int, weight: float) -> int:
+        nonlocal next_truck
+        for position in open_trucks:
+            spec = fleet[position]
+            if counts[position] + count <= spec.max_packages and weights[position] + weight <= spec.max_weight:
+                return position
+
+        # Open the next truck. If it can't hold this even while empty, it stays open for later stops.
+        if next_truck < len(fleet):
+            position = next_truck
+            next_truck += 1
+            open_trucks.append(position)
+            if len(open_trucks) > window:
+                open_trucks.popleft()
+
+            if count <= fleet[position].max_packages and weight <= fleet[position].max_weight:
+                return position
+
+        return -1
+
+    # Places packages on a truck
+    def place(position: int, group: List[Package], weight: float) -> None:
+        loads[position].extend(group)
+        counts[position] += len(group)
+        weights[position] += weight
+        number = fleet[position].number
+        if number:
+            for package in group:
+                package.truck = number
+
+    # Cluster the packages by stop, keeping the order their stops first appear in
+    stops: Dict[int, List[Package]] = {}
+    for package in packages:
+        stops.setdefault(package.vertex_id, []).append(package)
+
+    for group in stops.values():
+        weight = sum(package.weight for package in group)
+        position = find_truck(len(group), weight)
+        if position != -1:
+            place(position, group, weight)
+            continue
+
+        # The stop doesn't fit on one truck, so split it
+        for package in group:
+            position = find_truck(1, package.weight)
+            if position == -1:
+                leftover.append(package)
+            else:
+                place(position, [package], package.weight)
+
+    return loads, leftover
+
+
+# Packs packages into as many truck loads as they need
+def split_loads(packages: List[Package], spec: TruckSpec, window: int = 4) -> List[List[Package]]:
+    """
+    Splits packages into loads that each fit on a truck like spec, with pack_fleet, so everything
+    going to one stop stays in one load whenever it fits. The packages aren't marked with a truck.
+    Args:
+        packages (List[Package]): Packages to split, most urgent first.
+        spec (TruckSpec): Limits of the trucks the loads go on.
+        window (int): Number of partly filled loads kept open for later stops.
+    Returns:
+        List[List[Package]]: Loads in the order they were opened. Packages that don't fit on an empty
+                             truck are left out.
+    """
+    loads, _ = pack_fleet(packages, [TruckSpec(0, spec.max_packages, spec.max_weight)] * len(packages), window)
+    return [load for load in loads if load]
@@ -0,0 +1,191 @@
+"""
+Generator.py
+Generates synthetic distance tables and package files in the same formats as the WGUPS data files.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Generator.py
+# Purpose: Builds reproducible instances of any size for benchmarking
+
+# Standard Library
+import csv
+import math
+import random
+from typing import List, Tuple
+
+# Created Imports
+from Package import CORRECTED_ADDRESS
+
+# Streets the synthetic addresses are on
+STREETS = ("Main St", "State St", "W 500 S", "S 900 W", "E 2100 S", "Canyon Rd", "Parkway Blvd", "Valley Loop",
+           "W Oakland Ave", "Taylorsville Blvd", "S 1100 W", "Lester St")
+
+# Deadlines and how often each comes up, close to the WGUPS package file
+DEADLINES = (("EOD", 0.6), ("10:30 AM", 0.35), ("9:00 AM", 0.05))
+
+# Times delayed packages reach the hub
+ARRIVAL_TIMES = ("9:05 am", "9:30 am", "10:00 am")
+
+
+# Builds num_addresses unique addresses, starting with the hub and the corrected address
+def generate_addresses(num_addresses: int, rng: random.Random) -> List[str]:
+    """
+    Builds unique street addresses. The first is "HUB" and the second is the address the package
+    with a wrong address is corrected to, so every generated package file can be loaded.
+    Args:
+        num_addresses (int): Number of addresses, at least 2.
+        rng (random.Random): Random number generator.
+    Returns:
+        List[str]: Addresses, hub first.
+    """
+    addresses = ["HUB", CORRECTED_ADDRESS[0]]
+    used = set(addresses)
+    while len(addresses) < num_addresses:
+        address = str(rng.randrange(100, 10000)) + " " + rng.choice(STREETS)
+        if address not in used:
+            used.add(address)
+            addresses.append(address)
+
+    return addresses
+
+
+# Builds the distances between every pair of addresses
+def generate_distances(num_addresses: int, rng: random.Random, kind: str = "euclidean",
+                       size: float = 12.0) -> List[List[float]]:
+    """
+    Places the addresses at random in a size by size mile square and measures the distance between
+    every pair, rounded to a tenth of a mile like the WGUPS table.
+    "euclidean" uses straight-line distances. "road" uses city-block distances stretched by a random
+    detour of up to 40% per pair, so, like the real table, it doesn't always follow the triangle inequality.
+    Args:
+        num_addresses (int): Number of addresses.
+        rng (random.Random): Random number generator.
+        kind (str): "euclidean" or "road".
+        size (float): Width of the square in miles.
+    Returns:
+        List[List[float]]: Lower triangle of the table. Row i holds the distances to addresses 0 through i.
+    Raises:
+        ValueError: If kind isn't "euclidean" or "road".
+    """
+    if kind not in ("euclidean", "road"):
+        raise ValueError("\"" + kind + "\" isn't a kind of distance table. Use \"euclidean\" or \"road\".")
+
+    points: List[Tuple[float, float]] = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(num_addresses)]
+    rows = []
+    for i, (x, y) in enumerate(points):
+        row = []
+        for j in range(i):
+            other_x, other_y = points[j]
+            if kind == "euclidean":
+                distance = math.hypot(x - other_x, y - other_y)
+            else:
+                distance = (abs(x - other_x) + abs(y - other_y)) * rng.uniform(1.0, 1.4)
+
+            # Separate addresses are never 0 miles apart
+            row.append(max(round(distance, 1), 0.1))
+
+        row.append(0.0)
+        rows.append(row)
+
+    return rows
+
+
+# Writes a distance table CSV in the same format as the WGUPS table
+def write_distance_file(filename: str, addresses: List[str], rows: List[List[float]]) -> None:
+    """
+    Writes the lower triangle of a distance table, one address per line followed by its distances.
+    Args:
+        filename (str): Path to write.
+        addresses (List[str]): Addresses in table order.
+        rows (List[List[float]]): Lower triangle of the table from generate_distances.
+    """
+    with open(filename, mode='w', newline='') as file:
+        for address, row in zip(addresses, rows):
+            file.write("\"" + address + "\"," + ",".join(str(distance) for distance in row) + "\n")
+
+
+# Writes a package file with a mix of constraints like the WGUPS package file
+def write_package_file(filename: str, addresses: List[str], num_packages: int, rng: random.Random,
+                       delayed_rate: float = 0.1) -> None:
+    """
+    Writes num_packages packages to random addresses. Deadlines follow DEADLINES, delayed_rate of
+    the packages arrive late, and the other constraints grow with the file in the same proportions
+    as the WGUPS file: one in ten packages can only be on one truck, one in forty has a wrong address,
+    and there's a group of three packages that must be delivered together for every forty packages.
+    The required trucks are spread over one truck for every hundred packages, and at least three,
+    so no truck is given more than it can deliver in a day.
+    Args:
+        filename (str): Path to write.
+        addresses (List[str]): Addresses from generate_addresses, hub first.
+        num_packages (int): Number of packages.
+        rng (random.Random): Random number generator.
+        delayed_rate (float): Fraction of packages that reach the hub late.
+    """
+    deadlines = [deadline for deadline, _ in DEADLINES]
+    weights = [weight for _, weight in DEADLINES]
+
+    # Pick which packages get the other constraints. Each group is three packages that each name
+    # the other two, plus no other constraints on them.
+    ids = list(range(1, num_packages + 1))
+    num_groups = max(1, num_packages // 40)
+    num_required = max(4, num_packages // 10)
+    num_wrong = max(1, num_packages // 40)
+    num_required_trucks = max(3, num_packages // 100)
+    chosen = rng.sample(ids, min(num_packages, num_required + num_wrong + 3 * num_groups))
+    required_truck = set(chosen[:num_required])
+    wrong_address = set(chosen[num_required:num_required + num_wrong])
+    groups = {}
+    grouped = chosen[num_required + num_wrong:]
+    for start in range(0, len(grouped) - 2, 3):
+        for package_id in grouped[start:start + 3]:
+            groups[package_id] = grouped[start:start + 3]
+
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Package ID", "Address", "City", "State", "Zip", "Delivery Deadline", "Weight KILO",
+                         "Special Notes"])
+        for package_id in ids:
+            deadline = rng.choices(deadlines, weights)[0]
+            notes = ""
+            if package_id in required_truck:
+                notes = "Can only be on truck " + str(rng.randint(1, num_required_trucks))
+            elif package_id in wrong_address:
+                notes = "Wrong address listed"
+                deadline = "EOD"
+            elif package_id in groups:
+                notes = "Must be delivered with " + ", ".join(str(other) for other in groups[package_id]
+                                                             if other != package_id)
+            elif rng.random() < delayed_rate:
+                notes = "Delayed on flight---will not arrive to depot until " + rng.choice(ARRIVAL_TIMES)
+                deadline = rng.choice(("10:30 AM", "EOD"))
+
+            address = addresses[rng.randrange(1, len(addresses))]
+            writer.writerow([package_id, address, "Salt Lake City", "UT", 84100 + rng.randrange(100), deadline,
+                             rng.randint(1, 88), notes])
+
+
+# Writes a whole instance: a distance table and a package file that only uses its addresses
+def generate_instance(distance_file: str, package_file: str, num_packages: int, num_addresses: int | None = None,
+                      seed: int = 0, kind: str = "euclidean") -> Tuple[str, str]:
+    """
+    Generates a reproducible instance. The same arguments always write the same files.
+    Args:
+        distance_file (str): Path to write the distance table to.
+        package_file (str): Path to write the package file to.
+        num_packages (int): Number of packages.
+        num_addresses (int | None): Number of addresses including the hub. Defaults to one for every 3
+                                    packages, between 27 and 1000, so a truck load spans several stops.
+        seed (int): Seed for the random number generator.
+        kind (str): "euclidean" or "road" distances.
+    Returns:
+        Tuple[str, str]: The distance file and package file paths.
+    """
+    if num_addresses is None:
+        num_addresses = min(max(27, num_packages // 3), 1000)
+
+    rng = random.Random(seed)
+    addresses = generate_addresses(max(num_addresses, 2), rng)
+    write_distance_file(distance_file, addresses, generate_distances(len(addresses), rng, kind))
+    write_package_file(package_file, addresses, num_packages, rng)
+    return distance_file, package_file
@@ -10,10 +10,29 @@ Implements a Graph using an Adjacency Matrix to track address relations and dist
 
 # Standard Library
 import csv
-from typing import List, Dict, Tuple
+import hashlib
+import heapq
+import itertools
+import mmap
+import operator
+import os
+import struct
+from array import array
+from typing import Dict, List, Sequence, Tuple
 
+# Marks a shortest path cache file and its layout version
+_CACHE_MAGIC = b"WGAP0001"
 
-# Creates a table with weights signifying a relation between two edges
+# Marks a binary distance table and its layout version
+_TABLE_MAGIC = b"WGDM0001"
+
+# Binary distance table header: magic, vertex count, address table size in bytes, weight typecode,
+# padding, and the SHA-256 of the CSV it was built from. 64 bytes, so the sections after it stay aligned.
+_TABLE_HEADER = struct.Struct("<8sQQc7x32s")
+
+
+# Creates a table with weights signifying a relation between two edges.
+# The weights are stored row-major in one flat array of doubles, so cell (i, j) lives at i * x + j.
 class AdjacencyMatrix:
     """
     Represents an adjacency matrix for storing edge weights between vertices.
@@ -28,7 +47,7 @@ class AdjacencyMatrix:
         """
         self.x = x
         self.y = y
-        self.adjacency_matrix = [[initial_value] * x for _ in range(y)]
+        self.weights = array('d', [initial_value]) * (x * y)
 
     # Returns the weight at the position (i, j) or None
     def get_weight(self, i: int, j: int) -> float | None:
@@ -42,10 +61,10 @@ class AdjacencyMatrix:
         """
 
         # Checks if the position is in the bounds of the matrix
-        if i < 0 or j < 0 or i >= self.x or j >= self.y:
+        if i < 0 or j < 0 or i >= self.y or j >= self.x:
             return None
 
-        return self.adjacency_matrix[i][j]
+        return self.weights[i * self.x + j]
 
     # Sets the value at position (i, j) to value. Returns if it was successfully set
     def set_weight(self, i: int, j: int, value: float) -> bool:
@@ -56,14 +75,47 @@ class AdjacencyMatrix:
             j (int): Column index.
             value (float): Value to set.
         Returns:
-            bool: True if set, False otherwise.
+            bool: True if set, False if it's out of bounds or the weights are read-only.
         """
 
         # Checks if the position is in the bounds of the matrix
-        if i < 0 or j < 0 or i >= self.x or j >= self.y:
+        if i < 0 or j < 0 or i >= self.y or j >= self.x:
+            return False
+
+        # Weights mapped from a sidecar or cache file can't be changed in place
+        if isinstance(self.weights, memoryview) and self.weights.readonly:
             return False
 
-        self.adjacency_matrix[i][j] = value
+        self.weights[i * self.x + j] = value
+        return True
+
+    # Returns a read-only view of row i, or None if it's out of bounds
+    def get_row(self, i: int) -> memoryview | None:
+        """
+        Returns a read-only view of row i without copying it.
+        Args:
+            i (int): Row index.
+        Returns:
+            memoryview | None: View of the row's weights, or None if out of bounds.
+        """
+        if i < 0 or i >= self.y:
+            return None
+
+        return memoryview(self.weights)[i * self.x:(i + 1) * self.x].toreadonly()
+
+    # Replaces every weight at once from a flat row-major array
+    def set_weights(self, weights: array) -> bool:
+        """
+        Replaces all weights from a flat row-major array. Returns if it was successfully set.
+        Args:
+            weights (array): Array of doubles with x * y values.
+        Returns:
+            bool: True if set, False if the size doesn't match the matrix.
+        """
+        if len(weights) != self.x * self.y:
+            return False
+
+        self.weights = array('d', weights)
         return True
 
     # Returns the Matrix as a grid
@@ -74,9 +126,8 @@ class AdjacencyMatrix:
             str: String representation of the matrix.
         """
         string = ""
-        for i in range(len(self.adjacency_matrix)):
-            for j in range(len(self.adjacency_matrix[i])):
-                item = self.adjacency_matrix[i][j]
+        for i in range(self.y):
+            for item in self.get_row(i):
                 string += f'{item:4}' + " "
 
             string += "\n"
@@ -98,6 +149,10 @@ class Graph:
         self.num_vertices = num_vertices
         self.adjacency_matrix = AdjacencyMatrix(num_vertices, num_vertices)
 
+        # Row-major table of the vertex after i on the shortest path from i to j, or -1 if there's
+        # no path. Only set on graphs built by shortest_path_closure.
+        self.next_hop: array | None = None
+
     # Checks to see if a relation exists between i and j
     def has_edge(self, i: int, j: int) -> bool | None:
         """
@@ -126,6 +181,44 @@ class Graph:
         """
         return self.adjacency_matrix.get_weight(i, j)
 
+    # Returns a read-only view of the distances from vertex i to every vertex
+    def get_row(self, i: int) -> memoryview | None:
+        """
+        Returns a read-only view of the weights from vertex i to every vertex.
+        Args:
+            i (int): Source vertex.
+        Returns:
+            memoryview | None: View indexed by destination vertex, or None if out of bounds.
+        """
+        return self.adjacency_matrix.get_row(i)
+
+    # Returns the closest reachable vertex out of the candidates and its distance from i
+    def find_nearest(self, i: int, vertex_ids: Sequence[int]) -> Tuple[int, float]:
+        """
+        Finds the closest reachable vertex to i out of a batch of candidate vertices.
+        The whole batch is gathered from i's row at once and reduced with a single argmin.
+        Ties go to the candidate that comes first.
+        Args:
+            i (int): Source vertex.
+            vertex_ids (Sequence[int]): Candidate destination vertices.
+        Returns:
+            Tuple[int, float]: Closest vertex and its distance, or (-1, inf) if none are reachable.
+        """
+        row = self.get_row(i)
+        if row is None or not vertex_ids:
+            return -1, float("inf")
+
+        # Gathers every candidate distance, treating a missing edge (-1.0) as unreachable
+        distances = list(map(row.__getitem__, vertex_ids))
+        if min(distances) < 0:
+            distances = [distance if distance >= 0 else float("inf") for distance in distances]
+
+        index = min(range(len(distances)), key=distances.__getitem__)
+        if distances[index] == float("inf"):
+            return -1, float("inf")
+
+        return vertex_ids[index], distances[index]
+
     # Adds an edge between two vertices and sets the weight
     def add_edge(self, i: int, j: int, weight: float = 1.0) -> None:
         """
@@ -138,6 +231,62 @@ class Graph:
         self.adjacency_matrix.set_weight(i, j, weight)
         self.adjacency_matrix.set_weight(j, i, weight)
 
+    # Returns the vertices on the shortest path from i to j
+    def path(self, i: int, j: int) -> List[int]:
+        """
+        Rebuilds the shortest path from i to j by following the next-hop table.
+        Args:
+            i (int): Source vertex.
+            j (int): Destination vertex.
+        Returns:
+            List[int]: Vertices from i to j, both included. Empty if there's no path. Without a next-hop
+                       table, the direct edge [i, j] is returned if it exists.
+        """
+        if self.next_hop is None:
+            return [i, j] if i == j or self.has_edge(i, j) else []
+
+        n = self.num_vertices
+        if i < 0 or j < 0 or i >= n or j >= n or self.next_hop[i * n + j] == -1:
+            return []
+
+        vertices = [i]
+        while i != j:
+            i = self.next_hop[i * n + j]
+            vertices.append(i)
+
+        return vertices
+
+    # Returns a new graph where every weight is the length of the shortest path
+    def shortest_path_closure(self) -> "Graph":
+        """
+        Builds the shortest-path closure of the graph. Every weight becomes the length of the shortest
+        path between its two vertices, which fixes missing edges and tables that break the triangle
+        inequality. The new graph also has a next-hop table for rebuilding the paths.
+        Uses Floyd-Warshall on dense graphs and Dijkstra from every vertex on sparse ones.
+        Returns:
+            Graph: Closure with next_hop set. Vertices with no path between them keep -1.0.
+        """
+        n = self.num_vertices
+        weights = self.adjacency_matrix.weights
+        edges = n * n - sum(map((0.0).__gt__, weights))
+        if edges * 4 < n * n:
+            distances, next_hop = _dijkstra_all_pairs(n, weights)
+        else:
+            distances, next_hop = _floyd_warshall(n, weights)
+
+        # Vertices with no path between them keep -1.0, like a missing edge
+        infinity = float("inf")
+        for index in itertools.compress(range(n * n), map(infinity.__eq__, distances)):
+            distances[index] = -1.0
+
+        closure = Graph(0)
+        closure.num_vertices = n
+        closure.adjacency_matrix.x = n
+        closure.adjacency_matrix.y = n
+        closure.adjacency_matrix.weights = distances
+        closure.next_hop = next_hop
+        return closure
+
     # Gives a string showing the number of vertices and the matrix
     def __str__(self) -> str:
         """
@@ -148,6 +297,250 @@ class Graph:
         return "Number of vertices: " + str(self.num_vertices) + "\n" + str(self.adjacency_matrix)
 
 
+# Floyd-Warshall over a flat row-major weight array
+def _floyd_warshall(n: int, weights: Sequence[float]) -> Tuple[array, array]:
+    """
+    Computes all-pairs shortest paths with Floyd-Warshall in O(n^3). The matrices stay in flat arrays,
+    12 bytes per cell in all, and each row is relaxed through k as a list and only written back if
+    it got shorter.
+    Args:
+        n (int): Number of vertices.
+        weights (Sequence[float]): Row-major weights, with -1.0 for a missing edge.
+    Returns:
+        Tuple[array, array]: Row-major distances with inf for no path, and next hops with -1 for no path.
+    """
+    infinity = float("inf")
+    distances = array('d', weights)
+    next_hop = array('i', range(n)) * n
+    for index in itertools.compress(range(n * n), map((0.0).__gt__, distances)):
+        distances[index] = infinity
+        next_hop[index] = -1
+    for i in range(n):
+        distances[i * n + i] = 0.0
+        next_hop[i * n + i] = i
+
+    for k in range(n):
+        row_k = distances[k * n:(k + 1) * n].tolist()
+        for i in range(n):
+            base = i * n
+            through_k = distances[base + k]
+            if through_k == infinity or i == k:
+                continue
+
+            # Paths only switch when going through k is shorter by more than rounding noise,
+            # so a direct edge wins a tie
+            row_i = distances[base:base + n].tolist()
+            hops = None
+            hop = next_hop[base + k]
+            for j in range(n):
+                candidate = through_k + row_k[j]
+                if candidate < row_i[j] - 1e-9:
+                    row_i[j] = candidate
+                    if hops is None:
+                        hops = next_hop[base:base + n].tolist()
+                    hops[j] = hop
+
+            if hops is not None:
+                distances[base:base + n] = array('d', row_i)
+                next_hop[base:base + n] = array('i', hops)
+
+    _make_symmetric(n, weights, distances)
+    return distances, next_hop
+
+
+# Dijkstra from every vertex over the edges of a flat row-major weight array
+def _dijkstra_all_pairs(n: int, weights: Sequence[float]) -> Tuple[array, array]:
+    """
+    Computes all-pairs shortest paths by running Dijkstra from every vertex, in O(n * e log n).
+    Faster than Floyd-Warshall when most edges are missing.
+    Args:
+        n (int): Number of vertices.
+        weights (Sequence[float]): Row-major weights, with -1.0 for a missing edge.
+    Returns:
+        Tuple[array, array]: Row-major distances with inf for no path, and next hops with -1 for no path.
+    """
+    infinity = float("inf")
+    neighbors = [[(j, weights[i * n + j]) for j in range(n) if j != i and weights[i * n + j] >= 0]
+                 for i in range(n)]
+    distances = array('d', [infinity]) * (n * n)
+    next_hop = array('i', [-1]) * (n * n)
+
+    for source in range(n):
+        base = source * n
+        distances[base + source] = 0.0
+        next_hop[base + source] = source
+        heap = [(0.0, source, source)]
+        while heap:
+            distance, vertex, hop = heapq.heappop(heap)
+            if distance > distances[base + vertex]:
+                continue
+
+            for neighbor, weight in neighbors[vertex]:
+                candidate = distance + weight
+                if candidate < distances[base + neighbor] - 1e-9:
+                    distances[base + neighbor] = candidate
+                    next_hop[base + neighbor] = neighbor if vertex == source else hop
+                    heapq.heappush(heap, (candidate, neighbor, next_hop[base + neighbor]))
+
+    _make_symmetric(n, weights, distances)
+    return distances, next_hop
+
+
+# Copies the shorter direction over the longer one wherever the input table was symmetric
+def _make_symmetric(n: int, weights: Sequence[float], distances: array) -> None:
+    """
+    Evens out the last-bit differences that adding the same path up in two directions leaves behind,
+    so local search can keep treating a symmetric table as symmetric. Each row is compared with its
+    column in one pass, and only the cells that differ are looked at in Python.
+    Args:
+        n (int): Number of vertices.
+        weights (Sequence[float]): Row-major input weights.
+        distances (array): Row-major shortest distances, changed in place.
+    """
+    for i in range(n):
+        row = distances[i * n + i + 1:(i + 1) * n]
+        column = distances[(i + 1) * n + i::n]
+        for j in itertools.compress(range(i + 1, n), map(operator.ne, row, column)):
+            if weights[i * n + j] == weights[j * n + i] and abs(distances[i * n + j] - distances[j * n + i]) < 1e-9:
+                distances[i * n + j] = distances[j * n + i] = min(distances[i * n + j], distances[j * n + i])
+
+
+# Returns the SHA-256 of a file's bytes, read in chunks so large tables don't have to fit in memory
+def file_digest(filename: str) -> bytes:
+    """
+    Hashes a file's contents.
+    Args:
+        filename (str): Path to the file.
+    Returns:
+        bytes: 32 byte SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(filename, mode='rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.digest()
+
+
+# Maps a whole file into memory read-only
+def _map_file(filename: str) -> memoryview:
+    """
+    Memory-maps a file read-only. The file's pages are only read from disk when they're touched,
+    and the mapping stays open for as long as any view of it is alive.
+    Args:
+        filename (str): Path to the file.
+    Returns:
+        memoryview: Bytes of the file.
+    """
+    with open(filename, mode='rb') as file:
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# Writes a file through a temporary file, so a crash never leaves half a file behind
+def write_atomically(filename: str, chunks: Sequence[bytes | array | memoryview]) -> None:
+    """
+    Writes chunks to a temporary file next to filename and then renames it into place.
+    Args:
+        filename (str): Path to write.
+        chunks (Sequence[bytes | array | memoryview]): Data to write, in order.
+    Raises:
+        OSError: If the file can't be written.
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temporary_file = filename + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_file, mode='wb') as file:
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(temporary_file, filename)
+
+
+# Returns the shortest-path closure of a graph read from a file, cached on disk by the file's contents
+def cached_shortest_path_closure(graph: Graph, source_file: str, cache_dir: str,
+                                 digest: bytes | None = None) -> Graph:
+    """
+    Returns graph.shortest_path_closure(), reusing the copy saved for the same distance file.
+    The cache file is named after the distance file and the SHA-256 of its bytes, so editing the table
+    computes the closure again, and the closures of the table's older versions are deleted when the new
+    one is saved. A missing, stale, or damaged cache file is rebuilt. A cached closure is memory-mapped,
+    so its weights are read-only.
+    Args:
+        graph (Graph): Graph read from source_file.
+        source_file (str): Path to the distance table the graph was read from.
+        cache_dir (str): Directory to keep cache files in. It's created if needed.
+        digest (bytes | None): file_digest(source_file), if the caller already has it. None hashes the file.
+    Returns:
+        Graph: Closure with next_hop set.
+    """
+    if digest is None:
+        digest = file_digest(source_file)
+
+    n = graph.num_vertices
+    prefix = os.path.splitext(os.path.basename(source_file))[0] + "-"
+    cache_file = os.path.join(cache_dir, prefix + digest.hex() + ".apsp")
+    try:
+        # Layout: magic, vertex count, n * n distances as doubles, then n * n next hops as ints
+        data = _map_file(cache_file)
+        magic, size = struct.unpack_from("<8sQ", data)
+        matrix_bytes = n * n * 8
+        if magic != _CACHE_MAGIC or size != n or len(data) != 16 + matrix_bytes + n * n * 4:
+            raise ValueError("Not a shortest path cache file for this graph")
+
+        closure = graph_from_buffer(n, data[16:16 + matrix_bytes])
+        closure.next_hop = data[16 + matrix_bytes:].cast('i')
+        return closure
+
+    except (OSError, ValueError, struct.error):
+        pass
+
+    closure = graph.shortest_path_closure()
+    try:
+        write_atomically(cache_file, [struct.pack("<8sQ", _CACHE_MAGIC, n), closure.adjacency_matrix.weights,
+                                       closure.next_hop])
+
+        # Each closure is 12 bytes per pair of addresses, so the ones for older versions of the table go
+        for name in os.listdir(cache_dir):
+            stale_file = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and name.endswith(".apsp") and stale_file != cache_file:
+                os.remove(stale_file)
+
+    # The closure is still good without a cache, such as in a read-only directory
+    except OSError:
+        pass
+
+    return closure
+
+
+# Creates a graph that reads its weights straight from an existing buffer instead of copying them.
+# Used to share one distance matrix between processes through shared memory.
+def graph_from_buffer(num_vertices: int, buffer: memoryview, typecode: str = 'd') -> Graph:
+    """
+    Creates a graph whose weights are a view over a buffer of num_vertices * num_vertices numbers.
+    The buffer isn't copied, so it has to stay open for as long as the graph is used.
+    Args:
+        num_vertices (int): Number of vertices in the graph.
+        buffer (memoryview): Row-major buffer of weights, such as a shared memory block or a mapped file.
+        typecode (str): 'd' for doubles or 'f' for floats.
+    Returns:
+        Graph: Graph backed by the buffer. If the buffer is read-only, so are the weights.
+    Raises:
+        ValueError: If the buffer is too small for the number of vertices.
+    """
+    weights = memoryview(buffer).cast('B').cast(typecode)
+    if len(weights) < num_vertices * num_vertices:
+        raise ValueError("Buffer holds " + str(len(weights)) + " weights, but " + str(num_vertices) +
+                         " vertices need " + str(num_vertices * num_vertices))
+
+    graph = Graph(0)
+    graph.num_vertices = num_vertices
+    graph.adjacency_matrix.x = num_vertices
+    graph.adjacency_matrix.y = num_vertices
+    graph.adjacency_matrix.weights = weights[:num_vertices * num_vertices]
+    return graph
+
+
 # Reads in a CSV file and returns a new graph with a dictionary of addresses to ids and
 # ids to addresses
 def read_distances_to_graph(filename: str) -> Tuple[Graph, Dict[str, int], Dict[int, str]]:
@@ -163,7 +556,7 @@ def read_distances_to_graph(filename: str) -> Tuple[Graph, Dict[str, int], Dict[
 
     # Uses id as the key and address as the value
     ids_address: Dict[int, str] = {}
-    distances: List[List[float]] = []
+    rows = []
 
     with open(filename, mode='r') as file:
         csv_file = csv.reader(file)
@@ -177,18 +570,122 @@ def read_distances_to_graph(filename: str) -> Tuple[Graph, Dict[str, int], Dict[
             ids_address.update({temp_id: line[0]})
             temp_id += 1
 
-            # Loops through all the distances for that location
-            temp: List[float] = []
-            for i in range(1, len(line)):
-                temp.append(float(line[i]))
+            # Keeps all the distances for that location
+            rows.append(array('d', map(float, line[1:])))
 
-            distances.append(temp)
+    # Fills one flat matrix in bulk. The file only holds one half of the table, so every
+    # distance is mirrored to make the matrix symmetric.
+    vertices = len(address_ids)
+    weights = array('d', [-1.0]) * (vertices * vertices)
+    for i in range(len(rows)):
+        row_start = i * vertices
+        for j, weight in enumerate(rows[i]):
+            weights[row_start + j] = weight
+            weights[j * vertices + i] = weight
 
     # Creates the graph and sets the distance to each location as the weight between the edges
-    vertices = len(address_ids)
     graph = Graph(vertices)
-    for i in range(len(distances)):
-        for j in range(len(distances[i])):
-            graph.add_edge(j, i, distances[i][j])
+    graph.adjacency_matrix.set_weights(weights)
 
     return graph, address_ids, ids_address
+
+
+# Writes a graph and its addresses in the binary distance table format
+def write_distance_table(filename: str, graph: Graph, address_ids: Dict[str, int], digest: bytes,
+                         typecode: str = 'd') -> None:
+    """
+    Writes a binary distance table: a 64 byte header, the addresses in id order as NUL separated
+    UTF-8 padded to 8 bytes, then the raw row-major weights in native byte order.
+    Args:
+        filename (str): Path to write.
+        graph (Graph): Graph to write.
+        address_ids (Dict[str, int]): Address to id dict for the graph.
+        digest (bytes): SHA-256 of the CSV the graph was read from.
+        typecode (str): 'd' to store doubles or 'f' to store floats at half the size.
+    Raises:
+        OSError: If the file can't be written.
+    """
+    addresses = sorted(address_ids, key=address_ids.__getitem__)
+    address_bytes = "\0".join(addresses).encode("utf-8")
+    address_bytes += b"\0" * (-len(address_bytes) % 8)
+
+    weights = graph.adjacency_matrix.weights
+    if typecode != memoryview(weights).format:
+        weights = array(typecode, weights)
+
+    header = _TABLE_HEADER.pack(_TABLE_MAGIC, graph.num_vertices, len(address_bytes), typecode.encode("ascii"),
+                                digest)
+    write_atomically(filename, [header, address_bytes, weights])
+
+
+# Maps a binary distance table into a graph without copying the weights
+def read_distance_table(filename: str, digest: bytes | None = None) -> Tuple[Graph, Dict[str, int], Dict[int, str]]:
+    """
+    Memory-maps a binary distance table written by write_distance_table. Only the addresses are
+    decoded. The weights stay in the mapped file and are read-only.
+    Args:
+        filename (str): Path to the binary table.
+        digest (bytes | None): SHA-256 the table's CSV must have. None skips the check.
+    Returns:
+        tuple[Graph, dict[str, int], dict[int, str]]: Graph, address-to-id dict, id-to-address dict.
+    Raises:
+        OSError: If the file can't be read.
+        ValueError: If the file isn't a distance table, is cut short, or was built from a different CSV.
+    """
+    data = _map_file(filename)
+    if len(data) < _TABLE_HEADER.size:
+        raise ValueError("\"" + filename + "\" is too short to be a distance table")
+
+    magic, vertices, address_size, typecode, table_digest = _TABLE_HEADER.unpack_from(data)
+    if magic != _TABLE_MAGIC:
+        raise ValueError("\"" + filename + "\" isn't a distance table")
+
+    if digest is not None and table_digest != digest:
+        raise ValueError("\"" + filename + "\" was built from a different CSV")
+
+    typecode = typecode.decode("ascii")
+    start = _TABLE_HEADER.size + address_size
+    end = start + vertices * vertices * struct.calcsize(typecode)
+    if len(data) != end:
+        raise ValueError("\"" + filename + "\" is the wrong size for " + str(vertices) + " vertices")
+
+    addresses = bytes(data[_TABLE_HEADER.size:start]).rstrip(b"\0").decode("utf-8").split("\0")
+    if vertices == 0:
+        addresses = []
+
+    address_ids = {address: vertex for vertex, address in enumerate(addresses)}
+    ids_address = dict(enumerate(addresses))
+    return graph_from_buffer(vertices, data[start:end], typecode), address_ids, ids_address
+
+
+# Loads the distance table from its binary sidecar, building the sidecar from the CSV when needed
+def load_distances(filename: str, sidecar_file: str, typecode: str = 'd',
+                   digest: bytes | None = None) -> Tuple[Graph, Dict[str, int], Dict[int, str]]:
+    """
+    Loads a distance table CSV through a binary sidecar. The sidecar records the SHA-256 of the CSV,
+    so it's only rebuilt when the CSV changes. Otherwise the matrix is memory-mapped straight from
+    the sidecar with no parsing and no copy.
+    Args:
+        filename (str): Path to the distance table CSV.
+        sidecar_file (str): Path to the binary table. Its directory is created if needed.
+        typecode (str): 'd' or 'f' for the weights in a newly written sidecar.
+        digest (bytes | None): file_digest(filename), if the caller already has it. None hashes the file.
+    Returns:
+        tuple[Graph, dict[str, int], dict[int, str]]: Graph, address-to-id dict, id-to-address dict.
+    """
+    if digest is None:
+        digest = file_digest(filename)
+    try:
+        return read_distance_table(sidecar_file, digest)
+    except (OSError, ValueError, UnicodeDecodeError):
+        pass
+
+    graph, address_ids, ids_address = read_distances_to_graph(filename)
+
+    # A sidecar that can't be written only costs the next start another CSV parse
+    try:
+        write_distance_table(sidecar_file, graph, address_ids, digest, typecode)
+    except OSError:
+        return graph, address_ids, ids_address
+
+    return read_distance_table(sidecar_file, digest)
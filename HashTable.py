@@ -1,194 +1,322 @@
 """
 HashTable.py
-Implements a Hash Table using Nodes with a singly linked list for package storage and lookup.
+Implements a Hash Table using open addressing with linear probing for package storage and lookup.
 """
 # Author: Zack Mathias | 010868562
 # Course: C950 - Data Structures and Algorithms II
 # Project: WGUPS Routing Program
 # File: HashTable.py
-# Purpose: Implements a Hash Table using Nodes with a singly linked list
+# Purpose: Implements a resizing Hash Table using open addressing
 
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 
+# Markers for slots that have never been used and slots whose key was removed. They're unique
+# objects, so every key, including -1 and None, can be stored.
+_EMPTY = object()
+_DELETED = object()
 
-# Holds the key, value, and next object for each hash table implementation
+
+# Holds the key and value of an entry removed from the hash table
 class Node:
     """
-    Represents a node in a singly linked list for hash table buckets.
+    Represents a key and value pair removed from the hash table.
     """
 
-    def __init__(self, key=-1, value=None):
+    def __init__(self, key=None, value=None):
         """
         Initializes a Node.
         Args:
-            key (int): Key for the node.
+            key (any): Key for the node.
             value (any): Value stored in the node.
         """
         self.key = key
         self.value = value
-        self.next = None
 
-    # Prints the Node and all Nodes linked
+    # Prints the Node's value
     def __str__(self):
         """
-        Returns a string representation of the node and its linked nodes.
+        Returns a string representation of the node.
         Returns:
-            str: String representation of the node chain.
+            str: String representation of the node.
         """
-        string = ""
-        current = self
-        while current:
-            string += str(current.value)
-            current = current.next
-            if current:
-                string += " -> "
-
-        string += "\n"
-        return string
+        return str(self.value) + "\n"
 
 
 # Hash Table implementation
 class HashTable:
     """
-    Implements a hash table with separate chaining using singly linked lists.
+    Implements a hash table with open addressing and linear probing. Keys and values are kept in
+    two parallel lists, and the table doubles in size whenever it gets fuller than the load factor.
     """
 
     # Initializes values to default
-    def __init__(self, capacity=10):
+    def __init__(self, capacity=16, load_factor=0.5):
         """
         Initializes the hash table with a given capacity.
         Args:
-            capacity (int): Number of buckets in the hash table.
+            capacity (int): Starting number of slots. It's rounded up to a power of two.
+            load_factor (float): Largest fraction of used slots before the table grows, between 0 and 1.
         """
-        self.table: List[Node] = []
-        self.capacity = capacity
+        if not 0 < load_factor < 1:
+            raise ValueError("load_factor must be between 0 and 1, not " + str(load_factor))
+
+        self.load_factor = load_factor
         self.num_keys = 0
-        for i in range(0, self.capacity):
-            self.table.append(Node())
+        self._allocate(capacity)
+
+    # Creates empty key and value lists with at least the given number of slots
+    def _allocate(self, capacity: int) -> None:
+        """
+        Replaces the storage with empty key and value lists.
+        Args:
+            capacity (int): Minimum number of slots. It's rounded up to a power of two.
+        """
+        self.capacity = 8
+        while self.capacity < capacity:
+            self.capacity *= 2
+
+        self.key_slots: List[any] = [_EMPTY] * self.capacity
+        self.value_slots: List[any] = [None] * self.capacity
 
-    # Basic hash function using the capacity and the key
-    def hash_function(self, key: int) -> int:
+        # Used counts live keys and removed slots, since both make probe chains longer
+        self.used = 0
+
+    # Returns the slot holding the key, or -1 if the key isn't in the table
+    def _find_slot(self, key: any) -> int:
         """
-        Basic hash function using the capacity and the key.
+        Probes for the slot holding the key.
         Args:
-            key (int): Key to hash.
+            key (any): Key to find.
         Returns:
-            int: Bucket index.
+            int: Slot index, or -1 if not found.
+        """
+        keys = self.key_slots
+        mask = self.capacity - 1
+        index = hash(key) & mask
+
+        # Walks forward until the key or a never used slot is found. Removed slots are skipped,
+        # since the key may have been probed past them when it was inserted.
+        while True:
+            current = keys[index]
+            if current is _EMPTY:
+                return -1
+
+            if current is not _DELETED and (current is key or current == key):
+                return index
+
+            index = (index + 1) & mask
+
+    # Moves every key into a table with the given number of slots
+    def _resize(self, capacity: int) -> None:
         """
-        return key % self.capacity
+        Rebuilds the table with a new capacity, dropping removed slots.
+        Args:
+            capacity (int): Minimum number of slots in the new table.
+        """
+        old_keys = self.key_slots
+        old_values = self.value_slots
+        self._allocate(capacity)
+
+        keys = self.key_slots
+        values = self.value_slots
+        mask = self.capacity - 1
+        for position in range(len(old_keys)):
+            key = old_keys[position]
+            if key is _EMPTY or key is _DELETED:
+                continue
+
+            index = hash(key) & mask
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
 
-    # Inserts a Node into the hash table
-    def insert(self, key: int, value: any) -> None:
+            keys[index] = key
+            values[index] = old_values[position]
+
+        self.used = self.num_keys
+
+    # Inserts a key and value into the hash table
+    def insert(self, key: any, value: any) -> None:
         """
-        Inserts a Node into the hash table.
+        Inserts a key and value into the hash table, replacing the value if the key already exists.
         Args:
-            key (int): Key for the node.
+            key (any): Key to insert.
             value (any): Value to store.
         """
-        index = self.hash_function(key)
+        keys = self.key_slots
+        mask = self.capacity - 1
+        index = hash(key) & mask
+        free_slot = -1
 
-        # If the location is empty, put the value in place
-        if self.table[index].key == -1:
-            self.table[index].key = key
-            self.table[index].value = value
-            self.num_keys += 1
-            return
+        # Look for the key, remembering the first removed slot so it can be reused
+        while True:
+            current = keys[index]
+            if current is _EMPTY:
+                break
 
-        # A Node exits, so iterate through the list until you get to the end or find the key
-        current = self.table[index]
-        while current.key != key and current.next is not None:
-            current = current.next
+            if current is _DELETED:
+                if free_slot == -1:
+                    free_slot = index
 
-        # If the current node has the same key, then update the value
-        if current.key == key:
-            current.value = value
+            elif current is key or current == key:
+                self.value_slots[index] = value
+                return
 
-        # Otherwise, add a new Node to the end of the list
+            index = (index + 1) & mask
+
+        # The key is new, so put it in the first removed slot found or the empty slot that ended the probe
+        if free_slot != -1:
+            index = free_slot
         else:
-            current.next = Node(key, value)
-            self.num_keys += 1
+            self.used += 1
+
+        keys[index] = key
+        self.value_slots[index] = value
+        self.num_keys += 1
+
+        # Grow once too many slots are used. If most of them are removed slots, rebuilding
+        # at the same size is enough to clear them out.
+        if self.used > self.capacity * self.load_factor:
+            if self.num_keys > self.capacity * self.load_factor / 2:
+                self._resize(self.capacity * 2)
+            else:
+                self._resize(self.capacity)
 
     # Returns the value of the key found or None
-    def lookup(self, key: int) -> any:
+    def lookup(self, key: any) -> any:
         """
         Returns the value of the key found or None.
         Args:
-            key (int): Key to look up.
+            key (any): Key to look up.
         Returns:
             any: Value associated with the key, or None if not found.
         """
-        index = self.hash_function(key)
+        index = self._find_slot(key)
+        if index == -1:
+            return None
 
-        # Nothing exists at that location yet
-        if self.table[index].key == -1:
+        return self.value_slots[index]
+
+    # Removes a key if it exists in the hash table
+    def remove(self, key: any) -> Node | None:
+        """
+        Removes a key if it exists in the hash table.
+        Args:
+            key (any): Key to remove.
+        Returns:
+            Node | None: Node holding the removed key and value, or None if not found.
+        """
+        index = self._find_slot(key)
+        if index == -1:
             return None
 
-        # Iterate until we find a matching key or get to the end of the list
-        current = self.table[index]
-        while current.key != key and current.next is not None:
-            current = current.next
+        # Mark the slot as removed rather than empty so later keys in the same probe chain stay reachable
+        removed = Node(self.key_slots[index], self.value_slots[index])
+        self.key_slots[index] = _DELETED
+        self.value_slots[index] = None
+        self.num_keys -= 1
+        return removed
 
-        # We found the matching key, return the value
-        if current.key == key:
-            return current.value
+    # Inserts every key and value pair, growing the table once up front instead of while inserting
+    def insert_many(self, pairs: Iterable[Tuple[any, any]]) -> None:
+        """
+        Inserts many keys and values at once.
+        Args:
+            pairs (Iterable[Tuple[any, any]]): Key and value pairs to insert.
+        """
+        pairs = list(pairs)
+        needed = self.num_keys + len(pairs)
+        if needed > self.capacity * self.load_factor:
+            self._resize(int(needed / self.load_factor) + 1)
 
-        # The key didn't exist
-        return None
+        for key, value in pairs:
+            self.insert(key, value)
 
-    # Removes a node if it exists in the hash table
-    def remove(self, key: int) -> Node | None:
+    # Returns the values for many keys at once, with None for missing keys
+    def lookup_many(self, keys: Iterable[any]) -> List[any]:
         """
-        Removes a node if it exists in the hash table.
+        Returns the value of every key given, in the same order.
         Args:
-            key (int): Key to remove.
+            keys (Iterable[any]): Keys to look up.
         Returns:
-            Node | None: Removed node, or None if not found.
+            List[any]: Values for each key, or None where the key isn't found.
         """
-        index = self.hash_function(key)
-
-        # It doesn't exist.
-        if self.table[index].key == -1:
-            return None
+        values = self.value_slots
+        result = []
+        for key in keys:
+            index = self._find_slot(key)
+            result.append(values[index] if index != -1 else None)
 
-        # Iterate through the list until we find the key or get to the end.
-        # Keeping track of the previous node
-        current = self.table[index]
-        last = None
-        while current.key != key and current.next is not None:
-            last = current
-            current = current.next
+        return result
 
-        # We found the key in the list
-        if current.key == key:
+    # Returns every key and value pair by walking the slots once
+    def items(self) -> Iterator[Tuple[any, any]]:
+        """
+        Iterates over every key and value pair in slot order.
+        Returns:
+            Iterator[Tuple[any, any]]: Key and value pairs.
+        """
+        keys = self.key_slots
+        values = self.value_slots
+        for index in range(len(keys)):
+            key = keys[index]
+            if key is not _EMPTY and key is not _DELETED:
+                yield key, values[index]
 
-            # The key was in the middle or at the end of the list
-            if last is not None:
-                last.next = current.next
+    # Returns every value by walking the slots once
+    def values(self) -> Iterator[any]:
+        """
+        Iterates over every value in slot order.
+        Returns:
+            Iterator[any]: Values in the table.
+        """
+        for _, value in self.items():
+            yield value
 
-            # The key was the head of the list
-            else:
-                self.table[index] = current.next
+    # Iterates over the keys
+    def __iter__(self) -> Iterator[any]:
+        """
+        Iterates over every key in slot order.
+        Returns:
+            Iterator[any]: Keys in the table.
+        """
+        for key, _ in self.items():
+            yield key
 
-            # Return the removed node
-            self.num_keys -= 1
-            return current
+    # Returns the number of keys
+    def __len__(self) -> int:
+        """
+        Returns the number of keys in the hash table.
+        Returns:
+            int: Number of keys.
+        """
+        return self.num_keys
 
-        # The Node doesn't exist
-        return None
+    # Checks if a key is in the hash table
+    def __contains__(self, key: any) -> bool:
+        """
+        Checks if a key is in the hash table.
+        Args:
+            key (any): Key to check.
+        Returns:
+            bool: True if the key exists.
+        """
+        return self._find_slot(key) != -1
 
-    # Used to print the hash table into buckets
+    # Used to print the hash table into slots
     def __str__(self):
         """
-        Returns a string representation of the hash table buckets and their contents.
+        Returns a string representation of the hash table slots and their contents.
         Returns:
             str: String representation of the hash table.
         """
         string = ""
-        bucket_num = 0
-        for item in self.table:
-            string += "Bucket " + str(bucket_num) + ": "
-            string += str(item)
-            bucket_num += 1
+        for index in range(self.capacity):
+            key = self.key_slots[index]
+            string += "Bucket " + str(index) + ": "
+            if key is not _EMPTY and key is not _DELETED:
+                string += str(self.value_slots[index])
+
+            string += "\n"
 
         string += "\n"
         return string
@@ -0,0 +1,345 @@
+"""
+Instrument.py
+Optional timers, counters, and cProfile dumps for finding where a run spends its time.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Instrument.py
+# Purpose: Breaks a run down by phase without attaching a profiler, and costs next to nothing when off
+
+# Standard Library
+import contextlib
+import functools
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Sequence, TextIO, Tuple
+
+# Created Imports
+from Graph import AdjacencyMatrix, Graph
+from HashTable import HashTable
+
+# Environment variable that turns instrumentation on. "1" or "on" collects timers and counters,
+# "timers" collects only the timers, and any other value is also a file to save a cProfile dump to.
+ENVIRONMENT_VARIABLE = "WGUPS_PROFILE"
+
+# Command line flag that turns instrumentation on, as --profile or --profile=<file>
+FLAG = "--profile"
+
+# Methods counted while instrumentation is on, as (class, method name, counter name)
+HOT_PATHS = (
+    (AdjacencyMatrix, "get_weight", "matrix.get_weight"),
+    (AdjacencyMatrix, "get_row", "matrix.get_row"),
+    (Graph, "get_edge", "graph.get_edge"),
+    (Graph, "get_row", "graph.get_row"),
+    (Graph, "find_nearest", "graph.find_nearest"),
+)
+
+# Whether timers and counters are collecting
+_enabled = False
+
+# Calls and total seconds for each phase, and the value of each counter
+_phases: Dict[str, List[float]] = {}
+_counters: Dict[str, int] = {}
+
+# The running cProfile.Profile and where to save it, if cProfile was asked for. cProfile, pstats, and
+# json pull in a lot of the standard library, so they're only imported when they're used.
+_profiler = None
+_profile_file: str | None = None
+
+# Original methods replaced by counting wrappers, so they can be put back
+_patched: List[Tuple[type, str, Callable]] = []
+
+# Shared do-nothing timer handed out while instrumentation is off
+_NULL_TIMER = contextlib.nullcontext()
+
+
+# Times one pass through a phase
+class _Timer:
+    """
+    Context manager that adds its elapsed time and one call to a phase.
+    """
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        """
+        Initializes a _Timer.
+        Args:
+            name (str): Phase to add the time to.
+        """
+        self.name = name
+        self.start = 0.0
+
+    # Starts the clock
+    def __enter__(self) -> "_Timer":
+        """
+        Starts timing.
+        Returns:
+            _Timer: This timer.
+        """
+        self.start = time.perf_counter()
+        return self
+
+    # Stops the clock and adds the time to the phase
+    def __exit__(self, *_) -> None:
+        """
+        Adds the elapsed time and one call to the phase.
+        """
+        elapsed = time.perf_counter() - self.start
+        totals = _phases.get(self.name)
+        if totals is None:
+            _phases[self.name] = [1, elapsed]
+        else:
+            totals[0] += 1
+            totals[1] += elapsed
+
+
+# Returns whether instrumentation is on
+def enabled() -> bool:
+    """
+    Returns whether timers and counters are collecting.
+    Returns:
+        bool: True if instrumentation is on.
+    """
+    return _enabled
+
+
+# Times a block of code as a phase
+def phase(name: str):
+    """
+    Returns a context manager that times the block under name. Phases can nest, and each one
+    counts its full time, including the phases inside it.
+    Args:
+        name (str): Phase name.
+    Returns:
+        A context manager. While instrumentation is off it's a shared object that does nothing.
+    """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+# Times every call to a function as a phase
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator that times each call of the function under name while instrumentation is on.
+    Args:
+        name (str): Phase name.
+    Returns:
+        Callable[[Callable], Callable]: Decorator.
+    """
+    def decorate(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+
+            with _Timer(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# Adds to a counter
+def count(name: str, amount: int = 1) -> None:
+    """
+    Adds amount to the counter called name while instrumentation is on.
+    Args:
+        name (str): Counter name.
+        amount (int): Amount to add.
+    """
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+# Wraps a method so each call adds to a counter
+def _count_calls(cls: type, method_name: str, counter: str) -> None:
+    """
+    Replaces a method with a wrapper that counts its calls.
+    Args:
+        cls (type): Class that defines the method.
+        method_name (str): Method to wrap.
+        counter (str): Counter to add to.
+    """
+    method = cls.__dict__[method_name]
+    _patched.append((cls, method_name, method))
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        _counters[counter] = _counters.get(counter, 0) + 1
+        return method(*args, **kwargs)
+
+    setattr(cls, method_name, wrapper)
+
+
+# Wraps the hash table's probe so each lookup counts its probes
+def _count_probes() -> None:
+    """
+    Replaces HashTable._find_slot with a wrapper that counts lookups, misses, and the probes a
+    found key took, worked out from how far its slot is from its home slot.
+    """
+    find_slot = HashTable.__dict__["_find_slot"]
+    _patched.append((HashTable, "_find_slot", find_slot))
+
+    @functools.wraps(find_slot)
+    def wrapper(self, key):
+        index = find_slot(self, key)
+        _counters["hash.lookups"] = _counters.get("hash.lookups", 0) + 1
+        if index == -1:
+            _counters["hash.misses"] = _counters.get("hash.misses", 0) + 1
+        else:
+            mask = self.capacity - 1
+            probes = ((index - (hash(key) & mask)) & mask) + 1
+            _counters["hash.probes"] = _counters.get("hash.probes", 0) + probes
+        return index
+
+    HashTable._find_slot = wrapper
+
+
+# Turns instrumentation on
+def enable(profile_file: str | None = None, hot_paths: bool = True) -> None:
+    """
+    Starts collecting timers and counters. While it's off, the hot paths run their original code,
+    so counting them costs nothing.
+    Args:
+        profile_file (str | None): File to save a cProfile dump to when finish() is called. None skips cProfile.
+        hot_paths (bool): Counts matrix lookups and hash table probes. They're the slowest thing to count.
+    """
+    global _enabled, _profiler, _profile_file
+    if _enabled:
+        return
+
+    _enabled = True
+    if hot_paths:
+        for cls, method_name, counter in HOT_PATHS:
+            _count_calls(cls, method_name, counter)
+        _count_probes()
+
+    if profile_file is not None:
+        import cProfile
+        _profile_file = profile_file
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+# Turns instrumentation off and puts the original methods back
+def disable() -> None:
+    """
+    Stops collecting and restores every wrapped method. The collected numbers are kept until reset().
+    """
+    global _enabled
+    _enabled = False
+    while _patched:
+        cls, method_name, method = _patched.pop()
+        setattr(cls, method_name, method)
+
+    if _profiler is not None:
+        _profiler.disable()
+
+
+# Clears everything collected so far
+def reset() -> None:
+    """
+    Clears the phases and counters.
+    """
+    _phases.clear()
+    _counters.clear()
+
+
+# Turns instrumentation on from the environment variable or the command line flag
+def configure(arguments: Sequence[str] = ()) -> List[str]:
+    """
+    Turns instrumentation on if the WGUPS_PROFILE environment variable is set, or if the arguments hold
+    --profile or --profile=<value>. The value is "1", "on", "timers" for timers without counters, or
+    a file name, which also turns on cProfile.
+    Args:
+        arguments (Sequence[str]): Command line arguments.
+    Returns:
+        List[str]: The arguments without the profile flag.
+    """
+    profile = os.environ.get(ENVIRONMENT_VARIABLE, "")
+    remaining = []
+    for argument in arguments:
+        if argument == FLAG:
+            profile = profile or "1"
+        elif argument.startswith(FLAG + "="):
+            profile = argument[len(FLAG) + 1:]
+        else:
+            remaining.append(argument)
+
+    mode = profile.lower()
+    if mode == "timers":
+        enable(hot_paths=False)
+    elif mode and mode not in ("0", "off"):
+        enable(None if mode in ("1", "on") else profile)
+
+    return remaining
+
+
+# Returns everything collected so far
+def report() -> Dict[str, Dict[str, any]]:
+    """
+    Returns the phase breakdown and counters.
+    Returns:
+        Dict[str, Dict[str, any]]: "phases" maps each phase to its calls and seconds, slowest first.
+                                   "counters" maps each counter to its value.
+    """
+    phases = sorted(_phases.items(), key=lambda item: item[1][1], reverse=True)
+    return {
+        "phases": {name: {"calls": int(calls), "seconds": seconds} for name, (calls, seconds) in phases},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+# Prints the phase breakdown and counters as a table
+def print_report(file: TextIO = sys.stderr) -> None:
+    """
+    Prints the report. It goes to stderr by default, so it doesn't mix with the program's output.
+    Args:
+        file (TextIO): Stream to print to.
+    """
+    collected = report()
+    print("Phase                     calls    time (ms)", file=file)
+    for name, totals in collected["phases"].items():
+        print(f"{name:<22} {totals['calls']:>8} {totals['seconds'] * 1000:12.2f}", file=file)
+
+    if collected["counters"]:
+        print("Counter                          value", file=file)
+        for name, value in collected["counters"].items():
+            print(f"{name:<22} {value:>14}", file=file)
+
+
+# Saves the report as JSON
+def write_report(filename: str) -> None:
+    """
+    Saves the report as JSON.
+    Args:
+        filename (str): Path to write.
+    """
+    import json
+    with open(filename, mode='w') as file:
+        json.dump(report(), file, indent=2)
+        file.write("\n")
+
+
+# Stops instrumentation, prints the report, and saves the cProfile dump
+def finish(file: TextIO = sys.stderr) -> None:
+    """
+    Ends an instrumented run. Does nothing if instrumentation was never turned on. The cProfile dump
+    can be read with pstats or "python -m pstats <file>".
+    Args:
+        file (TextIO): Stream to print the report to.
+    """
+    global _profiler
+    if not _enabled and _profiler is None:
+        return
+
+    disable()
+    print_report(file)
+    if _profiler is not None:
+        import pstats
+        _profiler.dump_stats(_profile_file)
+        print("cProfile saved to " + _profile_file, file=file)
+        pstats.Stats(_profile_file, stream=file).sort_stats("cumulative").print_stats(15)
+        _profiler = None
@@ -0,0 +1,143 @@
+"""
+Optimizer.py
+Runs randomized route construction and local search from many seeds across a process pool.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Optimizer.py
+# Purpose: Uses every core to search for a shorter route than a single nearest-neighbor run finds
+
+# Standard Library
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+# Created Imports
+import Route
+from Graph import Graph, graph_from_buffer
+
+# The graph each worker process reads from. It's a view over the shared memory block, set up
+# once per worker by _attach_graph.
+_worker_graph: Graph | None = None
+_worker_memory: shared_memory.SharedMemory | None = None
+
+
+# Runs in each worker when it starts and maps the shared distance matrix into the process
+def _attach_graph(memory_name: str, num_vertices: int, typecode: str = 'd') -> None:
+    """
+    Attaches a worker process to the shared distance matrix.
+    Args:
+        memory_name (str): Name of the shared memory block.
+        num_vertices (int): Number of vertices in the graph.
+        typecode (str): Typecode of the weights, 'd' or 'f'.
+    """
+    global _worker_graph, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_graph = graph_from_buffer(num_vertices, _worker_memory.buf, typecode)
+
+
+# Builds and improves one route from a single seed inside a worker
+def _solve_seed(start: int, stops: List[int], deadlines: Dict[int, float], speed: float, seed: int,
+                max_moves: int, time_limit: float | None) -> Tuple[float, float, List[int]]:
+    """
+    Builds a randomized route for one seed and improves it with local search.
+    Seed 0 uses plain nearest-neighbor, so the result is never worse than the single start.
+    Args:
+        start (int): Vertex the truck starts from and returns to.
+        stops (List[int]): Vertices to visit.
+        deadlines (Dict[int, float]): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+        seed (int): Seed for the randomized construction.
+        max_moves (int): Most moves the local search may make.
+        time_limit (float | None): Seconds after which the local search stops anyway. None never stops on time.
+    Returns:
+        Tuple[float, float, List[int]]: Lateness in minutes, distance, and the visit order.
+    """
+    graph = _worker_graph
+    if seed == 0:
+        tour = Route.nearest_neighbor_tour(graph, start, stops)
+    else:
+        tour = Route.randomized_tour(graph, start, stops, random.Random(seed))
+
+    tour = Route.improve_tour(graph, start, tour, deadlines, speed, max_moves, time_limit=time_limit)
+    return (Route.tour_lateness(graph, start, tour, deadlines, speed), Route.tour_distance(graph, start, tour),
+            tour)
+
+
+# Searches for routes from many seeds at once over a pool of worker processes
+class MultiStartOptimizer:
+    """
+    Multi-start route optimizer. The distance matrix is copied once into shared memory and every
+    worker reads it from there, so it isn't pickled for each task.
+    """
+    def __init__(self, graph: Graph, workers: int | None = None):
+        """
+        Copies the graph into shared memory and starts the worker pool.
+        Args:
+            graph (Graph): Graph holding the distances.
+            workers (int | None): Number of worker processes. Defaults to the number of CPUs.
+        """
+        self.num_vertices = graph.num_vertices
+        weights = memoryview(graph.adjacency_matrix.weights)
+        typecode = weights.format
+        weights = weights.cast('B')
+        self.memory = shared_memory.SharedMemory(create=True, size=max(weights.nbytes, 1))
+        self.memory.buf[:weights.nbytes] = weights
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_attach_graph,
+                                            initargs=(self.memory.name, self.num_vertices, typecode))
+
+    # Returns the best route found over all the seeds
+    def best_tour(self, start: int, stops: Sequence[int], deadlines: Dict[int, float] | None = None,
+                  speed: float = 18, seeds: int = 32, max_moves: int = 1000,
+                  time_limit: float | None = None) -> List[int]:
+        """
+        Builds and improves a route from every seed in parallel and keeps the best one.
+        Routes that are less late always win. Between equally punctual routes, the shortest wins.
+        Args:
+            start (int): Vertex the truck starts from and returns to.
+            stops (Sequence[int]): Vertices to visit.
+            deadlines (Dict[int, float] | None): Latest arrival for a vertex in minutes after departure.
+            speed (float): Truck speed in miles per hour.
+            seeds (int): Number of starts to run.
+            max_moves (int): Most moves the local search may make on each start.
+            time_limit (float | None): Seconds after which the local search on a start stops anyway. None never
+                                       stops on time.
+        Returns:
+            List[int]: The best visit order found.
+        """
+        stops = list(stops)
+        deadlines = deadlines or {}
+        count = max(seeds, 1)
+        results = self.executor.map(_solve_seed, [start] * count, [stops] * count, [deadlines] * count,
+                                    [speed] * count, range(count), [max_moves] * count, [time_limit] * count)
+
+        # Sorting on (lateness, distance) keeps the first seed on ties, so results are repeatable
+        best = min(results, key=lambda result: (result[0], result[1]))
+        return best[2]
+
+    # Stops the workers and frees the shared memory
+    def close(self) -> None:
+        """
+        Shuts down the worker pool and releases the shared distance matrix.
+        """
+        self.executor.shutdown()
+        self.memory.close()
+        self.memory.unlink()
+
+    # Lets the optimizer be used in a with block
+    def __enter__(self) -> "MultiStartOptimizer":
+        """
+        Returns the optimizer for use in a with block.
+        Returns:
+            MultiStartOptimizer: This optimizer.
+        """
+        return self
+
+    # Closes the optimizer when the with block ends
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Closes the optimizer when the with block ends.
+        """
+        self.close()
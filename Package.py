@@ -13,10 +13,16 @@ Defines the Package class and helper functions for package management, loading,
 # Standard Library
 import csv
 import datetime
-from typing import List, Tuple
+import itertools
+import sys
+from enum import IntEnum
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 # Created Imports
+import Instrument
+from Clock import BASE_DATE, END_OF_DAY_MINUTES, parse_seconds, to_datetime, to_seconds
 from HashTable import HashTable
+from PackageRepository import PackageRepository
 
 
 # Used to help format the Package string for consistent width
@@ -47,17 +53,71 @@ def left_pad(value: any, width: int, pad_char: str = " ") -> str:
     return result
 
 
+# End of day in seconds since midnight. Used for "EOD" deadlines and packages whose deadline is reset.
+END_OF_DAY = END_OF_DAY_MINUTES * 60
+
+# The package with a wrong address gets its corrected address at this time, in seconds since midnight
+ADDRESS_CORRECTION_TIME = parse_seconds("10:20 AM")
+
+# The corrected (address, city, state, zip code) for the package with a wrong address
+CORRECTED_ADDRESS = ("410 S State St", "Salt Lake City", "UT", 84111)
+
+# Number of rows read_packages parses and inserts at a time
+READ_CHUNK_SIZE = 1024
+
+
+# Where a package is in the delivery process. Comparisons are plain integer comparisons.
+class PackageStatus(IntEnum):
+    """
+    Delivery status of a package.
+    """
+    NONE = 0
+    AT_HUB = 1
+    DELAYED = 2
+    UPDATING_ADDRESS = 3
+    EN_ROUTE = 4
+    DELIVERED = 5
+
+    # Prints the status the way it's shown to the user
+    def __str__(self) -> str:
+        """
+        Returns the status label shown to the user.
+        Returns:
+            str: Status label.
+        """
+        return STATUS_LABELS[self]
+
+
+# The label printed for each status
+STATUS_LABELS = {
+    PackageStatus.NONE: "None",
+    PackageStatus.AT_HUB: "At the Hub",
+    PackageStatus.DELAYED: "Delayed",
+    PackageStatus.UPDATING_ADDRESS: "Updating Address",
+    PackageStatus.EN_ROUTE: "En route",
+    PackageStatus.DELIVERED: "Delivered",
+}
+
+
 # Wraps all the Package info into a single object
 class Package:
     """
     Represents a delivery package with all relevant information and status.
+    Uses __slots__ instead of a __dict__, interns the strings that repeat across packages, and keeps
+    the deadline and delivery time as seconds since midnight.
     """
+    __slots__ = ("repository", "address_ids", "id", "_address", "vertex_id", "city", "state", "zip_code",
+                 "deadline_seconds", "weight", "special_notes", "_status", "delivery_seconds", "_truck",
+                 "required_truck", "group_ids", "available_seconds", "corrected_address")
+
     def __init__(self, package_id: int = -1, address: str = "", city: str = "", state: str = "", zip_code: int = -1,
                  deadline: datetime.datetime = datetime.datetime(year=1, month=1, day=1, hour=0, minute=0),
                  weight: int = 0,
                  special_notes: str = "",
-                 status: str = "None",
-                 delivery_time: datetime.datetime = datetime.datetime(year=1, month=1, day=1, hour=0, minute=0)):
+                 status: PackageStatus = PackageStatus.NONE,
+                 delivery_time: datetime.datetime = datetime.datetime(year=1, month=1, day=1, hour=0, minute=0),
+                 address_ids: Dict[str, int] | None = None,
+                 truck: int = 0):
         """
         Initializes a Package object.
         Args:
@@ -68,20 +128,224 @@ class Package:
             zip_code (int): Delivery zip code.
             deadline (datetime.datetime): Delivery deadline.
             weight (int): Package weight.
-            special_notes (str): Special notes or constraints.
-            status (str): Current status.
+            special_notes (str): Special notes as written in the package file.
+            status (PackageStatus): Current status.
             delivery_time (datetime.datetime): Delivery time.
+            address_ids (Dict[str, int] | None): Address to vertex id dict used to resolve the vertex id.
+            truck (int): Number of the truck the package is loaded on, or 0 if it isn't loaded.
         """
+        # The repository keeping indexes on this package, set when it's inserted into one
+        self.repository = None
+        self.address_ids = address_ids
         self.id = package_id
         self.address = address
-        self.city = city
-        self.state = state
+        self.city = sys.intern(city)
+        self.state = sys.intern(state)
         self.zip_code = zip_code
         self.deadline = deadline
         self.weight = weight
         self.special_notes = special_notes
         self.status = status
         self.delivery_time = delivery_time
+        self.truck = truck
+
+        # Constraints parsed from the special notes once, by parse_special_notes:
+        # - required_truck is the truck the package must be on, or 0 for any truck
+        # - group_ids are the other packages it must be delivered with
+        # - available_seconds is when it reaches the hub in seconds since midnight, or 0 if it's there at the start
+        # - corrected_address is the (address, city, state, zip code) it must be changed to, or None
+        self.required_truck = 0
+        self.group_ids: Tuple[int, ...] = ()
+        self.available_seconds = 0
+        self.corrected_address: Tuple[str, str, str, int] | None = None
+
+    # Builds a package straight from saved field values, without parsing or resolving anything again
+    @classmethod
+    def from_fields(cls, package_id: int, address: str, vertex_id: int, city: str, state: str, zip_code: int,
+                    deadline_seconds: int, weight: int, special_notes: str, status: PackageStatus,
+                    delivery_seconds: int, truck: int, required_truck: int, group_ids: Tuple[int, ...],
+                    available_seconds: int, corrected_address: Tuple[str, str, str, int] | None,
+                    address_ids: Dict[str, int] | None = None) -> "Package":
+        """
+        Builds a package from values saved by a snapshot. The fields are set directly instead of through
+        the property setters, so nothing is looked up or reindexed. The strings should already be interned.
+        Args:
+            package_id (int): Package ID.
+            address (str): Delivery address.
+            vertex_id (int): Vertex id of the address.
+            city (str): Delivery city.
+            state (str): Delivery state.
+            zip_code (int): Delivery zip code.
+            deadline_seconds (int): Deadline in seconds since midnight.
+            weight (int): Package weight.
+            special_notes (str): Special notes as written in the package file.
+            status (PackageStatus): Current status.
+            delivery_seconds (int): Delivery time in seconds since midnight, or 0 if it hasn't been delivered.
+            truck (int): Number of the truck the package is loaded on, or 0 if it isn't loaded.
+            required_truck (int): Truck the package must be on, or 0 for any truck.
+            group_ids (Tuple[int, ...]): Other packages it must be delivered with.
+            available_seconds (int): When it reaches the hub in seconds since midnight, or 0.
+            corrected_address (Tuple[str, str, str, int] | None): Address it must be changed to, or None.
+            address_ids (Dict[str, int] | None): Address to vertex id dict used when the address changes later.
+        Returns:
+            Package: Package that isn't in a repository yet.
+        """
+        package = cls.__new__(cls)
+        package.repository = None
+        package.address_ids = address_ids
+        package.id = package_id
+        package._address = address
+        package.vertex_id = vertex_id
+        package.city = city
+        package.state = state
+        package.zip_code = zip_code
+        package.deadline_seconds = deadline_seconds
+        package.weight = weight
+        package.special_notes = special_notes
+        package._status = status
+        package.delivery_seconds = delivery_seconds
+        package._truck = truck
+        package.required_truck = required_truck
+        package.group_ids = group_ids
+        package.available_seconds = available_seconds
+        package.corrected_address = corrected_address
+        return package
+
+    # The delivery address. Setting it resolves the vertex id again, so an address correction
+    # is routed to the new location.
+    @property
+    def address(self) -> str:
+        """
+        Returns the delivery address.
+        Returns:
+            str: Delivery address.
+        """
+        return self._address
+
+    @address.setter
+    def address(self, address: str) -> None:
+        """
+        Sets the delivery address and recomputes the vertex id.
+        Args:
+            address (str): New delivery address.
+        Raises:
+            ValueError: If the address isn't a vertex in the address to id dict.
+        """
+        vertex_id = -1
+        if self.address_ids is not None:
+            if address not in self.address_ids:
+                raise ValueError("Package " + str(self.id) + " has an unknown address: \"" + address + "\"")
+
+            vertex_id = self.address_ids[address]
+
+        old_address = getattr(self, "_address", None)
+        self._address = sys.intern(address)
+        self.vertex_id = vertex_id
+        if self.repository is not None:
+            self.repository.reindex(self, "address", old_address)
+
+    # The delivery status. Setting it updates the repository's status index.
+    @property
+    def status(self) -> PackageStatus:
+        """
+        Returns the delivery status.
+        Returns:
+            PackageStatus: Current status.
+        """
+        return self._status
+
+    @status.setter
+    def status(self, status: PackageStatus) -> None:
+        """
+        Sets the delivery status.
+        Args:
+            status (PackageStatus): New status.
+        """
+        old_status = getattr(self, "_status", None)
+        self._status = status
+        if self.repository is not None:
+            self.repository.reindex(self, "status", old_status)
+
+    # The delivery deadline as a datetime, built from the stored seconds when it's asked for
+    @property
+    def deadline(self) -> datetime.datetime:
+        """
+        Returns the delivery deadline.
+        Returns:
+            datetime.datetime: Delivery deadline on BASE_DATE.
+        """
+        return to_datetime(self.deadline_seconds)
+
+    @deadline.setter
+    def deadline(self, deadline: datetime.datetime) -> None:
+        """
+        Sets the delivery deadline. Updates the repository's deadline index.
+        Args:
+            deadline (datetime.datetime): New deadline.
+        """
+        old_deadline = getattr(self, "deadline_seconds", None)
+        self.deadline_seconds = to_seconds(deadline)
+        if self.repository is not None:
+            self.repository.reindex(self, "deadline", old_deadline)
+
+    # The delivery time as a datetime, built from the stored seconds when it's asked for
+    @property
+    def delivery_time(self) -> datetime.datetime:
+        """
+        Returns the delivery time.
+        Returns:
+            datetime.datetime: Delivery time on BASE_DATE. Midnight means it hasn't been delivered.
+        """
+        return to_datetime(self.delivery_seconds)
+
+    @delivery_time.setter
+    def delivery_time(self, delivery_time: datetime.datetime) -> None:
+        """
+        Sets the delivery time, dropping any fraction of a second.
+        Args:
+            delivery_time (datetime.datetime): New delivery time.
+        """
+        self.delivery_seconds = to_seconds(delivery_time)
+
+    # The truck the package is loaded on. Setting it updates the repository's truck index.
+    @property
+    def truck(self) -> int:
+        """
+        Returns the number of the truck the package is loaded on.
+        Returns:
+            int: Truck number, or 0 if it isn't loaded.
+        """
+        return self._truck
+
+    @truck.setter
+    def truck(self, truck: int) -> None:
+        """
+        Sets the truck the package is loaded on.
+        Args:
+            truck (int): Truck number, or 0 if it isn't loaded.
+        """
+        old_truck = getattr(self, "_truck", None)
+        self._truck = truck
+        if self.repository is not None:
+            self.repository.reindex(self, "truck", old_truck)
+
+    # Checks if the package has any constraint on how or when it can be delivered
+    def has_constraints(self) -> bool:
+        """
+        Checks if the package has a required truck, a co-delivery group, a late arrival, or an address correction.
+        Returns:
+            bool: True if any constraint is set.
+        """
+        return (self.required_truck != 0 or len(self.group_ids) > 0 or self.available_seconds != 0
+                or self.corrected_address is not None)
+
+    # Changes the address to the corrected address, if the package has one
+    def apply_address_correction(self) -> None:
+        """
+        Replaces the address, city, state, and zip code with the corrected address.
+        """
+        if self.corrected_address is not None:
+            self.address, self.city, self.state, self.zip_code = self.corrected_address
 
     # Prints the deadline in a hh:mm format
     def print_deadline(self) -> None:
@@ -129,89 +393,226 @@ class Package:
         return string
 
 
+# Parses the special notes of a package into its status and constraint fields.
+def parse_special_notes(package: Package, notes: str) -> None:
+    """
+    Parses the special notes once into the package's status, required truck, co-delivery group,
+    arrival time, and address correction.
+    Args:
+        package (Package): Package to set the fields on.
+        notes (str): Special notes from the package file.
+    Raises:
+        ValueError: If a delayed package's arrival time or a required truck or package id isn't a number.
+    """
+    # Hard coded for wrong address. The correct address arrives at 10:20 am.
+    if "Wrong" in notes:
+        package.status = PackageStatus.UPDATING_ADDRESS
+        package.available_seconds = ADDRESS_CORRECTION_TIME
+        package.corrected_address = CORRECTED_ADDRESS
+
+    # If a package is delayed, the time it'll arrive starts at the first digit in the notes
+    elif "Delayed" in notes:
+        package.status = PackageStatus.DELAYED
+        for index in range(len(notes)):
+            if notes[index].isdigit():
+                package.available_seconds = parse_seconds(notes[index:])
+                break
+
+    # If the package needs to be in a certain truck, the truck number is at the end of the notes
+    elif "truck" in notes:
+        package.status = PackageStatus.AT_HUB
+        package.required_truck = int(notes.split()[-1])
+
+    # If the package must be with other packages, the package ids are listed at the end
+    # of the notes, separated by commas
+    elif "Must be" in notes:
+        package.status = PackageStatus.AT_HUB
+        for index in range(len(notes)):
+            if notes[index].isdigit():
+                package.group_ids = tuple(int(package_id) for package_id in notes[index:].split(","))
+                break
+
+    # Otherwise, the package doesn't have any constraints
+    else:
+        package.status = PackageStatus.AT_HUB
+
+
+# Parses a deadline from the package file into seconds since midnight
+def parse_deadline(text: str) -> int:
+    """
+    Parses a delivery deadline. "EOD" means the end of the day. Each distinct deadline string is only
+    parsed once.
+    Args:
+        text (str): Deadline as written in the package file.
+    Returns:
+        int: Deadline in seconds since midnight.
+    Raises:
+        ValueError: If the text isn't "EOD" or a valid time.
+    """
+    return parse_seconds(text)
+
+
+# A row of the package file that couldn't be turned into a package
+class RejectedRow:
+    """
+    Holds a rejected row, where it was in the file, and why it was rejected.
+    """
+    __slots__ = ("line_number", "row", "reason")
+
+    def __init__(self, line_number: int, row: List[str], reason: str):
+        """
+        Initializes a RejectedRow.
+        Args:
+            line_number (int): Row number in the file, counting the header as row 1.
+            row (List[str]): Fields of the row.
+            reason (str): Why the row was rejected.
+        """
+        self.line_number = line_number
+        self.row = row
+        self.reason = reason
+
+    # Gives a one line description of the rejected row
+    def __str__(self) -> str:
+        """
+        Returns the row number, reason, and fields.
+        Returns:
+            str: Description of the rejected row.
+        """
+        return "Row " + str(self.line_number) + ": " + self.reason + ": " + ",".join(self.row)
+
+
+# Turns one row of the package file into a package
+def parse_package_row(row: List[str], address_ids: Dict[str, int] | None = None) -> Package:
+    """
+    Parses and validates one row of the package file.
+    Args:
+        row (List[str]): Package ID, address, city, state, zip, deadline, weight, and special notes.
+                         The special notes may be left off.
+        address_ids (Dict[str, int] | None): Address to vertex id dict used to resolve the vertex id.
+    Returns:
+        Package: Parsed package with its special notes applied.
+    Raises:
+        ValueError: If the row has the wrong number of fields, a number or time that doesn't parse,
+                    or an address that isn't in address_ids.
+    """
+    if len(row) not in (7, 8):
+        raise ValueError("expected 8 fields but found " + str(len(row)))
+
+    notes = row[7] if len(row) == 8 else ""
+    if address_ids is not None and row[1] not in address_ids:
+        raise ValueError("address \"" + row[1] + "\" isn't in the distance table")
+
+    package = Package(int(row[0]), row[1], row[2], row[3], int(row[4]), BASE_DATE, int(row[6]), notes,
+                      address_ids=address_ids)
+    package.deadline_seconds = parse_deadline(row[5].strip())
+
+    # Parse the special notes once into the status and constraint fields
+    parse_special_notes(package, notes)
+    return package
+
+
+# Streams packages out of rows of the package file, a chunk at a time
+def iter_packages(rows: Iterable[List[str]], address_ids: Dict[str, int] | None = None,
+                  rejects: Callable[[RejectedRow], None] | None = None, chunk_size: int = 1024,
+                  first_line: int = 2) -> Iterator[Package]:
+    """
+    Parses rows into packages chunk_size rows at a time and yields them as each chunk is done, so the
+    caller can start loading and routing before the rest of the file has been read. Rows that don't
+    parse, and rows that repeat an id already seen, go to rejects instead of stopping the stream.
+    Blank rows are skipped.
+    Args:
+        rows (Iterable[List[str]]): Rows of fields, without the header.
+        address_ids (Dict[str, int] | None): Address to vertex id dict used to resolve the vertex ids.
+        rejects (Callable[[RejectedRow], None] | None): Called with every rejected row. None drops them.
+        chunk_size (int): Number of rows parsed per chunk.
+        first_line (int): Row number of the first row, for the rejected rows.
+    Returns:
+        Iterator[Package]: Packages in file order.
+    """
+    rows = iter(rows)
+    seen_ids = set()
+    line_number = first_line
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        packages: List[Package] = []
+        for row in chunk:
+            if row:
+                try:
+                    package = parse_package_row(row, address_ids)
+                    if package.id in seen_ids:
+                        raise ValueError("package id " + str(package.id) + " was already read")
+
+                    seen_ids.add(package.id)
+                    packages.append(package)
+
+                except ValueError as error:
+                    if rejects is not None:
+                        rejects(RejectedRow(line_number, row, str(error)))
+
+            line_number += 1
+
+        yield from packages
+
+
+# Streams packages out of a package file
+def stream_packages(package_file: str, address_ids: Dict[str, int] | None = None,
+                    rejects: Callable[[RejectedRow], None] | None = None,
+                    chunk_size: int = 1024) -> Iterator[Package]:
+    """
+    Reads a package file lazily with iter_packages. The file stays open until the iterator is
+    used up or closed.
+    Args:
+        package_file (str): Path to the package CSV file.
+        address_ids (Dict[str, int] | None): Address to vertex id dict used to resolve the vertex ids.
+        rejects (Callable[[RejectedRow], None] | None): Called with every rejected row. None drops them.
+        chunk_size (int): Number of rows parsed per chunk.
+    Returns:
+        Iterator[Package]: Packages in file order.
+    """
+    with open(package_file, mode='r', newline='', encoding="utf-8-sig") as file:
+        csv_file = csv.reader(file)
+
+        # Skip the header
+        next(csv_file, None)
+        yield from iter_packages(csv_file, address_ids, rejects, chunk_size)
+
+
 # Reads packages in from a CSV file and returns a hash table containing
 # all packages.
-def read_packages(package_file: str) -> HashTable:
+@Instrument.timed("read_packages")
+def read_packages(package_file: str, address_ids: Dict[str, int] | None = None,
+                  rejects: Callable[[RejectedRow], None] | None = None) -> PackageRepository:
     """
     Reads packages from a CSV file and returns a hash table containing all packages.
+    If address_ids is given, each package's vertex id is resolved once while loading.
     Args:
         package_file (str): Path to the package CSV file.
+        address_ids (Dict[str, int] | None): Address to vertex id dict from Graph.read_distances_to_graph.
+        rejects (Callable[[RejectedRow], None] | None): Called with every row that can't be loaded, which are
+                                                         then skipped. None raises instead.
     Returns:
-        HashTable: Hash table of packages.
+        PackageRepository: Hash table of packages, indexed by status, address, truck, and deadline.
+    Raises:
+        ValueError: If rejects is None and any row can't be loaded, such as an address that isn't in address_ids.
+                    Every bad row is listed, not just the first.
     """
-    hash_table = HashTable()
-    with open(package_file, mode='r') as file:
-        csv_file = csv.reader(file)
-        skip = True
-
-        # Read every line in the file, skipping the first line
-        for line in csv_file:
-            if not skip:
-
-                # The time format is in hh:mm [am|pm].
-                # If time read is EOD change it to 5:00 pm
-                time_format = "%I:%M %p"
-                time_string = line[5]
-                if time_string == "EOD":
-                    time_string = "5:00 PM"
-
-                # Create a new package
-                deadline = datetime.datetime.strptime(time_string, time_format)
-                p = Package(int(line[0]), line[1], line[2], line[3], int(line[4]), deadline, int(line[6]), line[7])
-
-                # in this section, I use unique words in the special notes to standardize the special notes
-                # and status
-
-                # Hard coded for wrong address
-                if "Wrong" in line[7]:
-                    p.status = "Updating Address"
-                    p.special_notes = "Arriving 10:20 am"
-
-                # If a package is delayed, we combined Arriving with the end of the line which
-                # has the time it'll arrive.
-                elif "Delayed" in line[7]:
-                    p.status = "Delayed"
-                    string = "Arriving "
-                    index = 0
-                    for char in line[7]:
-                        if char.isdigit():
-                            string += line[7][index:]
-                            break
-                        index += 1
-
-                    p.special_notes = string
-
-                # If the package needs to be in a certain truck, we combine the word truck with
-                # the number located at the end of the truck
-                elif "truck" in line[7]:
-                    p.status = "At the Hub"
-                    p.special_notes = "Truck "
-                    p.special_notes += line[7][len(line[7]) - 1]
-
-                # If the package must be with other packages, we combine package with
-                # the packages listed at the end of the line. We replace commas with
-                # spaces to make parsing easier
-                elif "Must be" in line[7]:
-                    p.status = "At the Hub"
-                    string = "Package "
-                    index = 0
-                    for char in line[7]:
-                        if char.isdigit():
-                            string += line[7][index:]
-                            string = string.replace(",", "")
-                            break
-                        index += 1
-
-                    p.special_notes = string
-
-                # Otherwise, the package doesn't have any constraints
-                else:
-                    p.status = "At the Hub"
-
-                hash_table.insert(int(line[0]), p)
+    rejected: List[RejectedRow] = []
+    hash_table = PackageRepository()
+    packages = stream_packages(package_file, address_ids, rejects if rejects is not None else rejected.append,
+                               READ_CHUNK_SIZE)
 
-            else:
-                skip = False
+    # Insert a chunk at a time so the table grows once per chunk instead of once per package
+    while True:
+        chunk = list(itertools.islice(packages, READ_CHUNK_SIZE))
+        if not chunk:
+            break
+        hash_table.insert_many((package.id, package) for package in chunk)
+
+    if rejected:
+        raise ValueError("Packages that couldn't be loaded:\n" + "\n".join(str(row) for row in rejected))
 
     return hash_table
 
@@ -228,9 +629,8 @@ def separate_packages(hash_table: HashTable) -> Tuple[List[Package], List[Packag
     """
     normal_packages = []
     constrained_packages = []
-    for i in range(1, hash_table.num_keys + 1):
-        package = hash_table.lookup(i)
-        if package.status == "At the Hub" and package.special_notes == "":
+    for package in hash_table.values():
+        if package.status == PackageStatus.AT_HUB and not package.has_constraints():
             normal_packages.append(package)
 
         else:
@@ -239,73 +639,183 @@ def separate_packages(hash_table: HashTable) -> Tuple[List[Package], List[Packag
     return normal_packages, constrained_packages
 
 
-# Separate normal and constrained packages into the three trucks
+# Separate normal and constrained packages onto the trucks
+@Instrument.timed("filter_constraints")
 def filter_constrained_packages(normal_packages: List[Package], constrained_packages: List[Package],
-                                hash_table: HashTable, max_packages_per_truck: int) -> Tuple[
-    List[Package], List[Package], List[Package]]:
+                                hash_table: HashTable, max_packages_per_truck: int, num_trucks: int = 3,
+                                max_weight: float = float("inf")) -> List[List[List[Package]]]:
     """
-    Separates normal and constrained packages into three trucks based on constraints.
+    Separates normal and constrained packages onto trucks based on constraints. Packages that must
+    be on a certain truck are queued for that truck's runs, starting a new run whenever the last one
+    is full. Each co-delivery group, together with every group it shares a package with, is queued
+    whole on one run: of the truck one of its packages must be on, or else of the truck with the
+    fewest queued packages.
     Args:
         normal_packages (list[Package]): List of normal packages.
         constrained_packages (list[Package]): List of constrained packages.
         hash_table (HashTable): Hash table of packages.
         max_packages_per_truck (int): Maximum packages per truck.
+        num_trucks (int): Number of trucks in the fleet.
+        max_weight (float): Maximum total weight of the packages on a truck.
     Returns:
-        tuple[list[Package], list[Package], list[Package]]: (truck_1, truck_2, truck_3)
+        list[list[list[Package]]]: Packages queued for each run of each truck, truck 1 first.
+    Raises:
+        ValueError: If a package must be on a truck the fleet doesn't have, a package or co-delivery
+                    group is too big or too heavy for one truck, or a co-delivery group has packages
+                    that must be on different trucks or that aren't at the hub at the start of the day.
     """
-    # Create three empty trucks
-    truck_1: list[Package] = []
-    truck_2: list[Package] = []
-    truck_3: list[Package] = []
-
-    # Loops through each constrained package from a copied list, so we
-    # can remove the package after we sort it
-    for package in list(constrained_packages):
+    # Create the empty trucks, each with its queue of runs
+    trucks: list[list[list[Package]]] = [[] for _ in range(num_trucks)]
+    queued = [0] * num_trucks
+    run_weights = [0.0] * num_trucks
+
+    # Ids still in the normal packages list and ids placed on a truck. Both lists are rebuilt once at the
+    # end instead of removing each placed package as we go.
+    normal_ids = {package.id for package in normal_packages}
+    placed_ids = set()
+
+    # Queues packages on the truck's last run if they fit, or on a new run
+    def place(number: int, packages: List[Package]) -> None:
+        """
+        Queues packages together on one run of a truck.
+        Args:
+            number (int): Truck number.
+            packages (List[Package]): Packages that go on the same run.
+        Raises:
+            ValueError: If the packages are too many or too heavy for one truck.
+        """
+        weight = sum(package.weight for package in packages)
+        if len(packages) > max_packages_per_truck or weight > max_weight:
+            raise ValueError("Packages " + ", ".join(str(package.id) for package in packages)
+                             + " don't fit on one truck together")
+
+        runs = trucks[number - 1]
+        if (runs and len(runs[-1]) + len(packages) <= max_packages_per_truck
+                and run_weights[number - 1] + weight <= max_weight):
+            runs[-1].extend(packages)
+            run_weights[number - 1] += weight
+        else:
+            runs.append(list(packages))
+            run_weights[number - 1] = weight
 
-        # Checks to see if the package needs to be in a certain truck.
-        if "Truck" in package.special_notes:
-            if package.special_notes[len(package.special_notes) - 1] == "1" and len(truck_1) < max_packages_per_truck:
-                truck_1.append(package)
-                constrained_packages.remove(package)
+        queued[number - 1] += len(packages)
+        placed_ids.update(package.id for package in packages)
 
-            elif package.special_notes[len(package.special_notes) - 1] == "2" and len(truck_2) < max_packages_per_truck:
-                truck_2.append(package)
-                constrained_packages.remove(package)
+    # Raises if a package must be on a truck the fleet doesn't have
+    def check_truck(number: int, package: Package) -> None:
+        """
+        Checks that a truck is in the fleet.
+        Args:
+            number (int): Truck number the package goes on.
+            package (Package): Package that goes on it, for the error message.
+        Raises:
+            ValueError: If the fleet has fewer than number trucks.
+        """
+        if number > num_trucks:
+            raise ValueError("Package " + str(package.id) + " can only be on truck " + str(number)
+                             + ", but the fleet only has " + str(num_trucks)
+                             + (" truck" if num_trucks == 1 else " trucks"))
 
-            elif package.special_notes[len(package.special_notes) - 1] == "3" and len(truck_3) < max_packages_per_truck:
-                truck_3.append(package)
-                constrained_packages.remove(package)
+    # Joins co-delivery groups that share a package, keyed by the id every package in them leads to
+    parents: Dict[int, int] = {}
 
-        # Checks if the package needs to be with other packages. If they do, check to see
-        # if the package is in the normal packages list. If it is, remove it and add it to truck 1
-        elif "Package" in package.special_notes:
-            line = package.special_notes[len("Package "):]
-            package_ids = line.split(" ")
-            for package_id in package_ids:
-                temp_package = hash_table.lookup(int(package_id))
-                if package and normal_packages.count(temp_package) >= 1:
-                    normal_packages.remove(temp_package)
-                    truck_1.append(temp_package)
+    # Returns the id a package's co-delivery groups are joined under
+    def find(package_id: int) -> int:
+        """
+        Finds the root of a package id in the joined groups, shortening the path to it on the way.
+        Args:
+            package_id (int): Package id.
+        Returns:
+            int: Id every package in the same joined groups leads to.
+        """
+        while parents.setdefault(package_id, package_id) != package_id:
+            parents[package_id] = parents[parents[package_id]]
+            package_id = parents[package_id]
+        return package_id
+
+    for package in constrained_packages:
+        for other_id in package.group_ids:
+            parents[find(other_id)] = find(package.id)
+
+    groups: Dict[int, List[int]] = {}
+    for package_id in list(parents):
+        groups.setdefault(find(package_id), []).append(package_id)
+
+    # Loops through each constrained package and sorts it onto a truck, earliest deadline first so the
+    # first runs carry the most urgent packages
+    for package in sorted(constrained_packages, key=lambda package_to_sort: package_to_sort.deadline_seconds):
+        if package.id in placed_ids:
+            continue
+
+        # Checks if the package needs to be with other packages. The whole group, and every group that
+        # shares a package with it, is taken out of the normal packages and goes on one truck.
+        if package.id in parents:
+            group = [temp_package for temp_package in hash_table.lookup_many(sorted(groups[find(package.id)]))
+                     if temp_package is not None]
+            ids = ", ".join(str(temp_package.id) for temp_package in group)
+            not_at_hub = [temp_package.id for temp_package in group if temp_package.status != PackageStatus.AT_HUB]
+            if not_at_hub:
+                raise ValueError("Packages " + ids + " must be delivered together, but package "
+                                 + str(not_at_hub[0]) + " isn't at the hub at the start of the day")
+
+            # A package that must be on one truck takes the whole group with it
+            required = {temp_package.required_truck for temp_package in group if temp_package.required_truck}
+            if len(required) > 1:
+                raise ValueError("Packages " + ids + " must be delivered together, but some can only be on truck "
+                                 + " and some only on truck ".join(str(number) for number in sorted(required)))
+            if required:
+                number = required.pop()
+                check_truck(number, next(temp_package for temp_package in group if temp_package.required_truck))
+            else:
+                number = min(range(1, num_trucks + 1), key=lambda truck_number: queued[truck_number - 1])
+            normal_ids.difference_update(temp_package.id for temp_package in group)
+            place(number, group)
 
-            constrained_packages.remove(package)
-            truck_1.append(package)
+        # Checks to see if the package needs to be in a certain truck.
+        elif package.required_truck:
+            check_truck(package.required_truck, package)
+            place(package.required_truck, [package])
 
-    return truck_1, truck_2, truck_3
+    normal_packages[:] = [package for package in normal_packages if package.id in normal_ids]
+    constrained_packages[:] = [package for package in constrained_packages if package.id not in placed_ids]
+    return trucks
 
 
 # Loads packages onto the truck until the truck is full, or we run out of packages.
-def load_truck(truck: List[Package], packages: List[Package], max_packages_per_truck: int) -> List[Package]:
+@Instrument.timed("load_truck")
+def load_truck(truck: List[Package], packages: List[Package], max_packages_per_truck: int,
+               truck_number: int = 0, max_weight: float = float("inf")) -> List[Package]:
     """
-    Loads packages onto a truck until full or out of packages.
+    Loads packages onto a truck until full or out of packages. Packages are taken in order, and
+    any that would put the truck over its weight limit are left for another truck.
     Args:
         truck (list[Package]): Truck to load.
-        packages (list[Package]): Packages to load.
+        packages (list[Package]): Packages to load. Loaded packages are removed from it.
         max_packages_per_truck (int): Maximum packages per truck.
+        truck_number (int): Number of the truck, recorded on each loaded package. 0 leaves it unset.
+        max_weight (float): Maximum total weight of the packages on the truck.
     Returns:
         list[Package]: Loaded truck.
     """
-    while len(truck) < max_packages_per_truck and len(packages) > 0:
-        package_to_load = packages.pop(0)  # Remove and get first package
+    room = max_packages_per_truck - len(truck)
+    weight = sum(package.weight for package in truck)
+
+    # Only the front of the list is looked at, and it's cut off in one slice rather than popping
+    # the first package over and over, which moves the whole list every time.
+    scanned = 0
+    skipped = []
+    while room > 0 and scanned < len(packages) and weight < max_weight:
+        package_to_load = packages[scanned]
+        scanned += 1
+        if weight + package_to_load.weight > max_weight:
+            skipped.append(package_to_load)
+            continue
+
+        if truck_number:
+            package_to_load.truck = truck_number
         truck.append(package_to_load)
+        weight += package_to_load.weight
+        room -= 1
 
+    packages[:scanned] = skipped
     return truck
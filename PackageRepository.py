@@ -0,0 +1,292 @@
+"""
+PackageRepository.py
+Implements a package store on top of the Hash Table that keeps secondary indexes for fast queries.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: PackageRepository.py
+# Purpose: Answers package queries by status, stop, deadline, and truck without scanning every package
+
+# Standard Library
+import bisect
+import datetime
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Created Imports
+from Clock import to_seconds
+from HashTable import HashTable, Node
+
+
+# Hash table of packages keyed on package id that also indexes the packages by status, address,
+# truck, and deadline. Packages tell the repository when one of those fields changes, so the
+# indexes never go stale.
+class PackageRepository(HashTable):
+    """
+    Stores packages by id and keeps secondary indexes on their status, address, truck, and deadline.
+    Every query returns in time proportional to its result.
+    """
+
+    def __init__(self, capacity=16, load_factor=0.5):
+        """
+        Initializes an empty repository.
+        Args:
+            capacity (int): Starting number of slots in the hash table.
+            load_factor (float): Largest fraction of used slots before the table grows.
+        """
+        super().__init__(capacity, load_factor)
+        self.by_status: Dict[int, Set[int]] = {}
+        self.by_address: Dict[str, Set[int]] = {}
+        self.by_truck: Dict[int, Set[int]] = {}
+
+        # (deadline in seconds since midnight, package id) pairs. New pairs are appended, and removed
+        # pairs are only counted as stale, so the list is cleaned up and sorted when it's next read.
+        self._deadlines: List[Tuple[int, int]] = []
+        self._stale_deadlines: Dict[Tuple[int, int], int] = {}
+        self._deadlines_sorted = True
+
+    # The deadline index, cleaned up and sorted if anything changed since it was last read
+    @property
+    def by_deadline(self) -> List[Tuple[int, int]]:
+        """
+        Returns the (deadline, package id) pairs in sorted order, dropping the stale pairs and sorting
+        them first if needed.
+        Returns:
+            List[Tuple[int, int]]: Deadlines in seconds since midnight with their package ids.
+        """
+        if self._stale_deadlines:
+            self._drop_stale_deadlines()
+        if not self._deadlines_sorted:
+            self._deadlines.sort()
+            self._deadlines_sorted = True
+        return self._deadlines
+
+    # Takes the pairs counted as stale out of the deadline index
+    def _drop_stale_deadlines(self) -> None:
+        """
+        Rebuilds the deadline list without its stale pairs, keeping its order.
+        """
+        stale = self._stale_deadlines
+        kept = []
+        for pair in self._deadlines:
+            count = stale.get(pair)
+            if count:
+                stale[pair] = count - 1
+            else:
+                kept.append(pair)
+
+        self._deadlines = kept
+        stale.clear()
+
+    # Adds a (deadline, id) pair to the deadline index without sorting it
+    def _add_deadline(self, deadline: int, package_id: int) -> None:
+        """
+        Adds a package to the deadline index. The index is sorted the next time it's read.
+        Args:
+            deadline (int): Deadline in seconds since midnight.
+            package_id (int): Package id.
+        """
+        self._deadlines.append((deadline, package_id))
+        self._deadlines_sorted = False
+
+    # Adds the package id to the set for value in one of the indexes
+    @staticmethod
+    def _add(index: Dict[any, Set[int]], value: any, package_id: int) -> None:
+        """
+        Adds a package id to an index.
+        Args:
+            index (Dict[any, Set[int]]): Index to add to.
+            value (any): Indexed value.
+            package_id (int): Package id.
+        """
+        if value not in index:
+            index[value] = set()
+
+        index[value].add(package_id)
+
+    # Removes the package id from the set for value in one of the indexes
+    @staticmethod
+    def _discard(index: Dict[any, Set[int]], value: any, package_id: int) -> None:
+        """
+        Removes a package id from an index, dropping the value once no packages are left.
+        Args:
+            index (Dict[any, Set[int]]): Index to remove from.
+            value (any): Indexed value.
+            package_id (int): Package id.
+        """
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(package_id)
+            if not ids:
+                del index[value]
+
+    # Marks a (deadline, id) pair in the deadline index as stale
+    def _discard_deadline(self, deadline: int, package_id: int) -> None:
+        """
+        Removes a package from the deadline index in O(1). The pair stays in the list until the index
+        is next read, or until half the list is stale, so the list never grows without bound.
+        Args:
+            deadline (int): Deadline in seconds since midnight the package was indexed under.
+            package_id (int): Package id.
+        """
+        pair = (deadline, package_id)
+        self._stale_deadlines[pair] = self._stale_deadlines.get(pair, 0) + 1
+        if len(self._stale_deadlines) * 2 > len(self._deadlines):
+            self._drop_stale_deadlines()
+
+    # Inserts a package, replacing any package with the same id, and indexes it
+    def insert(self, key: int, value: any) -> None:
+        """
+        Inserts a package under its id and adds it to every index.
+        Args:
+            key (int): Package id.
+            value (Package): Package to store.
+        """
+        if key in self:
+            self.remove(key)
+
+        super().insert(key, value)
+        value.repository = self
+        self._add(self.by_status, value.status, key)
+        self._add(self.by_address, value.address, key)
+        self._add(self.by_truck, value.truck, key)
+        self._add_deadline(value.deadline_seconds, key)
+
+    # Inserts many packages at once, growing the table once instead of as it fills
+    def insert_many(self, pairs: Iterable[Tuple[int, any]]) -> None:
+        """
+        Inserts packages under their ids and indexes them. Any package already stored under one of
+        the ids is replaced.
+        Args:
+            pairs (Iterable[Tuple[int, Package]]): Package ids and packages to store.
+        """
+        # A dict keeps only the last package for an id that's given twice
+        pairs = list(dict(pairs).items())
+        needed = self.num_keys + len(pairs)
+        if needed > self.capacity * self.load_factor:
+            self._resize(int(needed / self.load_factor) + 1)
+
+        for key, value in pairs:
+            if key in self:
+                self.remove(key)
+
+            HashTable.insert(self, key, value)
+            value.repository = self
+            self._add(self.by_status, value.status, key)
+            self._add(self.by_address, value.address, key)
+            self._add(self.by_truck, value.truck, key)
+            self._add_deadline(value.deadline_seconds, key)
+
+    # Removes a package and takes it out of every index
+    def remove(self, key: int) -> Node | None:
+        """
+        Removes a package and takes it out of every index.
+        Args:
+            key (int): Package id.
+        Returns:
+            Node | None: Node holding the removed id and package, or None if not found.
+        """
+        removed = super().remove(key)
+        if removed is None:
+            return None
+
+        package = removed.value
+        self._discard(self.by_status, package.status, key)
+        self._discard(self.by_address, package.address, key)
+        self._discard(self.by_truck, package.truck, key)
+        self._discard_deadline(package.deadline_seconds, key)
+        package.repository = None
+        return removed
+
+    # Called by a package after one of its indexed fields changes
+    def reindex(self, package: any, field: str, old_value: any) -> None:
+        """
+        Moves a package within one index after the field changed.
+        Args:
+            package (Package): Package that changed.
+            field (str): "status", "address", "truck", or "deadline".
+            old_value (any): Value of the field before the change. For "deadline", it's in seconds since midnight.
+        """
+        package_id = package.id
+        if field == "deadline":
+            self._discard_deadline(old_value, package_id)
+            self._add_deadline(package.deadline_seconds, package_id)
+            return
+
+        index = {"status": self.by_status, "address": self.by_address, "truck": self.by_truck}[field]
+        self._discard(index, old_value, package_id)
+        self._add(index, getattr(package, field), package_id)
+
+    # Returns the packages for a set of ids, in id order
+    def _packages(self, ids: Set[int] | None) -> List[any]:
+        """
+        Returns the packages for a set of ids.
+        Args:
+            ids (Set[int] | None): Package ids.
+        Returns:
+            List[Package]: Packages sorted by id.
+        """
+        if not ids:
+            return []
+
+        return self.lookup_many(sorted(ids))
+
+    # Returns every package with the given status
+    def with_status(self, status: int) -> List[any]:
+        """
+        Returns every package with the given status.
+        Args:
+            status (int): PackageStatus to match, such as PackageStatus.DELIVERED.
+        Returns:
+            List[Package]: Matching packages sorted by id.
+        """
+        return self._packages(self.by_status.get(status))
+
+    # Returns how many packages have the given status
+    def count_status(self, status: int) -> int:
+        """
+        Returns how many packages have the given status.
+        Args:
+            status (int): PackageStatus to count.
+        Returns:
+            int: Number of packages.
+        """
+        return len(self.by_status.get(status, ()))
+
+    # Returns every package going to the given address
+    def at_address(self, address: str) -> List[any]:
+        """
+        Returns every package going to the given address.
+        Args:
+            address (str): Delivery address.
+        Returns:
+            List[Package]: Matching packages sorted by id.
+        """
+        return self._packages(self.by_address.get(address))
+
+    # Returns every package loaded on the given truck
+    def on_truck(self, truck: int) -> List[any]:
+        """
+        Returns every package loaded on the given truck.
+        Args:
+            truck (int): Truck number. 0 returns the packages that aren't loaded.
+        Returns:
+            List[Package]: Matching packages sorted by id.
+        """
+        return self._packages(self.by_truck.get(truck))
+
+    # Returns the n packages with the earliest deadlines at or after a time
+    def next_deadlines(self, n: int, after: datetime.datetime | None = None) -> List[any]:
+        """
+        Returns the n packages with the earliest deadlines.
+        Args:
+            n (int): Number of packages to return.
+            after (datetime.datetime | None): Only deadlines at or after this time are returned.
+        Returns:
+            List[Package]: Packages in deadline order, ties broken by id.
+        """
+        start = 0
+        if after is not None:
+            start = bisect.bisect_left(self.by_deadline, (to_seconds(after), -float("inf")))
+
+        return self.lookup_many(package_id for _, package_id in self.by_deadline[start:start + n])
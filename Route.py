@@ -0,0 +1,424 @@
+"""
+Route.py
+Builds truck tours with nearest-neighbor or deadline-aware insertion and improves them with 2-opt and
+Or-opt local search.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Route.py
+# Purpose: Builds a visit order for a truck and shortens it without breaking deadlines
+
+# Standard Library
+import random
+import time
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Created Imports
+from Graph import Graph
+
+# Smallest change in miles that counts as an improvement, so rounding noise can't loop forever
+EPSILON = 1e-9
+
+
+# Builds a tour that starts at the start vertex and always moves to the closest unvisited stop
+def nearest_neighbor_tour(graph: Graph, start: int, stops: Sequence[int]) -> List[int]:
+    """
+    Builds a visit order with the nearest-neighbor heuristic.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from.
+        stops (Sequence[int]): Vertices to visit. Duplicates are visited once.
+    Returns:
+        List[int]: Stops in visit order, without the start vertex.
+    """
+    remaining = list(dict.fromkeys(stop for stop in stops if stop != start))
+    tour: List[int] = []
+    current = start
+    while remaining:
+        current, _ = graph.find_nearest(current, remaining)
+
+        # Whatever is left can't be reached from here, so keep it in its given order
+        if current == -1:
+            tour.extend(remaining)
+            break
+
+        remaining.remove(current)
+        tour.append(current)
+
+    return tour
+
+
+# Builds a nearest-neighbor tour that picks randomly between the few closest stops at every step
+def randomized_tour(graph: Graph, start: int, stops: Sequence[int], rng: random.Random,
+                    choices: int = 3) -> List[int]:
+    """
+    Builds a visit order with a randomized nearest-neighbor heuristic. Gives local search a
+    different starting point for every seed.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from.
+        stops (Sequence[int]): Vertices to visit. Duplicates are visited once.
+        rng (random.Random): Random number generator to pick with.
+        choices (int): Number of the closest stops to pick between.
+    Returns:
+        List[int]: Stops in visit order, without the start vertex.
+    """
+    remaining = list(dict.fromkeys(stop for stop in stops if stop != start))
+    tour: List[int] = []
+    current = start
+    while remaining:
+        row = graph.get_row(current)
+        reachable = [stop for stop in remaining if row[stop] >= 0]
+
+        # Whatever is left can't be reached from here, so keep it in its given order
+        if not reachable:
+            tour.extend(remaining)
+            break
+
+        reachable.sort(key=row.__getitem__)
+        current = rng.choice(reachable[:choices])
+        remaining.remove(current)
+        tour.append(current)
+
+    return tour
+
+
+# Builds a tour by cheapest insertion, skipping any insertion that would make a stop miss its deadline
+def insertion_tour(graph: Graph, start: int, stops: Sequence[int], deadlines: Dict[int, float] | None = None,
+                   speed: float = 18) -> Tuple[List[int], List[int]]:
+    """
+    Builds a visit order by cheapest feasible insertion. Stops with deadlines are inserted first,
+    then the rest. Each step adds the stop and position that add the fewest miles without making
+    any stop late.
+    The route keeps two arrays: the arrival time at each position, and the latest time the truck
+    may reach each position without a later stop missing its deadline. With them, every candidate
+    insertion is checked in O(1), and only the arrays are rebuilt after an insertion.
+    Stops that can't be inserted anywhere on time go where they add the least lateness.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from and returns to.
+        stops (Sequence[int]): Vertices to visit. Duplicates are visited once.
+        deadlines (Dict[int, float] | None): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+    Returns:
+        Tuple[List[int], List[int]]: Stops in visit order without the start vertex, and the stops
+                                     that miss their deadlines on it.
+    """
+    deadlines = deadlines or {}
+    weight = graph.get_edge
+    minutes_per_mile = 60 / speed
+    infinity = float("inf")
+
+    # The route is closed with the start vertex on both ends
+    route = [start, start]
+    arrival: List[float] = []
+    latest: List[float] = []
+
+    # Rebuilds both arrays in O(n) after the route changes
+    def rebuild() -> None:
+        arrival[:] = [0.0] * len(route)
+        for index in range(1, len(route)):
+            arrival[index] = arrival[index - 1] + weight(route[index - 1], route[index]) * minutes_per_mile
+
+        latest[:] = [infinity] * len(route)
+        for index in range(len(route) - 2, -1, -1):
+            latest[index] = min(deadlines.get(route[index], infinity),
+                                latest[index + 1] - weight(route[index], route[index + 1]) * minutes_per_mile)
+
+    rebuild()
+    remaining = list(dict.fromkeys(stop for stop in stops if stop != start))
+    phases = [[stop for stop in remaining if stop in deadlines], [stop for stop in remaining if stop not in deadlines]]
+    forced: List[int] = []
+
+    for phase in phases:
+        while phase:
+            best = None
+            for stop in phase:
+                deadline = deadlines.get(stop, infinity) + EPSILON
+                for index in range(len(route) - 1):
+                    before, after = route[index], route[index + 1]
+                    reach = arrival[index] + weight(before, stop) * minutes_per_mile
+                    if reach > deadline or reach + weight(stop, after) * minutes_per_mile > latest[index + 1] + EPSILON:
+                        continue
+
+                    added = weight(before, stop) + weight(stop, after) - weight(before, after)
+                    if best is None or added < best[0] - EPSILON:
+                        best = (added, stop, index + 1)
+
+            # None of the stops left fit on time, so they're placed after everything else
+            if best is None:
+                forced.extend(phase)
+                break
+
+            _, stop, index = best
+            route.insert(index, stop)
+            phase.remove(stop)
+            rebuild()
+
+    # Late stops go where they add the least lateness, then the fewest miles
+    for stop in forced:
+        best_index = min(range(1, len(route)), key=lambda index: (
+            tour_lateness(graph, start, route[1:index] + [stop] + route[index:-1], deadlines, speed),
+            weight(route[index - 1], stop) + weight(stop, route[index]) - weight(route[index - 1], route[index])))
+        route.insert(best_index, stop)
+
+    tour = route[1:-1]
+    return tour, list(late_stops(graph, start, tour, deadlines, speed))
+
+
+# Returns the total miles of a tour that leaves the start vertex and comes back to it
+def tour_distance(graph: Graph, start: int, tour: Sequence[int]) -> float:
+    """
+    Returns the length of a closed tour from the start vertex and back.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from and returns to.
+        tour (Sequence[int]): Stops in visit order.
+    Returns:
+        float: Total distance of the tour.
+    """
+    distance = 0.0
+    previous = start
+    for stop in tour:
+        distance += graph.get_edge(previous, stop)
+        previous = stop
+
+    return distance + graph.get_edge(previous, start)
+
+
+# Returns how many minutes past their deadlines the stops of a tour are, added together
+def tour_lateness(graph: Graph, start: int, tour: Sequence[int], deadlines: Dict[int, float], speed: float) -> float:
+    """
+    Returns the total minutes the stops of a tour are late by.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from.
+        tour (Sequence[int]): Stops in visit order.
+        deadlines (Dict[int, float]): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+    Returns:
+        float: Total lateness in minutes. 0.0 means every deadline is met.
+    """
+    if not deadlines:
+        return 0.0
+
+    lateness = 0.0
+    miles = 0.0
+    previous = start
+    for stop in tour:
+        miles += graph.get_edge(previous, stop)
+        previous = stop
+        deadline = deadlines.get(stop)
+        if deadline is not None:
+            arrival = miles / speed * 60
+            if arrival > deadline:
+                lateness += arrival - deadline
+
+    return lateness
+
+
+# Returns the stops of a tour that are reached after their deadlines
+def late_stops(graph: Graph, start: int, tour: Sequence[int], deadlines: Dict[int, float],
+               speed: float) -> Dict[int, float]:
+    """
+    Returns the stops of a tour that miss their deadlines and when the truck reaches them.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from.
+        tour (Sequence[int]): Stops in visit order.
+        deadlines (Dict[int, float]): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+    Returns:
+        Dict[int, float]: Minutes after departure the truck reaches each late stop, in visit order.
+    """
+    late: Dict[int, float] = {}
+    miles = 0.0
+    previous = start
+    for stop in tour:
+        miles += graph.get_edge(previous, stop)
+        previous = stop
+        deadline = deadlines.get(stop)
+        if deadline is not None and miles / speed * 60 > deadline + EPSILON:
+            late[stop] = miles / speed * 60
+
+    return late
+
+
+# Builds the k closest other stops for every stop in the tour
+def build_neighbor_lists(graph: Graph, stops: Sequence[int], neighbor_count: int) -> Dict[int, List[int]]:
+    """
+    Builds the candidate neighbor lists used to prune local search moves.
+    Args:
+        graph (Graph): Graph holding the distances.
+        stops (Sequence[int]): Vertices in the tour.
+        neighbor_count (int): Number of neighbors to keep for each stop.
+    Returns:
+        Dict[int, List[int]]: The closest stops for each stop, closest first.
+    """
+    neighbors: Dict[int, List[int]] = {}
+    for stop in stops:
+        row = graph.get_row(stop)
+        others = [other for other in stops if other != stop and row[other] >= 0]
+        others.sort(key=row.__getitem__)
+        neighbors[stop] = others[:neighbor_count]
+
+    return neighbors
+
+
+# Improves a tour with 2-opt and Or-opt moves until nothing improves or the move budget runs out
+def improve_tour(graph: Graph, start: int, tour: Sequence[int], deadlines: Dict[int, float] | None = None,
+                 speed: float = 18, max_moves: int = 1000, neighbor_count: int = 8,
+                 time_limit: float | None = None) -> List[int]:
+    """
+    Shortens a tour with 2-opt segment reversals and Or-opt segment moves.
+    Each move is scored in O(1) from the distances around its endpoints and only tried between
+    stops that are in each other's neighbor lists. A shorter tour is only kept if it doesn't add
+    any lateness, so a tour that meets its deadlines keeps meeting them. The search is bounded by
+    the number of moves it makes, so the same tour always comes out the same.
+    Args:
+        graph (Graph): Graph holding the distances. It must be symmetric.
+        start (int): Vertex the truck starts from and returns to.
+        tour (Sequence[int]): Starting visit order, usually from nearest_neighbor_tour.
+        deadlines (Dict[int, float] | None): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+        max_moves (int): Most moves to make before returning the best tour so far.
+        neighbor_count (int): Number of neighbors to try moves against for each stop.
+        time_limit (float | None): Seconds after which the search stops even if moves are left. It's only
+                                   a safety cap, since stopping on time makes the result depend on the
+                                   machine. None never stops on time.
+    Returns:
+        List[int]: The improved visit order.
+    """
+    # The tour is closed with the start vertex on both ends, so every move has a fixed predecessor
+    # and successor to score against.
+    route = [start] + list(tour) + [start]
+    if len(route) < 4:
+        return list(tour)
+
+    deadlines = deadlines or {}
+    end_time = time.perf_counter() + time_limit if time_limit is not None else float("inf")
+    neighbors = build_neighbor_lists(graph, route[1:-1], neighbor_count)
+    lateness = tour_lateness(graph, start, route[1:-1], deadlines, speed)
+
+    # Takes the first improving move that keeps the deadlines, until none are left
+    for _ in range(max_moves):
+        if time.perf_counter() >= end_time:
+            break
+
+        position = {stop: index for index, stop in enumerate(route[1:-1], 1)}
+        next_route = None
+        for stop in route[1:-1]:
+            for candidate in _two_opt_moves(graph, route, position, stop, neighbors[stop]):
+                if _accept(graph, start, candidate, deadlines, speed, lateness):
+                    next_route = candidate
+                    break
+
+            if next_route is None:
+                for candidate in _or_opt_moves(graph, route, position, stop, neighbors[stop]):
+                    if _accept(graph, start, candidate, deadlines, speed, lateness):
+                        next_route = candidate
+                        break
+
+            if next_route is not None:
+                break
+
+        if next_route is None:
+            break
+
+        route = next_route
+        lateness = tour_lateness(graph, start, route[1:-1], deadlines, speed)
+
+    return route[1:-1]
+
+
+# Yields every shorter route made by a 2-opt move between a stop and one of its neighbors
+def _two_opt_moves(graph: Graph, route: List[int], position: Dict[int, int], stop: int,
+                   neighbors: List[int]) -> Iterator[List[int]]:
+    """
+    Yields the routes made by reversing the segment between a stop and each of its neighbors,
+    for the reversals that make the route shorter.
+    Args:
+        graph (Graph): Graph holding the distances.
+        route (List[int]): Closed route with the start vertex on both ends.
+        position (Dict[int, int]): Index of each stop in the route.
+        stop (int): Stop to move from.
+        neighbors (List[int]): Closest stops to the stop.
+    Returns:
+        Iterator[List[int]]: Shorter candidate routes.
+    """
+    weight = graph.get_edge
+    for neighbor in neighbors:
+        first, last = sorted((position[stop], position[neighbor]))
+
+        # Reversing route[first..last] only swaps the two edges at the ends of the segment
+        delta = (weight(route[first - 1], route[last]) + weight(route[first], route[last + 1])
+                 - weight(route[first - 1], route[first]) - weight(route[last], route[last + 1]))
+        if delta < -EPSILON:
+            yield route[:first] + route[first:last + 1][::-1] + route[last + 1:]
+
+
+# Yields every shorter route made by moving a short segment that starts at a stop next to one of its neighbors
+def _or_opt_moves(graph: Graph, route: List[int], position: Dict[int, int], stop: int,
+                  neighbors: List[int]) -> Iterator[List[int]]:
+    """
+    Yields the routes made by moving a segment of one to three stops, starting at the stop,
+    next to one of its neighbors in either direction, for the moves that make the route shorter.
+    Args:
+        graph (Graph): Graph holding the distances.
+        route (List[int]): Closed route with the start vertex on both ends.
+        position (Dict[int, int]): Index of each stop in the route.
+        stop (int): First stop of the segment to move.
+        neighbors (List[int]): Closest stops to the stop.
+    Returns:
+        Iterator[List[int]]: Shorter candidate routes.
+    """
+    weight = graph.get_edge
+    first = position[stop]
+    for length in range(1, 4):
+        last = first + length - 1
+        if last >= len(route) - 1:
+            break
+
+        # Miles saved by taking the segment out and joining the stops on either side of it
+        before, after = route[first - 1], route[last + 1]
+        removed = weight(before, route[first]) + weight(route[last], after) - weight(before, after)
+        segment = route[first:last + 1]
+
+        for neighbor in neighbors:
+            j = position[neighbor]
+            if first <= j <= last:
+                continue
+
+            # Tries the segment on either side of the neighbor, in both directions
+            for p, q in ((route[j - 1], neighbor), (neighbor, route[j + 1])):
+                if p in segment or q in segment:
+                    continue
+
+                for ordered in (segment, segment[::-1]):
+                    added = weight(p, ordered[0]) + weight(ordered[-1], q) - weight(p, q)
+                    if added - removed < -EPSILON:
+                        remaining = route[:first] + route[last + 1:]
+                        insert_at = 1 if p == route[0] else remaining.index(p) + 1
+                        yield remaining[:insert_at] + ordered + remaining[insert_at:]
+
+
+# Checks that a candidate route doesn't make any deadline later than the current route does
+def _accept(graph: Graph, start: int, route: List[int], deadlines: Dict[int, float], speed: float,
+            lateness: float) -> bool:
+    """
+    Checks that a candidate closed route doesn't add lateness.
+    Args:
+        graph (Graph): Graph holding the distances.
+        start (int): Vertex the truck starts from.
+        route (List[int]): Candidate route with the start vertex on both ends.
+        deadlines (Dict[int, float]): Latest arrival for a vertex in minutes after departure.
+        speed (float): Truck speed in miles per hour.
+        lateness (float): Lateness of the current route in minutes.
+    Returns:
+        bool: True if the candidate is at least as punctual as the current route.
+    """
+    if not deadlines:
+        return True
+
+    return tour_lateness(graph, start, route[1:-1], deadlines, speed) <= lateness + EPSILON
@@ -0,0 +1,117 @@
+"""
+RouteCache.py
+Remembers planned routes so the same truck load leaving at the same time is only planned once.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: RouteCache.py
+# Purpose: Caches each planned route in a bounded least recently used cache
+
+# Standard Library
+from collections import OrderedDict
+from typing import Dict, Hashable, Sequence
+
+
+# A planned route and the stops it reaches late
+class CachedRoute:
+    """
+    Holds a route and the stops it reaches after their deadlines, with when it reaches them.
+    """
+    __slots__ = ("route", "late")
+
+    def __init__(self, route: Sequence[int] | None, late: Dict[int, float]):
+        """
+        Initializes a CachedRoute.
+        Args:
+            route (Sequence[int] | None): Planned visit order, or None if the truck picks the closest stop each time.
+            late (Dict[int, float]): Minutes after departure the truck reaches each stop it reaches after
+                                     the stop's deadline.
+        """
+        self.route = tuple(route) if route is not None else None
+        self.late = late
+
+
+# Least recently used cache of planned routes
+class RouteCache:
+    """
+    Maps a truck load and its departure to its planned route. Once it holds max_size routes, adding
+    another evicts the one used longest ago. Hits, misses, and evictions are counted.
+    """
+    def __init__(self, max_size: int = 256):
+        """
+        Initializes an empty RouteCache.
+        Args:
+            max_size (int): Most routes kept. 0 keeps none.
+        """
+        self.max_size = max_size
+        self.routes: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # Builds the key for a truck load
+    @staticmethod
+    def make_key(deadlines: Dict[int, float], departure: float, settings: Hashable = ()) -> Hashable:
+        """
+        Builds a cache key. The stops are a frozenset, so the order the packages were loaded in doesn't
+        matter. Each stop's deadline is part of the key because it changes the route.
+        Args:
+            deadlines (Dict[int, float]): Latest arrival for each stop in minutes after departure.
+            departure (float): Time the truck leaves in seconds since midnight.
+            settings (Hashable): Planner settings that change the route, such as the speed.
+        Returns:
+            Hashable: Key for the route.
+        """
+        return frozenset(deadlines.items()), departure, settings
+
+    # Returns the cached route for a key, or None
+    def get(self, key: Hashable) -> CachedRoute | None:
+        """
+        Looks up a route and marks it as the most recently used.
+        Args:
+            key (Hashable): Key from make_key.
+        Returns:
+            CachedRoute | None: Cached route, or None on a miss.
+        """
+        cached = self.routes.get(key)
+        if cached is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.routes.move_to_end(key)
+        return cached
+
+    # Adds a route, evicting the least recently used one if the cache is full
+    def put(self, key: Hashable, cached: CachedRoute) -> None:
+        """
+        Stores a route.
+        Args:
+            key (Hashable): Key from make_key.
+            cached (CachedRoute): Route to store.
+        """
+        if self.max_size <= 0:
+            return
+
+        self.routes[key] = cached
+        self.routes.move_to_end(key)
+        while len(self.routes) > self.max_size:
+            self.routes.popitem(last=False)
+            self.evictions += 1
+
+    # Empties the cache
+    def clear(self) -> None:
+        """
+        Removes every route. The statistics are kept.
+        """
+        self.routes.clear()
+
+    # Gives the number of cached routes
+    def __len__(self) -> int:
+        """
+        Returns the number of cached routes.
+        Returns:
+            int: Number of routes.
+        """
+        return len(self.routes)
@@ -0,0 +1,301 @@
+"""
+Scenario.py
+Runs many what-if versions of the delivery day at once and summarizes each one.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Scenario.py
+# Purpose: Sweeps start times, fleet sizes, speeds, and truck limits over a pool of worker processes
+
+# Standard Library
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+# Created Imports
+import Clock
+import Package
+from Context import RoutingContext
+from PackageRepository import PackageRepository
+
+# Scenarios run until every truck is done or the clock day ends, whichever is first
+_FINISH_TIME = Clock.to_datetime(24 * 3600 - 1)
+
+# Columns of the summary, in order
+SUMMARY_FIELDS = ("name", "start", "trucks", "drivers", "speed", "capacity", "max_weight", "miles", "delivered",
+                  "undelivered", "late", "lateness_minutes", "completion")
+
+# The context and package rows each worker process runs its scenarios against
+_worker_context: RoutingContext | None = None
+_worker_rows: Tuple[Tuple[str, ...], ...] = ()
+
+
+# One version of the day to simulate
+class Scenario:
+    """
+    Holds the start time and fleet settings of one what-if scenario.
+    """
+    __slots__ = ("name", "start_minutes", "num_trucks", "num_drivers", "speed", "max_packages", "max_weight")
+
+    def __init__(self, name: str, start_minutes: int, num_trucks: int, num_drivers: int, speed: float,
+                 max_packages: int, max_weight: float = float("inf")):
+        """
+        Initializes a Scenario.
+        Args:
+            name (str): Name shown in the summary.
+            start_minutes (int): Time the trucks can first leave the hub, in minutes since midnight.
+            num_trucks (int): Number of trucks.
+            num_drivers (int): Number of drivers.
+            speed (float): Truck speed in miles per hour.
+            max_packages (int): Most packages a truck can carry.
+            max_weight (float): Most total weight a truck can carry, in kg.
+        """
+        self.name = name
+        self.start_minutes = start_minutes
+        self.num_trucks = num_trucks
+        self.num_drivers = num_drivers
+        self.speed = speed
+        self.max_packages = max_packages
+        self.max_weight = max_weight
+
+
+# Builds a scenario from one row of a scenario file, filling in the context's settings for blank fields
+def parse_scenario(fields: Dict[str, any], context: RoutingContext, index: int) -> Scenario:
+    """
+    Parses one scenario. Every field is optional: name, start (hh:mm), trucks, drivers, speed,
+    capacity, and max_weight.
+    Args:
+        fields (Dict[str, any]): Field values from a CSV row or JSON object.
+        context (RoutingContext): Context whose settings fill in missing fields.
+        index (int): Position of the scenario in the file, starting at 1.
+    Returns:
+        Scenario: Parsed scenario.
+    Raises:
+        ValueError: If a field has an unknown name or a value that doesn't parse.
+    """
+    names = {"name", "start", "trucks", "drivers", "speed", "capacity", "max_weight"}
+    unknown = [str(name) for name in fields if name not in names]
+    if unknown:
+        raise ValueError("Scenario " + str(index) + " has unknown fields: " + ", ".join(unknown))
+
+    # Blank CSV cells and JSON nulls both mean the context's setting
+    values = {name: value for name, value in fields.items() if value is not None and str(value).strip() != ""}
+    try:
+        scenario = Scenario(str(values.get("name", "scenario " + str(index))),
+                            Clock.parse_minutes(str(values.get("start", "08:00"))),
+                            int(values.get("trucks", context.num_trucks)),
+                            int(values.get("drivers", context.num_drivers)),
+                            float(values.get("speed", context.speed)),
+                            int(values.get("capacity", context.max_packages)),
+                            float(values.get("max_weight", context.max_weight)))
+    except ValueError as error:
+        raise ValueError("Scenario " + str(index) + ": " + str(error)) from None
+
+    if scenario.num_trucks < 1 or scenario.num_drivers < 1 or scenario.speed <= 0 or scenario.max_packages < 1:
+        raise ValueError("Scenario " + str(index) + " needs at least one truck, one driver, a speed above 0, "
+                                                    "and room for one package")
+
+    return scenario
+
+
+# Reads scenarios from a CSV file with a header row, or a JSON list of objects
+def read_scenarios(scenario_file: str, context: RoutingContext) -> List[Scenario]:
+    """
+    Reads a scenario file. Files ending in .json hold a list of objects; anything else is read as CSV.
+    Args:
+        scenario_file (str): Path to the scenario file.
+        context (RoutingContext): Context whose settings fill in missing fields.
+    Returns:
+        List[Scenario]: Scenarios in file order.
+    Raises:
+        ValueError: If the file or any scenario in it doesn't parse.
+    """
+    with open(scenario_file, mode='r', newline='', encoding="utf-8-sig") as file:
+        if scenario_file.lower().endswith(".json"):
+            rows = json.load(file)
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise ValueError("\"" + scenario_file + "\" must hold a JSON list of objects")
+        else:
+            rows = list(csv.DictReader(file))
+
+    return [parse_scenario(row, context, index) for index, row in enumerate(rows, 1)]
+
+
+# Reads the package file into rows once, after checking every row loads
+def read_package_rows(context: RoutingContext) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Reads the context's package file into a read-only snapshot of its rows. Every scenario builds
+    its own packages from the snapshot, because the simulation changes them.
+    Args:
+        context (RoutingContext): Context naming the package file.
+    Returns:
+        Tuple[Tuple[str, ...], ...]: Package rows without the header.
+    Raises:
+        ValueError: If any row can't be loaded.
+    """
+    with open(context.package_file, mode='r', newline='', encoding="utf-8-sig") as file:
+        csv_file = csv.reader(file)
+        next(csv_file, None)
+        rows = tuple(tuple(row) for row in csv_file)
+
+    rejected: List[Package.RejectedRow] = []
+    for _ in Package.iter_packages(rows, context.address_to_ids, rejected.append):
+        pass
+
+    if rejected:
+        raise ValueError("Packages that couldn't be loaded:\n" + "\n".join(str(row) for row in rejected))
+
+    return rows
+
+
+# Runs in each worker when it starts and keeps the shared context and package rows
+def _attach_worker(context: RoutingContext, rows: Tuple[Tuple[str, ...], ...]) -> None:
+    """
+    Stores the context and package rows for the scenarios this worker runs. A forked worker shares
+    the parent's loaded graph; a spawned one maps the binary distance table again.
+    Args:
+        context (RoutingContext): Context to run scenarios against.
+        rows (Tuple[Tuple[str, ...], ...]): Package rows without the header.
+    """
+    global _worker_context, _worker_rows
+    _worker_context = context.preload()
+    _worker_rows = rows
+
+
+# Simulates one scenario and summarizes how the day went
+def run_scenario(scenario: Scenario) -> Dict[str, any]:
+    """
+    Simulates the day for one scenario with the worker's context and package rows.
+    Args:
+        scenario (Scenario): Scenario to run.
+    Returns:
+        Dict[str, any]: Summary with a value for every name in SUMMARY_FIELDS. An unlimited max_weight is None.
+    Raises:
+        ValueError: If the packages can't be loaded onto the scenario's fleet.
+    """
+    context = _worker_context.derive(num_trucks=scenario.num_trucks, num_drivers=scenario.num_drivers,
+                                     speed=scenario.speed, max_packages=scenario.max_packages,
+                                     max_weight=scenario.max_weight)
+
+    packages = PackageRepository()
+    for package in Package.iter_packages(_worker_rows, context.address_to_ids):
+        packages.insert(package.id, package)
+
+    try:
+        engine = context.simulate_day(packages, Clock.to_datetime(scenario.start_minutes * 60), _FINISH_TIME)
+    except ValueError as error:
+        raise ValueError("Scenario \"" + scenario.name + "\": " + str(error)) from None
+
+    delivered = 0
+    late = 0
+    lateness = 0.0
+    completion = scenario.start_minutes * 60
+    for package in packages.values():
+        if package.status == Package.PackageStatus.DELIVERED:
+            delivered += 1
+            completion = max(completion, package.delivery_seconds)
+            if package.delivery_seconds > package.deadline_seconds:
+                late += 1
+                lateness += (package.delivery_seconds - package.deadline_seconds) / 60
+
+    return {
+        "name": scenario.name,
+        "start": Clock.format_minutes(scenario.start_minutes),
+        "trucks": scenario.num_trucks,
+        "drivers": scenario.num_drivers,
+        "speed": scenario.speed,
+        "capacity": scenario.max_packages,
+        "max_weight": scenario.max_weight if scenario.max_weight != float("inf") else None,
+        "miles": round(sum(truck.miles for truck in engine.trucks), 1),
+        "delivered": delivered,
+        "undelivered": len(packages) - delivered,
+        "late": late,
+        "lateness_minutes": round(lateness, 1),
+        "completion": Clock.format_minutes(round(completion / 60)),
+    }
+
+
+# Runs every scenario over a pool of worker processes
+def run_scenarios(context: RoutingContext, scenarios: Sequence[Scenario],
+                  workers: int | None = None) -> List[Dict[str, any]]:
+    """
+    Runs scenarios in parallel. The graph and package rows are loaded once and shared read-only by
+    every worker, and each worker runs a batch of scenarios at a time to keep the overhead low.
+    Args:
+        context (RoutingContext): Context holding the data files and the settings scenarios start from.
+        scenarios (Sequence[Scenario]): Scenarios to run.
+        workers (int | None): Number of worker processes. Defaults to the number of CPUs. 1 runs
+                              every scenario in this process.
+    Returns:
+        List[Dict[str, any]]: Summary of each scenario, in the same order.
+    """
+    rows = read_package_rows(context.preload())
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(scenarios) <= 1:
+        _attach_worker(context, rows)
+        return [run_scenario(scenario) for scenario in scenarios]
+
+    chunk_size = max(1, len(scenarios) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker, initargs=(context, rows)) as executor:
+        return list(executor.map(run_scenario, scenarios, chunksize=chunk_size))
+
+
+# Writes the summaries as CSV, or as JSON if the file name ends in .json
+def write_summary(results: List[Dict[str, any]], output_file: str | None = None) -> None:
+    """
+    Writes one summary row per scenario.
+    Args:
+        results (List[Dict[str, any]]): Scenario summaries.
+        output_file (str | None): Path to write. Files ending in .json get JSON. None writes CSV to stdout.
+    """
+    if output_file is not None and output_file.lower().endswith(".json"):
+        with open(output_file, mode='w') as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+        return
+
+    file = open(output_file, mode='w', newline='') if output_file is not None else sys.stdout
+    try:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+
+# Runs a scenario file from the command line
+def main(arguments: Sequence[str] | None = None) -> None:
+    """
+    Reads the scenarios, runs them, and writes the summary.
+    Args:
+        arguments (Sequence[str] | None): Command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Simulates many what-if versions of the WGUPS delivery day.")
+    parser.add_argument("scenario_file", help="CSV with a header row, or a .json list of objects, with any of "
+                                              "the fields name, start, trucks, drivers, speed, capacity, "
+                                              "max_weight")
+    parser.add_argument("-o", "--output", help="file to write the summary to, as JSON if it ends in .json. "
+                                               "Defaults to CSV on stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPUs)")
+    parser.add_argument("--distances", default="WGUPS Distance Table.csv", help="distance table CSV")
+    parser.add_argument("--packages", default="WGUPS Package File.csv", help="package CSV")
+    parsed = parser.parse_args(arguments)
+
+    context = RoutingContext(parsed.distances, parsed.packages)
+    try:
+        scenarios = read_scenarios(parsed.scenario_file, context)
+        results = run_scenarios(context, scenarios, parsed.workers)
+    except (OSError, ValueError) as error:
+        parser.exit(1, str(error) + "\n")
+
+    write_summary(results, parsed.output)
+
+
+if __name__ == "__main__":
+    main()
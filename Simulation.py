@@ -0,0 +1,709 @@
+"""
+Simulation.py
+Simulates the delivery day as discrete events, records it as a timestamped event log, and rebuilds
+the state at any time from it.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Simulation.py
+# Purpose: Lets the program answer "what did the day look like at hh:mm" without simulating it again
+
+# Standard Library
+import bisect
+import heapq
+from collections import deque
+from enum import IntEnum
+from typing import Callable, Dict, List, Tuple
+
+# Created Imports
+import Instrument
+from Clock import clock_seconds, to_datetime
+from Fleet import TruckSpec
+from Graph import Graph
+from Package import END_OF_DAY, Package, PackageStatus, load_truck
+from PackageRepository import PackageRepository
+
+
+# The kinds of things that happen during the day
+class EventKind(IntEnum):
+    """
+    Kind of an event in the event log.
+    """
+    HUB_ARRIVAL = 0
+    ADDRESS_CORRECTION = 1
+    LOAD = 2
+    DEPART = 3
+    DELIVER = 4
+    RETURN = 5
+
+
+# One thing that happened at a point in the day
+class Event:
+    """
+    Represents a single timestamped event.
+    """
+    __slots__ = ("time", "kind", "truck", "package_id", "miles")
+
+    def __init__(self, time: float, kind: EventKind, truck: int = 0, package_id: int = -1, miles: float = 0.0):
+        """
+        Initializes an Event.
+        Args:
+            time (float): Seconds since midnight.
+            kind (EventKind): What happened.
+            truck (int): Truck number, or 0 if no truck is involved.
+            package_id (int): Package id, or -1 if no package is involved.
+            miles (float): Miles driven for the leg that ends with this event.
+        """
+        self.time = time
+        self.kind = kind
+        self.truck = truck
+        self.package_id = package_id
+        self.miles = miles
+
+    # Returns a readable description of the event
+    def __str__(self) -> str:
+        """
+        Returns a readable description of the event.
+        Returns:
+            str: Event description.
+        """
+        seconds = int(self.time)
+        string = str(seconds // 3600).zfill(2) + ":" + str(seconds // 60 % 60).zfill(2) + ":"
+        string += str(seconds % 60).zfill(2) + " " + self.kind.name
+        if self.truck:
+            string += " truck " + str(self.truck)
+        if self.package_id != -1:
+            string += " package " + str(self.package_id)
+        return string
+
+
+# When each thing happens to one package. Times that never happen are infinity.
+class PackageTimeline:
+    """
+    Holds the event times for a single package along with the values it started the day with.
+    """
+    __slots__ = ("original_status", "original_address", "original_deadline", "corrected_address",
+                 "available", "correction", "load", "load_order", "truck", "depart", "deliver")
+
+    def __init__(self, package: Package):
+        """
+        Initializes the timeline from the package's start of day values.
+        Args:
+            package (Package): Package at the start of the day.
+        """
+        self.original_status = package.status
+        self.original_address = (package.address, package.city, package.state, package.zip_code)
+        self.original_deadline = package.deadline_seconds
+        self.corrected_address = package.corrected_address
+        self.available = float("inf")
+        self.correction = float("inf")
+        self.load = float("inf")
+        self.load_order = 0
+        self.truck = 0
+        self.depart = float("inf")
+        self.deliver = float("inf")
+
+
+# What the day looks like at one point in time
+class SimulationState:
+    """
+    Holds the trucks, their mileage, and the packages still at the hub at a given time.
+    """
+    def __init__(self, time: float, trucks: Dict[int, List[Package]], distances: Dict[int, float],
+                 waiting: List[Package], delayed: List[Package]):
+        """
+        Initializes a SimulationState.
+        Args:
+            time (float): Seconds since midnight.
+            trucks (Dict[int, List[Package]]): Packages on each truck that haven't been delivered.
+            distances (Dict[int, float]): Miles each truck has driven.
+            waiting (List[Package]): Packages at the hub that aren't loaded yet.
+            delayed (List[Package]): Packages that haven't reached the hub or have a wrong address.
+        """
+        self.time = time
+        self.trucks = trucks
+        self.distances = distances
+        self.waiting = waiting
+        self.delayed = delayed
+
+    # Returns the miles driven by every truck together
+    def total_distance(self) -> float:
+        """
+        Returns the total miles driven by all trucks.
+        Returns:
+            float: Total distance.
+        """
+        return sum(self.distances.values())
+
+
+# Timestamped log of everything that happens in a simulated day. The day is simulated once while
+# recording, then any time can be looked up by binary searching the log.
+class EventLog:
+    """
+    Event log of loads, departures, deliveries, hub returns, late hub arrivals, and address corrections.
+    """
+    def __init__(self, speed: float):
+        """
+        Initializes an empty event log.
+        Args:
+            speed (float): Truck speed in miles per hour, used to place trucks between stops.
+        """
+        self.speed = speed
+        self.events: List[Event] = []
+        self.timelines: Dict[int, PackageTimeline] = {}
+
+        # For each truck, the time of each of its events and the miles driven by then
+        self.truck_times: Dict[int, List[float]] = {}
+        self.truck_miles: Dict[int, List[float]] = {}
+        self.truck_moving: Dict[int, List[bool]] = {}
+        self.load_count = 0
+
+    # Records the start of day values of every package
+    def capture(self, packages: PackageRepository) -> None:
+        """
+        Records every package's start of day values. Must be called before the day is simulated.
+        Args:
+            packages (PackageRepository): Packages at the start of the day.
+        """
+        for package in packages.values():
+            self.timelines[package.id] = PackageTimeline(package)
+
+    # Adds an event to the log
+    def record(self, time: float, kind: EventKind, truck: int = 0, package_id: int = -1, miles: float = 0.0) -> None:
+        """
+        Adds an event to the log.
+        Args:
+            time (float): Seconds since midnight.
+            kind (EventKind): What happened.
+            truck (int): Truck number, or 0 if no truck is involved.
+            package_id (int): Package id, or -1 if no package is involved.
+            miles (float): Miles driven for the leg that ends with this event.
+        """
+        self.events.append(Event(time, kind, truck, package_id, miles))
+
+        timeline = self.timelines.get(package_id)
+        if timeline is None:
+            return
+
+        if kind == EventKind.HUB_ARRIVAL:
+            timeline.available = time
+        elif kind == EventKind.ADDRESS_CORRECTION:
+            timeline.available = time
+            timeline.correction = time
+        elif kind == EventKind.LOAD:
+            timeline.load = time
+            timeline.load_order = self.load_count
+            timeline.truck = truck
+            self.load_count += 1
+        elif kind == EventKind.DELIVER:
+            timeline.deliver = time
+
+    # Records every package on the truck that hasn't been loaded yet
+    def record_loads(self, time: float, truck: int, packages: List[Package]) -> None:
+        """
+        Records a load event for each package on a truck that doesn't have one yet.
+        Args:
+            time (float): Seconds since midnight.
+            truck (int): Truck number.
+            packages (List[Package]): Packages on the truck.
+        """
+        for package in packages:
+            timeline = self.timelines.get(package.id)
+            if timeline is not None and timeline.load == float("inf"):
+                self.record(time, EventKind.LOAD, truck, package.id)
+
+    # Records a truck leaving the hub with the packages on it
+    def record_departure(self, time: float, truck: int, packages: List[Package]) -> None:
+        """
+        Records a truck leaving the hub.
+        Args:
+            time (float): Seconds since midnight.
+            truck (int): Truck number.
+            packages (List[Package]): Packages on the truck.
+        """
+        self.record(time, EventKind.DEPART, truck)
+        for package in packages:
+            timeline = self.timelines.get(package.id)
+            if timeline is not None:
+                timeline.depart = min(timeline.depart, time)
+
+    # Sorts the log and builds the mileage lookups. Must be called after the day is simulated.
+    def finish(self) -> None:
+        """
+        Sorts the events by time and builds each truck's mileage timeline.
+        """
+        self.events.sort(key=lambda event: event.time)
+
+        for event in self.events:
+            if event.kind not in (EventKind.DEPART, EventKind.DELIVER, EventKind.RETURN):
+                continue
+
+            times = self.truck_times.setdefault(event.truck, [])
+            miles = self.truck_miles.setdefault(event.truck, [])
+            moving = self.truck_moving.setdefault(event.truck, [])
+            times.append(event.time)
+            miles.append((miles[-1] if miles else 0.0) + event.miles)
+
+            # After a departure or a delivery the truck is driving to its next stop.
+            # After a return it waits at the hub.
+            moving.append(event.kind != EventKind.RETURN)
+
+    # Returns the events that happened at or before a time
+    def events_until(self, time: float) -> List[Event]:
+        """
+        Returns every event at or before a time.
+        Args:
+            time (float): Seconds since midnight.
+        Returns:
+            List[Event]: Events in time order.
+        """
+        index = bisect.bisect_right(self.events, time, key=lambda event: event.time)
+        return self.events[:index]
+
+    # Returns how many miles a truck has driven by a time
+    def truck_distance(self, truck: int, time: float) -> float:
+        """
+        Returns the miles a truck has driven by a time, including the part of a leg it's in the middle of.
+        Args:
+            truck (int): Truck number.
+            time (float): Seconds since midnight.
+        Returns:
+            float: Miles driven.
+        """
+        times = self.truck_times.get(truck)
+        if not times:
+            return 0.0
+
+        index = bisect.bisect_right(times, time) - 1
+        if index < 0:
+            return 0.0
+
+        miles = self.truck_miles[truck]
+        distance = miles[index]
+
+        # Partway through a leg, the truck has covered the time since the last event at full speed
+        if self.truck_moving[truck][index] and index + 1 < len(times):
+            distance += min(self.speed * (time - times[index]) / 3600, miles[index + 1] - miles[index])
+
+        return distance
+
+    # Sets every package to how it was at a time and returns the trucks and hub at that time
+    @Instrument.timed("apply_log")
+    def apply(self, packages: PackageRepository, time: float) -> SimulationState:
+        """
+        Rebuilds the state of the day at a time. Each package's status, delivery time, address, and
+        deadline are set from its timeline, so the day never has to be simulated again.
+        Args:
+            packages (PackageRepository): Packages to update.
+            time (float): Seconds since midnight.
+        Returns:
+            SimulationState: Trucks, mileage, and waiting packages at the time.
+        """
+        trucks: Dict[int, List[Tuple[int, Package]]] = {}
+        waiting: List[Tuple[Tuple[int, int, int], Package]] = []
+        delayed: List[Package] = []
+
+        for package_id, timeline in self.timelines.items():
+            package = packages.lookup(package_id)
+            late = timeline.original_status in (PackageStatus.DELAYED, PackageStatus.UPDATING_ADDRESS)
+            arrived = not late or timeline.available <= time
+
+            if timeline.deliver <= time:
+                status = PackageStatus.DELIVERED
+                delivery_seconds = int(timeline.deliver)
+            else:
+                delivery_seconds = 0
+                if timeline.depart < time:
+                    status = PackageStatus.EN_ROUTE
+                elif not arrived:
+                    status = timeline.original_status
+                else:
+                    status = PackageStatus.AT_HUB
+
+            address = timeline.original_address
+            if timeline.correction <= time:
+                address = timeline.corrected_address
+
+            deadline = timeline.original_deadline
+            if late and arrived:
+                deadline = END_OF_DAY
+
+            # Only change what's different, so the repository's indexes aren't updated for nothing
+            if package.status != status:
+                package.status = status
+            package.delivery_seconds = delivery_seconds
+            if package.address != address[0]:
+                package.address, package.city, package.state, package.zip_code = address
+            if package.deadline_seconds != deadline:
+                package.deadline = to_datetime(deadline)
+            truck = timeline.truck if timeline.load <= time else 0
+            if package.truck != truck:
+                package.truck = truck
+
+            # Sort the package onto its truck, the hub, or the delayed list
+            if timeline.load <= time:
+                if status != PackageStatus.DELIVERED:
+                    trucks.setdefault(timeline.truck, []).append((timeline.load_order, package))
+            elif not arrived:
+                delayed.append(package)
+            else:
+                # Packages that were at the hub from the start go first in deadline order,
+                # then the ones that arrived late.
+                waiting.append(((1 if late else 0, 0 if late else timeline.original_deadline, package_id), package))
+
+        waiting.sort(key=lambda item: item[0])
+        delayed.sort(key=lambda package: package.id)
+        distances = {truck: self.truck_distance(truck, time) for truck in self.truck_times}
+        return SimulationState(time,
+                               {truck: [package for _, package in sorted(loaded, key=lambda item: item[0])]
+                                for truck, loaded in trucks.items()},
+                               distances,
+                               [package for _, package in waiting],
+                               delayed)
+
+
+# A truck in the fleet. It's either idle at the hub or out on a run with a driver.
+class Truck:
+    """
+    Holds a truck's packages, position, and mileage during the simulation.
+    """
+    __slots__ = ("spec", "number", "packages", "queued", "location", "miles", "trips", "driver", "route", "stops")
+
+    def __init__(self, spec: TruckSpec, location: int, queued: List[List[Package]] | None = None):
+        """
+        Initializes an empty Truck parked at the hub.
+        Args:
+            spec (TruckSpec): Truck number and limits.
+            location (int): Vertex id of the hub.
+            queued (List[List[Package]] | None): Packages that can only go on this truck, one list per run.
+        """
+        self.spec = spec
+        self.number = spec.number
+        self.packages: List[Package] = []
+        self.queued = deque(queued or ())
+        self.location = location
+        self.miles = 0.0
+        self.trips = 0
+        self.driver = 0
+        self.route: deque | None = None
+
+        # Packages still on the truck for each stop on its run, in the order they were loaded
+        self.stops: Dict[int, List[Package]] = {}
+
+
+# Decides the order a truck visits its stops in. Given the truck's packages and its departure in
+# seconds since midnight, it returns vertex ids, or None to pick the closest stop every time.
+RoutePlanner = Callable[[List[Package], float], List[int] | None]
+
+
+# Discrete-event simulation of the delivery day. Every hub arrival, stop, and return to the hub is
+# an event in a heap ordered by time, so a day with E events takes O(E log E) however many trucks
+# and drivers there are.
+class DeliveryEngine:
+    """
+    Runs a fleet of trucks and a smaller or equal number of drivers through the day. A driver at the
+    hub takes the idle truck that has made the fewest runs, loads it from the packages at the hub,
+    and leaves. The packages at the hub are split into loads, and a run only takes packages from the
+    first load, so it never mixes packages from two loads. A truck with packages
+    queued for it takes the next run of them first, and goes out even when the hub is empty. Late
+    packages join the last load when their arrival event fires.
+    """
+    def __init__(self, graph: Graph, hub: int, fleet: List[TruckSpec], trucks: List[List[List[Package]]],
+                 loads: List[List[Package]], late: List[Package], num_drivers: int, speed: float,
+                 planner: RoutePlanner | None = None, log: EventLog | None = None):
+        """
+        Initializes the engine.
+        Args:
+            graph (Graph): Graph holding the distances.
+            hub (int): Vertex id of the hub.
+            fleet (List[TruckSpec]): Trucks in the fleet, numbered from 1 in order.
+            trucks (List[List[List[Package]]]): Packages queued for each run of each truck, in fleet order.
+            loads (List[List[Package]]): Packages at the hub split into loads, each in the order it should be loaded.
+            late (List[Package]): Packages that reach the hub, or get their correct address, later in the day.
+            num_drivers (int): Number of drivers.
+            speed (float): Truck speed in miles per hour.
+            planner (RoutePlanner | None): Plans each run. None picks the closest stop every time.
+            log (EventLog | None): Event log to record the day in.
+        """
+        self.graph = graph
+        self.hub = hub
+        self.trucks = [Truck(spec, hub, queued) for spec, queued in zip(fleet, trucks)]
+        self.loads = deque(load for load in loads if load)
+        self.seconds_per_mile = 3600 / speed
+        self.planner = planner
+        self.log = log
+
+        # Events are (time, kind, sequence, truck number, vertex or package id, miles). The kind breaks
+        # ties so packages reach the hub before a truck returning at the same moment is loaded, and the
+        # sequence keeps everything else in the order it was scheduled.
+        self.queue: List[Tuple[float, int, int, int, int, float]] = []
+        self.sequence = 0
+        self.late: Dict[int, Package] = {}
+        for package in late:
+            kind = EventKind.HUB_ARRIVAL
+            if package.status == PackageStatus.UPDATING_ADDRESS:
+                kind = EventKind.ADDRESS_CORRECTION
+            self.late[package.id] = package
+            self._schedule(package.available_seconds, kind, 0, package.id)
+
+        # Idle trucks as (runs made, truck number), and the drivers waiting at the hub. A truck that leaves
+        # without being popped keeps a stale entry, which is skipped once its runs made no longer match.
+        self.idle_trucks: List[Tuple[int, int]] = [(0, truck.number) for truck in self.trucks]
+        self.idle_drivers = deque(range(1, num_drivers + 1))
+
+        # Idle trucks with packages queued for them, in truck order. They can leave even when the hub is empty.
+        self.queued_trucks: Dict[int, None] = dict.fromkeys(truck.number for truck in self.trucks if truck.queued)
+
+        # No truck leaves before the day starts, so packages that show up earlier just wait at the hub
+        self.started = False
+
+    # Adds an event to the queue
+    def _schedule(self, time: float, kind: EventKind, truck: int, target: int, miles: float = 0.0) -> None:
+        """
+        Adds an event to the queue.
+        Args:
+            time (float): Seconds since midnight.
+            kind (EventKind): What happens.
+            truck (int): Truck number, or 0 if no truck is involved.
+            target (int): Vertex id for a delivery, or package id for a hub arrival.
+            miles (float): Miles driven to reach the event.
+        """
+        heapq.heappush(self.queue, (time, kind, self.sequence, truck, target, miles))
+        self.sequence += 1
+
+    # Runs the day from start to finish
+    def run(self, start: float, finish: float) -> None:
+        """
+        Sends out the first trucks at start and processes every event up to and including finish.
+        Args:
+            start (float): Start of the day in seconds since midnight.
+            finish (float): End of the simulation in seconds since midnight.
+        """
+        # Anything due before the day starts happens first, then the drivers head out
+        while self.queue and self.queue[0][0] <= start:
+            self._handle(*heapq.heappop(self.queue))
+        self.started = True
+        self._dispatch(start)
+
+        while self.queue and self.queue[0][0] <= finish:
+            self._handle(*heapq.heappop(self.queue))
+
+        # Trucks still out hold what they haven't delivered yet
+        for truck in self.trucks:
+            if truck.driver:
+                self._unload(truck)
+
+    # Processes one event
+    def _handle(self, time: float, kind: int, _: int, truck_number: int, target: int, miles: float) -> None:
+        """
+        Processes one event from the queue.
+        Args:
+            time (float): Seconds since midnight.
+            kind (int): EventKind of the event.
+            _ (int): Sequence number.
+            truck_number (int): Truck number, or 0 if no truck is involved.
+            target (int): Vertex id for a delivery, or package id for a hub arrival.
+            miles (float): Miles driven to reach the event.
+        """
+        if kind == EventKind.DELIVER:
+            self._deliver(self.trucks[truck_number - 1], time, target, miles)
+        elif kind == EventKind.RETURN:
+            self._return(self.trucks[truck_number - 1], time, miles)
+        else:
+            self._arrive(self.late.pop(target), time, kind)
+
+    # A late package reaches the hub or gets its correct address
+    def _arrive(self, package: Package, time: float, kind: int) -> None:
+        """
+        Makes a late package available for loading.
+        Args:
+            package (Package): Package that arrived.
+            time (float): Seconds since midnight.
+            kind (int): HUB_ARRIVAL or ADDRESS_CORRECTION.
+        """
+        if kind == EventKind.ADDRESS_CORRECTION:
+            package.apply_address_correction()
+
+        package.deadline = to_datetime(END_OF_DAY)
+        package.status = PackageStatus.AT_HUB
+        if not self.loads:
+            self.loads.append([])
+        self.loads[-1].append(package)
+        if self.log is not None:
+            self.log.record(time, EventKind(kind), package_id=package.id)
+
+        if self.started:
+            self._dispatch(time)
+
+    # Sends drivers waiting at the hub out on idle trucks while there's something to carry
+    def _dispatch(self, time: float) -> None:
+        """
+        Loads idle trucks and sends them out, one per waiting driver.
+        Args:
+            time (float): Seconds since midnight.
+        """
+        while self.idle_drivers:
+            truck = self._next_truck()
+            if truck is None:
+                return
+
+            self.queued_trucks.pop(truck.number, None)
+            truck.driver = self.idle_drivers.popleft()
+            truck.trips += 1
+            if self.log is not None:
+                self.log.record_loads(time, truck.number, truck.packages)
+            self._depart(truck, time)
+
+    # Picks and loads the next idle truck to go out
+    def _next_truck(self) -> Truck | None:
+        """
+        Loads the idle truck that has made the fewest runs from the packages at the hub. If nothing at
+        the hub can go on it, an idle truck with packages queued for it goes instead.
+        Returns:
+            Truck | None: Loaded truck, or None if no idle truck has anything to carry.
+        """
+        while self.loads and self.idle_trucks:
+            trips, number = self.idle_trucks[0]
+            truck = self.trucks[number - 1]
+            if truck.driver or trips != truck.trips:
+                heapq.heappop(self.idle_trucks)
+                continue
+
+            self._load(truck)
+            if not truck.packages:
+                break
+
+            heapq.heappop(self.idle_trucks)
+            return truck
+
+        if not self.queued_trucks:
+            return None
+
+        truck = self.trucks[next(iter(self.queued_trucks)) - 1]
+        self._load(truck)
+        return truck
+
+    # Loads a truck with its next queued run, then fills it up from the hub
+    def _load(self, truck: Truck) -> None:
+        """
+        Puts the truck's next run of queued packages on it, if they fit next to what it still holds,
+        then loads packages from the first load at the hub until it's full or the load is used up.
+        Args:
+            truck (Truck): Idle truck to load.
+        """
+        spec = truck.spec
+        if truck.queued and len(truck.packages) + len(truck.queued[0]) <= spec.max_packages:
+            for package in truck.queued.popleft():
+                package.truck = truck.number
+                truck.packages.append(package)
+
+        if self.loads:
+            load_truck(truck.packages, self.loads[0], spec.max_packages, truck.number, spec.max_weight)
+            if not self.loads[0]:
+                self.loads.popleft()
+
+    # A loaded truck leaves the hub
+    def _depart(self, truck: Truck, time: float) -> None:
+        """
+        Plans the truck's run and schedules its first stop.
+        Args:
+            truck (Truck): Truck leaving the hub.
+            time (float): Seconds since midnight.
+        """
+        for package in truck.packages:
+            package.status = PackageStatus.EN_ROUTE
+        if self.log is not None:
+            self.log.record_departure(time, truck.number, truck.packages)
+
+        truck.stops = {}
+        for package in truck.packages:
+            truck.stops.setdefault(package.vertex_id, []).append(package)
+
+        route = self.planner(truck.packages, time) if self.planner is not None else None
+        truck.route = deque(route) if route is not None else None
+        self._schedule_next_stop(truck, time)
+
+    # Schedules the truck's next delivery, or its trip back to the hub once it's empty
+    def _schedule_next_stop(self, truck: Truck, time: float) -> None:
+        """
+        Picks the truck's next stop, following its planned route and falling back to the closest stop.
+        Args:
+            truck (Truck): Truck to move.
+            time (float): Seconds since midnight.
+        """
+        # Stops are in truck order, so ties go to the package loaded first
+        stops = truck.stops
+        next_stop = -1
+        distance = float("inf")
+        while truck.route:
+            vertex = truck.route.popleft()
+            if vertex in stops:
+                next_stop, distance = vertex, self.graph.get_edge(truck.location, vertex)
+                break
+
+        if next_stop == -1 and stops:
+            next_stop, distance = self.graph.find_nearest(truck.location, list(stops))
+
+        if next_stop != -1:
+            self._schedule(time + distance * self.seconds_per_mile, EventKind.DELIVER, truck.number, next_stop,
+                           distance)
+            return
+
+        # Nothing left that can be reached, so head back to the hub
+        distance = self.graph.get_edge(truck.location, self.hub)
+        self._schedule(time + distance * self.seconds_per_mile, EventKind.RETURN, truck.number, self.hub, distance)
+
+    # A truck reaches a stop and delivers every package going there
+    def _deliver(self, truck: Truck, time: float, vertex: int, miles: float) -> None:
+        """
+        Delivers the truck's packages for a stop.
+        Args:
+            truck (Truck): Truck at the stop.
+            time (float): Seconds since midnight.
+            vertex (int): Vertex id of the stop.
+            miles (float): Miles driven to reach the stop.
+        """
+        truck.location = vertex
+        truck.miles += miles
+
+        for package in truck.stops.pop(vertex):
+            package.status = PackageStatus.DELIVERED
+            package.delivery_seconds = int(time)
+            if self.log is not None:
+                self.log.record(time, EventKind.DELIVER, truck.number, package.id, miles)
+            miles = 0.0
+
+        self._schedule_next_stop(truck, time)
+
+    # A truck gets back to the hub, freeing it and its driver
+    def _return(self, truck: Truck, time: float, miles: float) -> None:
+        """
+        Parks the truck at the hub and sends out the next run.
+        Args:
+            truck (Truck): Truck returning.
+            time (float): Seconds since midnight.
+            miles (float): Miles driven back to the hub.
+        """
+        truck.location = self.hub
+        truck.miles += miles
+        self._unload(truck)
+        if self.log is not None:
+            self.log.record(time, EventKind.RETURN, truck.number, miles=miles)
+
+        self.idle_drivers.append(truck.driver)
+        truck.driver = 0
+        heapq.heappush(self.idle_trucks, (truck.trips, truck.number))
+        if truck.queued:
+            self.queued_trucks[truck.number] = None
+        self._dispatch(time)
+
+    # Cuts the truck's packages down to the ones it hasn't delivered
+    def _unload(self, truck: Truck) -> None:
+        """
+        Sets the truck's packages to the ones still waiting for a stop. Deliveries only take packages off
+        the truck's stops, so this is done once at the end of a run instead of at every stop.
+        Args:
+            truck (Truck): Truck to update.
+        """
+        truck.packages[:] = [package for stop in truck.stops.values() for package in stop]
@@ -0,0 +1,603 @@
+"""
+Snapshot.py
+Saves the whole state of the delivery day to a compact binary file and restores it with one read.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: Snapshot.py
+# Purpose: Checkpoints every package, truck, and the current time so a restart doesn't replay the day from the CSVs
+
+# Standard Library
+import contextlib
+import gc
+import os
+import struct
+import sys
+from array import array
+from operator import attrgetter
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Created Imports
+from Graph import write_atomically
+from Package import Package, PackageStatus
+from PackageRepository import PackageRepository
+from Simulation import Event, EventKind, EventLog, PackageTimeline, SimulationState
+
+# Identifies a snapshot file and its layout version
+_MAGIC = b"WGSS0001"
+
+# Magic, whether the file is incremental, whether it holds the event log, the byte order the arrays
+# were written in, the snapshot's id, the id of the snapshot an incremental one was taken against,
+# the time in seconds since midnight, the truck speed of the event log, and the number of sections
+_HEADER = struct.Struct("<8s??c5x16s16sddQ")
+
+# Sections of the file in order, as (name, array typecode). Every package has one value in each
+# package column, which is named after its Package field. Strings are indexes into the string table,
+# group_ids and corrected_address are indexes into the group and address tables, and an address
+# table entry is four ints: its address, city, and state string indexes and its zip code.
+PACKAGE_COLUMNS = (
+    ("id", "i"), ("address", "i"), ("vertex_id", "i"), ("city", "i"), ("state", "i"), ("zip_code", "i"),
+    ("deadline_seconds", "i"), ("weight", "i"), ("special_notes", "i"), ("status", "b"),
+    ("delivery_seconds", "i"), ("truck", "i"), ("required_truck", "i"), ("group_ids", "i"),
+    ("available_seconds", "i"), ("corrected_address", "i"),
+)
+_TABLE_SECTIONS = (("strings", "B"), ("address_table", "i"), ("group_offsets", "i"), ("group_members", "i"))
+
+# Where each package in an incremental snapshot is in the snapshot it was taken against
+_ROW_SECTIONS = (("row", "i"),)
+
+# The packages still on each truck in load order, each truck's miles, and the packages at the hub
+_STATE_SECTIONS = (("truck_numbers", "i"), ("truck_offsets", "i"), ("truck_packages", "i"),
+                   ("distance_trucks", "i"), ("distances", "d"), ("waiting", "i"), ("delayed", "i"))
+
+# The event log's package timelines and events. The truck timelines are rebuilt from the events,
+# so they aren't saved.
+_TIMELINE_SECTIONS = (("timeline_id", "i"), ("original_status", "b"), ("original_address", "i"),
+                      ("original_deadline", "i"), ("timeline_corrected_address", "i"), ("available", "d"),
+                      ("correction", "d"), ("load", "d"), ("load_order", "i"), ("timeline_truck", "i"),
+                      ("depart", "d"), ("deliver", "d"))
+_EVENT_SECTIONS = (("event_time", "d"), ("event_kind", "b"), ("event_truck", "i"), ("event_package", "i"),
+                   ("event_miles", "d"))
+
+SECTIONS = PACKAGE_COLUMNS + _TABLE_SECTIONS + _ROW_SECTIONS + _STATE_SECTIONS + _TIMELINE_SECTIONS + _EVENT_SECTIONS
+
+# Package columns holding indexes into the string table
+_STRING_COLUMNS = ("address", "city", "state", "special_notes")
+
+# The byte order this machine writes arrays in
+_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+# Statuses and event kinds by value, so restoring doesn't call the enum constructor once per value
+_STATUSES = tuple(PackageStatus)
+_EVENT_KINDS = tuple(EventKind)
+
+
+# Pauses the garbage collector while a block makes a lot of objects
+@contextlib.contextmanager
+def _collector_paused() -> Iterator[None]:
+    """
+    Turns the cyclic garbage collector off for the block. Building a million packages would otherwise
+    set it off thousands of times, and each pass walks every object made so far while none of them
+    are garbage yet.
+    Returns:
+        Iterator[None]: Context manager.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+# The state of the day at one time, held as one array per field
+class Snapshot:
+    """
+    Holds every package field, the trucks, and optionally the event log as columns of numbers.
+    Strings, address tuples, and co-delivery groups are stored once each in tables and referred to
+    by index. A full snapshot holds every package. An incremental one holds only the packages that
+    changed since its parent, the snapshot it was taken against.
+    """
+    def __init__(self, time: float, incremental: bool = False, snapshot_id: bytes | None = None,
+                 parent_id: bytes = bytes(16), speed: float = 0.0, has_log: bool = False):
+        """
+        Initializes an empty Snapshot.
+        Args:
+            time (float): Time of the snapshot in seconds since midnight.
+            incremental (bool): Whether it only holds the packages that changed since its parent.
+            snapshot_id (bytes | None): 16 byte id. None picks a random one.
+            parent_id (bytes): Id of the parent of an incremental snapshot.
+            speed (float): Truck speed of the event log in miles per hour.
+            has_log (bool): Whether the log sections hold an event log.
+        """
+        self.time = time
+        self.incremental = incremental
+        self.snapshot_id = snapshot_id if snapshot_id is not None else os.urandom(16)
+        self.parent_id = parent_id
+        self.speed = speed
+        self.has_log = has_log
+        self.columns: Dict[str, array] = {name: array(typecode) for name, typecode in SECTIONS}
+
+        # Tables the columns point into, with a dict from each value to its index
+        self.strings: List[str] = []
+        self.addresses: List[Tuple[str, str, str, int]] = []
+        self.groups: List[Tuple[int, ...]] = []
+        self._string_index: Dict[str, int] = {}
+        self._address_index: Dict[Tuple[str, str, str, int], int] = {}
+        self._group_index: Dict[Tuple[int, ...], int] = {}
+
+    # Returns the index of a string in the string table, adding it if it's new
+    def _string(self, value: str) -> int:
+        """
+        Returns a string's index in the string table.
+        Args:
+            value (str): String to look up.
+        Returns:
+            int: Index into strings.
+        """
+        index = self._string_index.get(value)
+        if index is None:
+            index = self._string_index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    # Returns the index of an address in the address table, adding it if it's new
+    def _address(self, value: Tuple[str, str, str, int] | None) -> int:
+        """
+        Returns an (address, city, state, zip code) tuple's index in the address table. Its strings
+        are added to the string table too.
+        Args:
+            value (Tuple[str, str, str, int] | None): Address to look up.
+        Returns:
+            int: Index into addresses, or -1 for None.
+        """
+        if value is None:
+            return -1
+
+        index = self._address_index.get(value)
+        if index is None:
+            for string in value[:3]:
+                self._string(string)
+            index = self._address_index[value] = len(self.addresses)
+            self.addresses.append(value)
+        return index
+
+    # Returns the index of a co-delivery group in the group table, adding it if it's new
+    def _group(self, value: Tuple[int, ...]) -> int:
+        """
+        Returns a group's index in the group table.
+        Args:
+            value (Tuple[int, ...]): Package ids in the group.
+        Returns:
+            int: Index into groups.
+        """
+        index = self._group_index.get(value)
+        if index is None:
+            index = self._group_index[value] = len(self.groups)
+            self.groups.append(value)
+        return index
+
+    # Returns the table index of every value in a list, adding the values the table doesn't have yet
+    def _indexes(self, values: List[any], add: Callable[[any], int]) -> array:
+        """
+        Looks up each distinct value once, then maps the whole list through a dict.
+        Args:
+            values (List[any]): Values to look up.
+            add (Callable[[any], int]): _string, _address, or _group.
+        Returns:
+            array: Index of each value, in order.
+        """
+        indexes = {value: add(value) for value in dict.fromkeys(values)}
+        return array("i", map(indexes.__getitem__, values))
+
+    # Gives the number of packages held
+    def __len__(self) -> int:
+        """
+        Returns the number of packages in the snapshot.
+        Returns:
+            int: Number of packages.
+        """
+        return len(self.columns["id"])
+
+    # Copies the package columns of some packages from another snapshot into this one
+    def _copy_rows(self, other: "Snapshot", rows: Sequence[int]) -> None:
+        """
+        Appends rows of another snapshot's package columns, moving its string, address, and group
+        indexes over to this snapshot's tables. Only the table entries the rows point to are added.
+        Args:
+            other (Snapshot): Snapshot to copy from.
+            rows (Sequence[int]): Positions of the packages in other.
+        """
+        # Index in other's table to index in this one's, filled in as the rows need them
+        moved: Dict[str, Dict[int, int]] = {"strings": {}, "addresses": {-1: -1}, "groups": {}}
+        for name, _ in PACKAGE_COLUMNS:
+            source = other.columns[name]
+            target = self.columns[name]
+            values = [source[row] for row in rows]
+            if name in _STRING_COLUMNS:
+                table, add, indexes = other.strings, self._string, moved["strings"]
+            elif name == "group_ids":
+                table, add, indexes = other.groups, self._group, moved["groups"]
+            elif name == "corrected_address":
+                table, add, indexes = other.addresses, self._address, moved["addresses"]
+            else:
+                target.extend(values)
+                continue
+
+            for index in dict.fromkeys(values):
+                if index not in indexes:
+                    indexes[index] = add(table[index])
+            target.extend(map(indexes.__getitem__, values))
+
+    # Builds the packages as Package objects in a new repository
+    def to_packages(self, address_ids: Dict[str, int] | None = None) -> PackageRepository:
+        """
+        Builds every package in a full snapshot. This makes one Python object per package, so for
+        large days it takes much longer than reading the file, about 5.5 seconds for a million packages.
+        Args:
+            address_ids (Dict[str, int] | None): Address to vertex id dict the packages use when their address changes.
+        Returns:
+            PackageRepository: Packages, indexed like read_packages indexes them.
+        """
+        strings = [sys.intern(value) for value in self.strings]
+        addresses = [(sys.intern(address), sys.intern(city), sys.intern(state), zip_code)
+                     for address, city, state, zip_code in self.addresses]
+        groups = self.groups
+        columns = [self.columns[name] for name, _ in PACKAGE_COLUMNS]
+
+        with _collector_paused():
+            packages = []
+            for (package_id, address, vertex_id, city, state, zip_code, deadline_seconds, weight, special_notes,
+                 status, delivery_seconds, truck, required_truck, group_ids, available_seconds,
+                 corrected_address) in zip(*columns):
+                packages.append((package_id, Package.from_fields(
+                    package_id, strings[address], vertex_id, strings[city], strings[state], zip_code, deadline_seconds,
+                    weight, strings[special_notes], _STATUSES[status], delivery_seconds, truck, required_truck,
+                    groups[group_ids], available_seconds,
+                    addresses[corrected_address] if corrected_address != -1 else None, address_ids)))
+
+            repository = PackageRepository()
+            repository.insert_many(packages)
+        return repository
+
+    # Builds the trucks, mileage, and hub lists out of the packages
+    def to_state(self, packages: PackageRepository) -> SimulationState:
+        """
+        Builds the SimulationState the snapshot was taken from.
+        Args:
+            packages (PackageRepository): Packages from to_packages.
+        Returns:
+            SimulationState: Trucks, mileage, and waiting packages at the snapshot's time.
+        """
+        columns = self.columns
+        offsets = columns["truck_offsets"]
+        truck_packages = columns["truck_packages"]
+        trucks = {number: packages.lookup_many(truck_packages[offsets[index]:offsets[index + 1]])
+                  for index, number in enumerate(columns["truck_numbers"])}
+        return SimulationState(self.time, trucks, dict(zip(columns["distance_trucks"], columns["distances"])),
+                               packages.lookup_many(columns["waiting"]), packages.lookup_many(columns["delayed"]))
+
+    # Builds the event log, so the day can still be looked up at any other time
+    def to_log(self) -> EventLog | None:
+        """
+        Builds the event log saved with the snapshot. Like to_packages, this is most of the cost of a
+        restore, about 4 seconds for a million packages.
+        Returns:
+            EventLog | None: Finished event log, or None if the snapshot doesn't have one.
+        """
+        if not self.has_log:
+            return None
+
+        columns = self.columns
+        addresses = self.addresses
+        with _collector_paused():
+            log = EventLog(self.speed)
+            for (package_id, status, address, deadline, corrected_address, available, correction, load, load_order,
+                 truck, depart, deliver) in zip(*(columns[name] for name, _ in _TIMELINE_SECTIONS)):
+                timeline = PackageTimeline.__new__(PackageTimeline)
+                timeline.original_status = _STATUSES[status]
+                timeline.original_address = addresses[address]
+                timeline.original_deadline = deadline
+                timeline.corrected_address = addresses[corrected_address] if corrected_address != -1 else None
+                timeline.available = available
+                timeline.correction = correction
+                timeline.load = load
+                timeline.load_order = load_order
+                timeline.truck = truck
+                timeline.depart = depart
+                timeline.deliver = deliver
+                log.timelines[package_id] = timeline
+
+            events = zip(*(columns[name] for name, _ in _EVENT_SECTIONS))
+            log.events = [Event(time, _EVENT_KINDS[kind], truck, package_id, miles)
+                          for time, kind, truck, package_id, miles in events]
+            log.load_count = columns["event_kind"].count(EventKind.LOAD)
+            log.finish()
+        return log
+
+
+# Records the packages, trucks, and event log at the time of a state
+def capture(packages: PackageRepository, state: SimulationState, log: EventLog | None = None) -> Snapshot:
+    """
+    Takes a full snapshot. The packages should be the ones state was built from.
+    Args:
+        packages (PackageRepository): Every package.
+        state (SimulationState): Trucks, mileage, and hub lists. Its time is the snapshot's time.
+        log (EventLog | None): Finished event log to save with it. None leaves it out.
+    Returns:
+        Snapshot: Full snapshot.
+    """
+    snapshot = Snapshot(state.time, speed=log.speed if log is not None else 0.0, has_log=log is not None)
+    columns = snapshot.columns
+    values = list(packages.values())
+    for name, typecode in PACKAGE_COLUMNS:
+        fields = map(attrgetter(name), values)
+        if name in _STRING_COLUMNS:
+            columns[name] = snapshot._indexes(list(fields), snapshot._string)
+        elif name == "group_ids":
+            columns[name] = snapshot._indexes(list(fields), snapshot._group)
+        elif name == "corrected_address":
+            columns[name] = snapshot._indexes(list(fields), snapshot._address)
+        else:
+            columns[name] = array(typecode, fields)
+
+    offsets = array("i", [0])
+    for number, loaded in state.trucks.items():
+        columns["truck_numbers"].append(number)
+        columns["truck_packages"].extend(package.id for package in loaded)
+        offsets.append(len(columns["truck_packages"]))
+    columns["truck_offsets"] = offsets
+    columns["distance_trucks"].extend(state.distances)
+    columns["distances"].extend(state.distances.values())
+    columns["waiting"].extend(package.id for package in state.waiting)
+    columns["delayed"].extend(package.id for package in state.delayed)
+
+    if log is not None:
+        timelines = list(log.timelines.values())
+        columns["timeline_id"].extend(log.timelines)
+        for name, field in (("original_status", "original_status"), ("original_address", "original_address"),
+                            ("original_deadline", "original_deadline"),
+                            ("timeline_corrected_address", "corrected_address"), ("available", "available"),
+                            ("correction", "correction"), ("load", "load"), ("load_order", "load_order"),
+                            ("timeline_truck", "truck"), ("depart", "depart"), ("deliver", "deliver")):
+            fields = map(attrgetter(field), timelines)
+            if field.endswith("address"):
+                columns[name] = snapshot._indexes(list(fields), snapshot._address)
+            else:
+                columns[name].extend(fields)
+        for name, field in (("event_time", "time"), ("event_kind", "kind"), ("event_truck", "truck"),
+                            ("event_package", "package_id"), ("event_miles", "miles")):
+            columns[name].extend(map(attrgetter(field), log.events))
+
+    return snapshot
+
+
+# Returns a full snapshot with its packages put in another order
+def _in_order(snapshot: Snapshot, ids: array) -> Snapshot:
+    """
+    Reorders the package columns of a full snapshot to follow ids. The tables are shared, not copied.
+    Args:
+        snapshot (Snapshot): Snapshot to reorder.
+        ids (array): Package ids in the order wanted.
+    Returns:
+        Snapshot: Reordered snapshot with the same id.
+    Raises:
+        ValueError: If the snapshot doesn't hold exactly the packages in ids.
+    """
+    rows = {package_id: row for row, package_id in enumerate(snapshot.columns["id"])}
+    if len(rows) != len(ids) or not all(package_id in rows for package_id in ids):
+        raise ValueError("The snapshots don't hold the same packages")
+
+    order = [rows[package_id] for package_id in ids]
+    reordered = Snapshot(snapshot.time, snapshot_id=snapshot.snapshot_id, speed=snapshot.speed,
+                         has_log=snapshot.has_log)
+    reordered.columns = dict(snapshot.columns)
+    for name, typecode in PACKAGE_COLUMNS:
+        column = snapshot.columns[name]
+        reordered.columns[name] = array(typecode, map(column.__getitem__, order))
+    reordered.strings, reordered._string_index = snapshot.strings, snapshot._string_index
+    reordered.addresses, reordered._address_index = snapshot.addresses, snapshot._address_index
+    reordered.groups, reordered._group_index = snapshot.groups, snapshot._group_index
+    return reordered
+
+
+# Builds an incremental snapshot holding only the packages that changed since the parent
+def diff(parent: Snapshot, current: Snapshot) -> Snapshot:
+    """
+    Compares two snapshots of the same packages and keeps each package that has any field different
+    in current, usually because its status changed. The trucks and hub lists only hold package ids,
+    so they're copied whole. The event log doesn't change once the day is simulated, so it's left to
+    the full snapshot at the start of the chain.
+    Args:
+        parent (Snapshot): Full snapshot the incremental one is taken against.
+        current (Snapshot): Full snapshot of the later state. The incremental snapshot gets its id.
+    Returns:
+        Snapshot: Incremental snapshot.
+    Raises:
+        ValueError: If either snapshot is incremental or they don't hold the same packages.
+    """
+    if parent.incremental or current.incremental:
+        raise ValueError("Snapshots can only be diffed against full snapshots")
+
+    # Packages captured from the same repository come out in the same order, so usually they can be
+    # compared row for row straight away
+    if parent.columns["id"] != current.columns["id"]:
+        current = _in_order(current, parent.columns["id"])
+
+    # Columns that point into tables can only be compared index for index if both tables are the same.
+    # Otherwise they're compared by value. The None at the end of the address tables is what -1 points to.
+    tables = {"group_ids": (parent.groups, current.groups),
+              "corrected_address": (parent.addresses + [None], current.addresses + [None])}
+    tables.update(dict.fromkeys(_STRING_COLUMNS, (parent.strings, current.strings)))
+    changed = set()
+    for name, _ in PACKAGE_COLUMNS:
+        old = parent.columns[name]
+        new = current.columns[name]
+        old_table, new_table = tables.get(name, ((), ()))
+        if old_table != new_table:
+            changed.update(row for row, (before, after) in enumerate(zip(old, new))
+                           if old_table[before] != new_table[after])
+        elif old != new:
+            changed.update(row for row, (before, after) in enumerate(zip(old, new)) if before != after)
+
+    rows = sorted(changed)
+    snapshot = Snapshot(current.time, incremental=True, snapshot_id=current.snapshot_id,
+                        parent_id=parent.snapshot_id)
+    snapshot._copy_rows(current, rows)
+    snapshot.columns["row"] = array("i", rows)
+    for name, typecode in _STATE_SECTIONS:
+        snapshot.columns[name] = array(typecode, current.columns[name])
+    return snapshot
+
+
+# Applies an incremental snapshot to its parent
+def merge(parent: Snapshot, incremental: Snapshot) -> Snapshot:
+    """
+    Builds the full snapshot an incremental one stands for. The parent is changed in place and returned.
+    Args:
+        parent (Snapshot): Full snapshot the incremental one was taken against.
+        incremental (Snapshot): Incremental snapshot.
+    Returns:
+        Snapshot: The parent, now at the incremental snapshot's time and with its id.
+    Raises:
+        ValueError: If the incremental snapshot wasn't taken against parent.
+    """
+    if parent.incremental or not incremental.incremental or incremental.parent_id != parent.snapshot_id:
+        raise ValueError("The incremental snapshot wasn't taken against the snapshot before it")
+
+    changes = Snapshot(incremental.time)
+    changes.strings, changes._string_index = parent.strings, parent._string_index
+    changes.addresses, changes._address_index = parent.addresses, parent._address_index
+    changes.groups, changes._group_index = parent.groups, parent._group_index
+    changes._copy_rows(incremental, range(len(incremental)))
+
+    rows = incremental.columns["row"]
+    for name, _ in PACKAGE_COLUMNS:
+        target = parent.columns[name]
+        for row, value in zip(rows, changes.columns[name]):
+            target[row] = value
+
+    for name, typecode in _STATE_SECTIONS:
+        parent.columns[name] = array(typecode, incremental.columns[name])
+    parent.time = incremental.time
+    parent.snapshot_id = incremental.snapshot_id
+    return parent
+
+
+# Saves a snapshot to a file
+def write_snapshot(filename: str, snapshot: Snapshot) -> None:
+    """
+    Writes the header, the length of every section, and then the sections, each padded to 8 bytes.
+    The strings are saved NUL separated, and the tables are flattened into arrays.
+    Args:
+        filename (str): Path to write.
+        snapshot (Snapshot): Snapshot to save.
+    Raises:
+        OSError: If the file can't be written.
+    """
+    strings = snapshot._string_index
+    columns = dict(snapshot.columns)
+    columns["strings"] = array("B", "\0".join(snapshot.strings).encode("utf-8"))
+    columns["address_table"] = array("i", [value for address, city, state, zip_code in snapshot.addresses
+                                           for value in (strings[address], strings[city], strings[state], zip_code)])
+    offsets = array("i", [0])
+    members = array("i")
+    for group in snapshot.groups:
+        members.extend(group)
+        offsets.append(len(members))
+    columns["group_offsets"] = offsets
+    columns["group_members"] = members
+
+    sections = [columns[name] for name, _ in SECTIONS]
+    lengths = [len(section) * section.itemsize for section in sections]
+    chunks = [_HEADER.pack(_MAGIC, snapshot.incremental, snapshot.has_log, _BYTE_ORDER, snapshot.snapshot_id,
+                           snapshot.parent_id, snapshot.time, snapshot.speed, len(sections)),
+              struct.pack("<" + str(len(sections)) + "Q", *lengths)]
+    for section, length in zip(sections, lengths):
+        chunks.append(section)
+        chunks.append(bytes(-length % 8))
+
+    write_atomically(filename, chunks)
+
+
+# Reads a snapshot file with one read
+def read_snapshot(filename: str) -> Snapshot:
+    """
+    Reads a whole snapshot file at once and copies each section straight into its array.
+    Args:
+        filename (str): Path to the snapshot.
+    Returns:
+        Snapshot: Snapshot as it was saved.
+    Raises:
+        OSError: If the file can't be read.
+        ValueError: If the file isn't a snapshot or is cut short.
+    """
+    with open(filename, mode='rb') as file:
+        data = memoryview(file.read())
+
+    if len(data) < _HEADER.size:
+        raise ValueError("\"" + filename + "\" isn't a snapshot")
+
+    magic, incremental, has_log, byte_order, snapshot_id, parent_id, time, speed, count = _HEADER.unpack_from(data)
+    lengths_end = _HEADER.size + 8 * count
+    if magic != _MAGIC or count != len(SECTIONS) or len(data) < lengths_end:
+        raise ValueError("\"" + filename + "\" isn't a snapshot this version can read")
+
+    snapshot = Snapshot(time, incremental, snapshot_id, parent_id, speed, has_log)
+    offset = lengths_end
+    for (name, typecode), length in zip(SECTIONS, struct.unpack_from("<" + str(count) + "Q", data, _HEADER.size)):
+        if offset + length > len(data):
+            raise ValueError("\"" + filename + "\" is cut short")
+
+        section = snapshot.columns[name]
+        section.frombytes(data[offset:offset + length])
+        if byte_order != _BYTE_ORDER and section.itemsize > 1:
+            section.byteswap()
+        offset += length + (-length % 8)
+
+    columns = snapshot.columns
+    snapshot.strings = bytes(columns.pop("strings")).decode("utf-8").split("\0") if columns["strings"] else []
+    snapshot._string_index = {value: index for index, value in enumerate(snapshot.strings)}
+    table = columns.pop("address_table")
+    strings = snapshot.strings
+    snapshot.addresses = [(strings[table[index]], strings[table[index + 1]], strings[table[index + 2]],
+                           table[index + 3]) for index in range(0, len(table), 4)]
+    snapshot._address_index = {value: index for index, value in enumerate(snapshot.addresses)}
+    offsets = columns.pop("group_offsets")
+    members = columns.pop("group_members")
+    snapshot.groups = [tuple(members[offsets[index]:offsets[index + 1]]) for index in range(len(offsets) - 1)]
+    snapshot._group_index = {value: index for index, value in enumerate(snapshot.groups)}
+    for name, typecode in _TABLE_SECTIONS:
+        columns[name] = array(typecode)
+    return snapshot
+
+
+# Reads a full snapshot and the chain of incremental snapshots taken after it
+def restore(filenames: Sequence[str]) -> Snapshot:
+    """
+    Reads a full snapshot and applies each incremental snapshot after it in order.
+    Args:
+        filenames (Sequence[str]): Full snapshot first, then its incremental snapshots oldest first.
+    Returns:
+        Snapshot: Full snapshot of the state at the last file.
+    Raises:
+        OSError: If a file can't be read.
+        ValueError: If a file isn't a snapshot, the first one isn't full, or the chain is broken.
+    """
+    if not filenames:
+        raise ValueError("No snapshot to restore")
+
+    snapshot = read_snapshot(filenames[0])
+    if snapshot.incremental:
+        raise ValueError("\"" + filenames[0] + "\" is an incremental snapshot. Restore its full snapshot first.")
+
+    for filename in filenames[1:]:
+        incremental = read_snapshot(filename)
+        if not incremental.incremental or incremental.parent_id != snapshot.snapshot_id:
+            raise ValueError("\"" + filename + "\" wasn't taken against the snapshot before it")
+
+        merge(snapshot, incremental)
+
+    return snapshot
@@ -13,23 +13,89 @@ Handles user interaction, package loading, truck routing, and delivery simulatio
 
 # Standard Library
 import datetime
-from typing import List, Tuple
+import sys
 
 # Created Imports
-import Graph
-import Package
+import Clock
+import Instrument
+import Simulation
+import Snapshot
+from Context import RoutingContext
+from HashTable import HashTable
+from Package import Package, PackageStatus
 
 # Our constants
 MAX_BINS = 10
 MAX_PACKAGES_PER_TRUCK = 16
 TRUCK_SPEED = 18
+NUM_TRUCKS = 3
+NUM_DRIVERS = 2
 
-# Create our graph and address dictionaries from the distance table
-graph, address_to_ids, ids_to_address = Graph.read_distances_to_graph("WGUPS Distance Table.csv")
+# Most total weight, in kg, a truck can carry. Infinity means only the package count limits a truck.
+MAX_WEIGHT_PER_TRUCK = float("inf")
+
+# Improves each truck's nearest-neighbor route with 2-opt and Or-opt before it leaves the hub.
+# ROUTE_MOVE_BUDGET is the most moves the local search may make on one route, so the same day always
+# plans the same routes. ROUTE_TIME_LIMIT, in seconds, stops it early as a safety cap. None turns it off.
+IMPROVE_ROUTES = True
+ROUTE_MOVE_BUDGET = 1000
+ROUTE_TIME_LIMIT = None
+
+# Builds each truck's route by cheapest insertion that never makes a package miss its deadline,
+# instead of nearest-neighbor. The local search above still runs on the result.
+INSERTION_ROUTES = True
+
+# Number of randomized starts the multi-start optimizer runs in parallel for each route.
+# 0 plans every route in this process with a single nearest-neighbor start.
+MULTI_START_SEEDS = 0
+
+# Partitions the packages at the hub into clusters of nearby stops with k-medoids before loading,
+# so each truck covers one part of the city. Off loads them in plain deadline order.
+CLUSTER_PACKAGES = False
+
+# Loads the distance table from a binary copy in CACHE_DIRECTORY, memory-mapped instead of parsed.
+# The copy is written the first time and again only when the CSV changes.
+BINARY_DISTANCES = True
+
+# Routes on shortest-path distances instead of the table's direct distances, which don't always
+# follow the triangle inequality. The closure is cached in CACHE_DIRECTORY by the table's contents.
+# Building it takes O(n^3) time for n addresses, so it's only worth it for small or incomplete tables.
+SHORTEST_PATHS = False
+CACHE_DIRECTORY = ".cache"
+
+# Most planned routes remembered, so a truck load leaving again at the same time isn't planned twice.
+# 0 turns the cache off.
+ROUTE_CACHE_SIZE = 256
+
+# Number of upcoming deadlines the print command lists
+NEXT_DEADLINES = 5
+
+# The data files the program reads
+DISTANCE_FILE = "WGUPS Distance Table.csv"
+PACKAGE_FILE = "WGUPS Package File.csv"
+
+
+# Prints a warning for a package its planned route will deliver late
+def print_late_warning(package: Package) -> None:
+    """
+    Prints that a package will miss its deadline on the route planned for its truck.
+    Args:
+        package (Package): Package the route will deliver late.
+    """
+    print("Warning: package " + str(package.id) + " will miss its " + str(package.deadline.hour).zfill(2) + ":"
+          + str(package.deadline.minute).zfill(2) + " deadline on the route planned for truck "
+          + str(package.truck) + ".")
+
+
+# Routing data and settings. Nothing is read until the program first needs it, so importing this module is cheap.
+context = RoutingContext(DISTANCE_FILE, PACKAGE_FILE, CACHE_DIRECTORY, MAX_PACKAGES_PER_TRUCK, TRUCK_SPEED,
+                         NUM_TRUCKS, NUM_DRIVERS, MAX_WEIGHT_PER_TRUCK, IMPROVE_ROUTES, ROUTE_MOVE_BUDGET,
+                         INSERTION_ROUTES, MULTI_START_SEEDS, CLUSTER_PACKAGES, SHORTEST_PATHS, BINARY_DISTANCES,
+                         print_late_warning, ROUTE_CACHE_SIZE, ROUTE_TIME_LIMIT)
 
 # Set our start and current time
-start_time = "08:00"
-start_of_day = datetime.datetime.strptime(start_time, "%H:%M")
+start_of_day = Clock.to_datetime(Clock.parse_seconds("08:00"))
+end_of_day = Clock.to_datetime(Clock.END_OF_DAY_MINUTES * 60)
 current_time = start_of_day
 
 # prints the help menu containing all the possible commands
@@ -51,13 +117,14 @@ def print_menu() -> None:
     print("\t- truck <number>         Prints truck info")
     print("\t- package <id>           Prints packages info")
     print("\t- print                  Prints everything")
+    print("\t- checkpoint <file>      Saves the day to a snapshot file")
     print("\t- quit                   Quit this program")
     print()
 
 
 def get_input() -> list[str]:
     """
-    Reads a line from user input, splits it into a list by whitespace, and transforms commands to lowercase.
+    Reads a line from user input, splits it into a list by whitespace, and transforms the command to lowercase.
     Returns:
         list[str]: List of command arguments.
     """
@@ -70,8 +137,8 @@ def get_input() -> list[str]:
             print()
             line = input("===> ").split()
 
-        for position in range(len(line)):
-            line[position] = line[position].lower()
+        # Only the command is lowercased, so file names keep their case
+        line[0] = line[0].lower()
 
         return line
     except (EOFError, KeyboardInterrupt):
@@ -132,8 +199,8 @@ def change_time(time_input: list[str], time_to_change: datetime.datetime) -> dat
 
         # Converts the time to a new datetime object then makes sure the time is in a range between the start
         # of day and end of day.
-        new_time = datetime.datetime.strptime(time_input[1], "%H:%M")
-        if new_time < start_of_day or new_time > datetime.datetime.strptime("17:00", "%H:%M"):
+        new_time = Clock.to_datetime(Clock.parse_seconds(time_input[1]))
+        if new_time < start_of_day or new_time > end_of_day:
             new_time = time_to_change
             print("Please enter a time between 08:00 and 17:00\n")
 
@@ -151,153 +218,109 @@ def change_time(time_input: list[str], time_to_change: datetime.datetime) -> dat
     return new_time
 
 
-# The main algorithm we use to find our next package location.
-def find_next_location(current_truck: List[Package], current_location: int) -> Tuple[int, float, Package]:
+# Returns the lowest and highest package ids as "<low> and <high>" for the help messages
+def package_id_range(hash_table: HashTable) -> str:
     """
-    Finds the next closest package location for delivery.
+    Returns the lowest and highest package ids in the hash table.
     Args:
-        current_truck (List[Package]): List of packages on the truck.
-        current_location (int): Current location ID.
+        hash_table (HashTable): Hash table of packages.
     Returns:
-        Tuple[int, float, Package]: Next location ID, distance, and package to deliver.
+        str: "<low> and <high>", or "1 and 0" if there are no packages.
     """
-    # next_location holds the index of our next location from our graph.
-    # closest_distance with hold the mileage of the closest location, it's set to infinity to ensure any distance is closer.
-    # package_to_deliver is the package of the closest location which we return to deliver.
-    next_location = 0
-    closest_distance = float("inf")
-    package_to_deliver: Package = None
-
-    # Loop through each package left in the truck
-    for next_package in current_truck:
-
-        # If a path between the current location and the next address exists and the distance between location is
-        # less then the current closest distance, then we update all of our variables
-        if graph.has_edge(current_location, address_to_ids[next_package.address]) and graph.get_edge(current_location,
-                                                                                                     address_to_ids[
-                                                                                                         next_package.address]) < closest_distance:
-            closest_distance = graph.get_edge(current_location, address_to_ids[next_package.address])
-            next_location = address_to_ids[next_package.address]
-            package_to_deliver = next_package
-
-    return next_location, closest_distance, package_to_deliver
-
-
-# Delivers packages from the current truck starting from a start time and ending deliveries when
-# the finish time specified is reached.
-def deliver_packages(current_truck: List[Package], start_run: datetime.datetime,
-                     finish_time: datetime.datetime) -> Tuple[float, bool, datetime.datetime]:
+    if not hash_table:
+        return "1 and 0"
+
+    return str(min(hash_table)) + " and " + str(max(hash_table))
+
+
+# Loads the day from a full snapshot and the incremental snapshots taken after it
+def restore_day(filenames: list[str]) -> tuple[HashTable, Simulation.EventLog, Simulation.SimulationState,
+                                               Snapshot.Snapshot]:
     """
-    Delivers packages from the current truck, simulating delivery until finish_time is reached.
+    Restores the packages, trucks, event log, and time saved by the checkpoint command.
     Args:
-        current_truck (List[Package]): List of packages on the truck.
-        start_run (datetime.datetime): Start time of delivery run.
-        finish_time (datetime.datetime): Time to stop delivery simulation.
+        filenames (list[str]): Full snapshot first, then its incremental snapshots oldest first.
     Returns:
-        Tuple[float, bool, datetime.datetime]: Total distance traveled, whether truck is at hub, and current time.
+        tuple[HashTable, Simulation.EventLog, Simulation.SimulationState, Snapshot.Snapshot]: Packages,
+        event log, state at the saved time, and the restored snapshot for the next checkpoint to build on.
+    Raises:
+        OSError: If a file can't be read.
+        ValueError: If a file isn't a snapshot, the chain is broken, or it has no event log.
     """
-    # Safety check: if start_run >= finish_time, return immediately
-    if start_run >= finish_time:
-        return 0.0, True, start_run
-    
-    # Safety check: if no packages, return immediately
-    if not current_truck:
-        return 0.0, True, start_run
-    # Change the status of all trucks to en route
-    for next_package in current_truck:
-        next_package.status = "En route"
-
-    # The truck starts at the hub.
-    # Truck time is the time elapsed since start_run
-    truck_location = address_to_ids["HUB"]
-    distance = 0.0
-    truck_time: datetime.datetime = start_run
-    done_deliveries = False
-
-    # While we have packages to deliver, continue to deliver packages.
-    while current_truck and not done_deliveries:
-        truck_location, next_distance, package_to_deliver = find_next_location(current_truck, truck_location)
-
-        if not package_to_deliver:
-            break
+    snapshot = Snapshot.restore(filenames)
+    log = snapshot.to_log()
+    if log is None:
+        raise ValueError("\"" + filenames[0] + "\" doesn't have an event log")
 
-        # Makes sure the truck isn't at the hub
-        if truck_location != 0:
-            delivery_time = truck_time + datetime.timedelta(minutes=(next_distance / (TRUCK_SPEED / 60)))
-
-            # If our current time is less than the finish time:
-            # - set package delivery time
-            # - set package delivery time to Delivered
-            # - update the trucks current time
-            # - remove the package from the truck
-            # - add the distance traveled to our total distance
-            if delivery_time <= finish_time:
-                package_to_deliver.delivery_time = delivery_time
-                package_to_deliver.status = "Delivered"
-                truck_time = delivery_time
-                current_truck.remove(package_to_deliver)
-                distance += next_distance
-
-            # If the delivery time exceeds the finish time, then the truck is en route to another location but
-            # can't reach the delivery location before the finish time:
-            # - calculate the time left between the current time and finish time
-            # - add the distance the truck traveled so far
-            # - we're delivering
-            elif current_truck:
-                interim_time = (finish_time - truck_time) / datetime.timedelta(minutes=60)
-                distance += TRUCK_SPEED * interim_time
-                done_deliveries = True
-
-    # Get the distance from the current location to the Hub and calculate the time
-    next_distance = graph.get_edge(truck_location, address_to_ids["HUB"])
-    time = truck_time + datetime.timedelta(minutes=(next_distance / (TRUCK_SPEED / 60)))
-    at_hub = False
-
-    # Check if the truck is empty
-    if not current_truck:
-
-        # If the time to get to the Hub is less than the finish time, then we made
-        # it to the hub after delivering all the packages
-        if time < finish_time:
-            distance += next_distance
-            at_hub = True
-
-        # Otherwise, we're still traveling to the Hub, but we won't make it back
-        # before the finish time, so we get the distance traveled so far.
+    hash_table = snapshot.to_packages(context.address_to_ids)
+    return hash_table, log, snapshot.to_state(hash_table), snapshot
+
+
+# Saves the day to a snapshot file. The first one is full, and each one after it only holds the
+# packages that changed since the one before.
+def save_checkpoint(checkpoint_input: list[str], hash_table: HashTable, state: Simulation.SimulationState,
+                    log: Simulation.EventLog, previous: Snapshot.Snapshot | None) -> Snapshot.Snapshot | None:
+    """
+    Saves a checkpoint.
+    Args:
+        checkpoint_input (list[str]): Command arguments for checkpoint.
+        hash_table (HashTable): Hash table of packages.
+        state (Simulation.SimulationState): Trucks and hub at the current time.
+        log (Simulation.EventLog): Event log of the day.
+        previous (Snapshot.Snapshot | None): Snapshot of the last checkpoint, or None if there isn't one yet.
+    Returns:
+        Snapshot.Snapshot | None: Snapshot of the new checkpoint, or previous if nothing was saved.
+    """
+    if len(checkpoint_input) != 2:
+        print("checkpoint requires one argument.")
+        print("Please enter as \"checkpoint <file>\"")
+        return previous
+
+    current = Snapshot.capture(hash_table, state, log)
+    try:
+        if previous is None:
+            Snapshot.write_snapshot(checkpoint_input[1], current)
+            print("Saved a full snapshot of " + str(len(current)) + " packages to " + checkpoint_input[1])
         else:
-            interim_time = (finish_time - truck_time) / datetime.timedelta(minutes=60)
-            distance += TRUCK_SPEED * interim_time
+            changes = Snapshot.diff(previous, current)
+            Snapshot.write_snapshot(checkpoint_input[1], changes)
+            print("Saved " + str(len(changes)) + " changed packages to " + checkpoint_input[1])
+    except (OSError, ValueError) as error:
+        print("Couldn't save the checkpoint: " + str(error))
+        return previous
+
+    return current
 
-    return distance, at_hub, time
 
 def main():
     """
     Main entry point for the WGUPS Routing Program. Handles user interaction and simulation loop.
     """
-    # Create the initial hash table, graph, address to id dict, and id to address dict
+    # Turn on timers and counters if WGUPS_PROFILE or --profile asks for them
     global current_time
-    hash_table = Package.read_packages("WGUPS Package File.csv")
-
-    # Initialize distances to 0
-    truck_1_distance = 0.0
-    truck_2_distance = 0.0
-    truck_3_distance = 0.0
-    total_distance = 0.0
+    arguments = Instrument.configure(sys.argv[1:])
 
-    # Separate normal and constrained packages
-    normal_packages, constrained_packages = Package.separate_packages(hash_table)
+    # "--restore <full snapshot> [<incremental snapshot> ...]" picks the day up where a checkpoint left it
+    checkpoint = None
+    if arguments and arguments[0] == "--restore":
+        try:
+            hash_table, log, state, checkpoint = restore_day(arguments[1:])
+        except (OSError, ValueError) as error:
+            sys.exit("Couldn't restore the snapshot: " + str(error))
 
-    # Filter packages into the three trucks
-    truck_1, truck_2, truck_3 = Package.filter_constrained_packages(normal_packages, constrained_packages,
-                                                                    hash_table,
-                                                                    MAX_PACKAGES_PER_TRUCK)
+        current_time = Clock.to_datetime(int(state.time))
 
-    # Sort the packages by deadline so the packages with the shortest deadline get loaded first.
-    normal_packages.sort(key=lambda package_to_sort: package_to_sort.deadline)
+    else:
+        # Create the initial hash table, which loads the graph and address dicts the first time
+        hash_table = context.read_packages()
 
-    # Load truck 1 and 2
-    truck_1 = Package.load_truck(truck_1, normal_packages, MAX_PACKAGES_PER_TRUCK)
-    truck_2 = Package.load_truck(truck_2, normal_packages, MAX_PACKAGES_PER_TRUCK)
+        # Simulate the whole day once, recording it in the event log. Changing the time afterwards
+        # rebuilds the packages and trucks from the log instead of simulating the day again.
+        log = Simulation.EventLog(TRUCK_SPEED)
+        log.capture(hash_table)
+        context.simulate_day(hash_table, start_of_day, end_of_day, log)
+        log.finish()
+        state = log.apply(hash_table, Clock.to_seconds(current_time))
 
     done = False
     while not done:
@@ -322,123 +345,8 @@ def main():
             else:
                 current_time = change_time(user_input, current_time)
 
-            # Reset all packages, trucks, and the hash table
-            normal_packages.clear()
-            constrained_packages.clear()
-
-            truck_1.clear()
-            truck_2.clear()
-            truck_3.clear()
-
-            hash_table = Package.read_packages("WGUPS Package File.csv")
-
-            # Reseparate and filter the packages
-            normal_packages, constrained_packages = Package.separate_packages(hash_table)
-
-            truck_1, truck_2, truck_3 = Package.filter_constrained_packages(normal_packages, constrained_packages,
-                                                                            hash_table,
-                                                                            MAX_PACKAGES_PER_TRUCK)
-
-            # Sort packages based on deadline and load them into truck 1 and 2
-            normal_packages.sort(key=lambda package_to_sort: package_to_sort.deadline)
-            truck_1 = Package.load_truck(truck_1, normal_packages, MAX_PACKAGES_PER_TRUCK)
-            truck_2 = Package.load_truck(truck_2, normal_packages, MAX_PACKAGES_PER_TRUCK)
-
-            # Send both trucks out to deliver packages (only if current_time is after start_of_day)
-            if current_time > start_of_day:
-                truck_1_distance, truck_1_at_hub, truck_1_time = deliver_packages(truck_1, start_of_day, current_time)
-                truck_2_distance, truck_2_at_hub, truck_2_time = deliver_packages(truck_2, start_of_day, current_time)
-            else:
-                # At start of day, trucks haven't moved yet
-                truck_1_distance, truck_1_at_hub, truck_1_time = 0.0, True, start_of_day
-                truck_2_distance, truck_2_at_hub, truck_2_time = 0.0, True, start_of_day
-
-            # If the current time given is different then the start of day, we check if the delayed or package with
-            # the wording address are at the Hub
-            if current_time > start_of_day:
-                for package in list(constrained_packages):
-                    if package.status == "Delayed" or package.status == "Updating Address":
-
-                        # Get the time specified in the special notes
-                        time_string = package.special_notes.split()
-                        arrival_time = datetime.datetime.strptime(time_string[1] + " " + time_string[2], "%I:%M %p")
-
-                        # If the time the user gave is after the arrival time of the package, we update the status and
-                        # add the package to normal packages
-                        if arrival_time <= current_time:
-
-                            # This updates the address for the package with the wrong address
-                            if package.status == "Updating Address":
-                                package.address = "410 S State St"
-                                package.city = "Salt Lake City"
-                                package.state = "UT"
-                                package.zip_code = 84111
-
-                            # Set a new deadline and status
-                            package.deadline = datetime.datetime.strptime("5:00 pm", "%I:%M %p")
-                            package.status = "At the Hub"
-                            normal_packages.append(package)
-                            constrained_packages.remove(package)
-
-            # If truck 1 made it back to the hub, we load it with the available packages and send it back out
-            if truck_1_at_hub:
-                leftover_packages = []
-
-                # Iterate over all the unconstrained packages
-                for package in list(normal_packages):
-
-                    # If it was arriving late we check to make sure the truck made it back to the hub
-                    # after the package got to the hub
-                    if "Arriving" in package.special_notes:
-                        time_string = package.special_notes.split()
-                        arrival_time = datetime.datetime.strptime(time_string[1] + " " + time_string[2], "%I:%M %p")
-                        if truck_1_time >= arrival_time:
-                            leftover_packages.append(package)
-                            normal_packages.remove(package)
-
-                    # Otherwise, add it to the packages to load into truck 3
-                    else:
-                        leftover_packages.append(package)
-                        normal_packages.remove(package)
-
-                # Load truck 3 with the available packages leftover
-                truck_3 = Package.load_truck(truck_3, leftover_packages, MAX_PACKAGES_PER_TRUCK)
-
-                # If truck 3 has packages, we send it out to deliver them
-                if truck_3:
-                    truck_3_distance, truck_3_at_hub, truck_3_time = deliver_packages(truck_3, truck_1_time, current_time)
-
-            # If truck 2 made it back to the hub, we load it with the available packages and send it back out
-            if truck_2_at_hub:
-                leftover_packages = []
-
-                # Iterate over all the unconstrained packages
-                for package in list(normal_packages):
-
-                    # If it was arriving late we check to make sure the truck made it back to the hub
-                    # after the package got to the hub
-                    if "Arriving" in package.special_notes:
-                        time_string = package.special_notes.split()
-                        arrival_time = datetime.datetime.strptime(time_string[1] + " " + time_string[2], "%I:%M %p")
-                        if truck_2_time >= arrival_time:
-                            leftover_packages.append(package)
-                            normal_packages.remove(package)
-
-                    # Otherwise, add it to the packages to load into truck 1
-                    else:
-                        leftover_packages.append(package)
-                        normal_packages.remove(package)
-
-                # Load truck 1 with the available packages leftover
-                truck_1 = Package.load_truck(truck_1, leftover_packages, MAX_PACKAGES_PER_TRUCK)
-
-                # If truck 1 has packages, we send it out to deliver them
-                if truck_1:
-                    truck_1_distance2, truck_1_at_hub, truck_1_time = deliver_packages(truck_1, truck_2_time, current_time)
-                    truck_1_distance += truck_1_distance2
-
-            # Add the distances together for the total
-            total_distance = truck_1_distance + truck_2_distance + truck_3_distance
+            # Set every package and truck to how they were at the new time
+            state = log.apply(hash_table, Clock.to_seconds(current_time))
 
         # Prints the specified package
         elif user_input[0] == "package":
@@ -452,19 +360,25 @@ def main():
                     if not user_input[1][i].isdigit():
                         is_valid = False
 
-                # verify the number is between 1 and the number of keys in the hash table
-                if is_valid and hash_table.num_keys >= int(user_input[1]) >= 1:
-                    print(hash_table.lookup(int(user_input[1])))
+                # verify a package with that id exists in the hash table
+                if is_valid and int(user_input[1]) in hash_table:
+                    package = hash_table.lookup(int(user_input[1]))
+                    print(package)
+
+                    # Find the other packages going to the same address from the address index
+                    others = [other.id for other in hash_table.at_address(package.address) if other.id != package.id]
+                    if others:
+                        print("- Also going to this address: " + ", ".join(str(other_id) for other_id in others))
 
                 # The user didn't give a valid id
                 else:
                     print("\"" + str(user_input[1]) + "\" is not a valid package id.")
-                    print("Please enter \"package <id>\" with an <id> between 1 and " + str(hash_table.num_keys) + ".")
+                    print("Please enter \"package <id>\" with an <id> between " + package_id_range(hash_table) + ".")
 
             # The user didn't give one argument
             else:
                 print("package requires one argument.")
-                print("Please enter \"package <id>\" with an <id> between 1 and " + str(hash_table.num_keys) + ".")
+                print("Please enter \"package <id>\" with an <id> between " + package_id_range(hash_table) + ".")
 
             print()
 
@@ -480,23 +394,17 @@ def main():
                     if not user_input[1][i].isdigit():
                         is_valid = False
 
-                # verify the number is between 1 and 3
-                if is_valid and 3 >= int(user_input[1]) >= 1:
+                # verify the number is between 1 and the number of trucks
+                if is_valid and NUM_TRUCKS >= int(user_input[1]) >= 1:
                     print("Truck " + user_input[1])
-                    if user_input[1] == "1":
-                        truck = truck_1
-                        truck_distance = truck_1_distance
-
-                    elif user_input[1] == "2":
-                        truck = truck_2
-                        truck_distance = truck_2_distance
-
-                    else:
-                        truck = truck_3
-                        truck_distance = truck_3_distance
+                    truck = state.trucks.get(int(user_input[1]), [])
+                    truck_distance = state.distances.get(int(user_input[1]), 0.0)
 
-                    # Print the truck mileage and packages left to deliver.
+                    # Print the truck mileage, the packages it has delivered, and the packages left to deliver.
+                    delivered = [package for package in hash_table.on_truck(int(user_input[1]))
+                                 if package.status == PackageStatus.DELIVERED]
                     print(f"- Current distance: {truck_distance:.1f} miles")
+                    print("- Packages delivered: " + str(len(delivered)))
                     print("- Packages to deliver: " + str(len(truck)))
                     for package in truck:
                         print(package)
@@ -504,12 +412,12 @@ def main():
                 # The user didn't give a valid truck number
                 else:
                     print("\"" + str(user_input[1]) + "\" is not a valid truck number.")
-                    print("Please enter \"truck <number>\" with an <number> between 1 and 3.")
+                    print("Please enter \"truck <number>\" with an <number> between 1 and " + str(NUM_TRUCKS) + ".")
 
             # The user didn't give one argument
             else:
                 print("truck requires one argument.")
-                print("Please enter \"truck <number>\" with a <number> between 1 and 3.")
+                print("Please enter \"truck <number>\" with a <number> between 1 and " + str(NUM_TRUCKS) + ".")
 
             print()
 
@@ -517,28 +425,29 @@ def main():
         elif user_input[0] == "print":
 
             # Prints the total distance and packages that haven't been loaded yet
-            print(f"- Total distance traveled so far: {total_distance:.1f} miles")
-            print("- Packages not loaded yet: " + str(len(normal_packages) + len(constrained_packages)))
-            for package in normal_packages:
+            print(f"- Total distance traveled so far: {state.total_distance():.1f} miles")
+            print("- Packages not loaded yet: " + str(len(state.waiting) + len(state.delayed)))
+            for package in state.waiting:
                 print(package)
 
-            for package in constrained_packages:
+            for package in state.delayed:
                 print(package)
 
             print()
 
-            # Print truck 1, 2, and 3
-            for number in range(1, 4):
-                print("Truck " + str(number) + ":")
-                truck = truck_1
-                truck_distance = truck_1_distance
-                if number == 2:
-                    truck = truck_2
-                    truck_distance = truck_2_distance
+            # Prints the next deadlines from the deadline index
+            print("- Next deadlines from " + str(current_time.hour).zfill(2) + ":"
+                  + str(current_time.minute).zfill(2) + ":")
+            for package in hash_table.next_deadlines(NEXT_DEADLINES, current_time):
+                print(package)
+
+            print()
 
-                elif number == 3:
-                    truck = truck_3
-                    truck_distance = truck_3_distance
+            # Print every truck
+            for number in range(1, NUM_TRUCKS + 1):
+                print("Truck " + str(number) + ":")
+                truck = state.trucks.get(number, [])
+                truck_distance = state.distances.get(number, 0.0)
 
                 # Prints the mileage and packages left to deliver
                 print(f"- Current distance: {truck_distance:.1f} miles")
@@ -550,24 +459,25 @@ def main():
 
                 print()
 
-            # Get the number of packages delivered
-            count = 0
-            for index in range(1, hash_table.num_keys + 1):
-                if hash_table.lookup(index).status == "Delivered":
-                    count += 1
+            # Get the packages delivered so far from the status index
+            count = hash_table.count_status(PackageStatus.DELIVERED)
+            delivered = hash_table.with_status(PackageStatus.DELIVERED)
 
             # Print the packages delivered so far
             print("Packages delivered: " + str(count))
-            for index in range(1, hash_table.num_keys + 1):
-                temp = hash_table.lookup(index)
-                if temp.status == "Delivered":
-                    print(temp)
+            for temp in delivered:
+                print(temp)
 
             if count == 0:
                 print("No packages delivered yet.")
 
             print()
 
+        # Saves everything to a snapshot file
+        elif user_input[0] == "checkpoint":
+            checkpoint = save_checkpoint(user_input, hash_table, state, log, checkpoint)
+            print()
+
 
         # The user didn't give a valid command
         else:
@@ -576,7 +486,13 @@ def main():
 
 
 
-    print(f"Total distance traveled: {total_distance:.1f} miles")
+    print(f"Total distance traveled: {state.total_distance():.1f} miles")
+
+    # Stop the route planning workers if they were started
+    context.close()
+
+    # Print the time each phase took if instrumentation is on
+    Instrument.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
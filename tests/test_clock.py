@@ -0,0 +1,68 @@
+"""
+test_clock.py
+Tests parsing and converting clock times.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_clock.py
+# Purpose: Checks that every time format the manifests and user interface use parses to the right minute
+
+# Standard Library
+import unittest
+
+# Created Imports
+import Clock
+
+
+# Parses clock times into minutes since midnight
+class ParseMinutesTest(unittest.TestCase):
+    """
+    Runs parse_minutes on good and bad times.
+    """
+    # EOD is the end of the delivery day, however it's written
+    def test_end_of_day(self):
+        """
+        "EOD" in any case and with spaces around it parses to 17:00.
+        """
+        for text in ("EOD", "eod", "  Eod "):
+            self.assertEqual(Clock.parse_minutes(text), Clock.END_OF_DAY_MINUTES)
+        self.assertEqual(Clock.END_OF_DAY_MINUTES, 17 * 60)
+
+    # AM and PM times, including the two 12 o'clocks
+    def test_am_pm(self):
+        """
+        12 AM is midnight, 12 PM is noon, and the space before AM or PM is optional.
+        """
+        self.assertEqual(Clock.parse_minutes("10:30 AM"), 10 * 60 + 30)
+        self.assertEqual(Clock.parse_minutes("9:05 am"), 9 * 60 + 5)
+        self.assertEqual(Clock.parse_minutes("1:00PM"), 13 * 60)
+        self.assertEqual(Clock.parse_minutes("12:00 AM"), 0)
+        self.assertEqual(Clock.parse_minutes("12:15 PM"), 12 * 60 + 15)
+        self.assertEqual(Clock.parse_minutes("11:59 PM"), 23 * 60 + 59)
+
+    # 24-hour times without AM or PM
+    def test_24_hour(self):
+        """
+        Hours run from 0 to 23, with or without a leading zero.
+        """
+        self.assertEqual(Clock.parse_minutes("00:00"), 0)
+        self.assertEqual(Clock.parse_minutes("8:00"), 8 * 60)
+        self.assertEqual(Clock.parse_minutes("13:45"), 13 * 60 + 45)
+        self.assertEqual(Clock.parse_minutes(" 23:59 "), 23 * 60 + 59)
+        self.assertEqual(Clock.parse_seconds("10:20"), (10 * 60 + 20) * 60)
+
+    # Anything else is a ValueError
+    def test_bad_input(self):
+        """
+        Missing parts, out of range hours or minutes, and text that isn't a time all raise.
+        """
+        for text in ("", "noon", "10", "10:", ":30", "10:60", "24:00", "0:30 AM", "13:00 PM", "1:2:3",
+                     "10:30 XM", "-1:30", "100:00", "10:300", "EOD 10:00"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    Clock.parse_minutes(text)
+
+
+if __name__ == "__main__":
+    unittest.main()
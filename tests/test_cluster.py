@@ -0,0 +1,90 @@
+"""
+test_cluster.py
+Tests clustering stops with k-medoids.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_cluster.py
+# Purpose: Checks that k-medoids gives the same clusters on every run and that each stop joins its closest medoid
+
+# Standard Library
+import os
+import random
+import unittest
+
+# Created Imports
+import Cluster
+import Graph
+import Package
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Clusters the stops of the WGUPS distance table
+class KMedoidsTest(unittest.TestCase):
+    """
+    Runs k_medoids on the closure of the WGUPS distance table.
+    """
+    def setUp(self):
+        """
+        Reads the WGUPS distance table and builds its closure.
+        """
+        graph, self.address_ids, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+        self.graph = graph.shortest_path_closure()
+
+    # k_medoids has no random start, so the same stops in the same order always give the same clusters
+    def test_same_result_for_a_seed(self):
+        """
+        For each seed, the stops are shuffled and weighted by that seed, and clustering them twice,
+        on a fresh copy of the graph the second time, gives the same medoids and assignment.
+        """
+        for seed in range(5):
+            rng = random.Random(seed)
+            vertices = list(range(1, self.graph.num_vertices))
+            rng.shuffle(vertices)
+            weights = {vertex: rng.randint(1, 4) for vertex in vertices}
+
+            first = Cluster.k_medoids(self.graph, vertices, 3, weights)
+            graph, _, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+            second = Cluster.k_medoids(graph.shortest_path_closure(), list(vertices), 3, dict(weights))
+            self.assertEqual(first, second)
+
+    # Each stop is in the cluster of the medoid closest to it
+    def test_closest_medoid(self):
+        """
+        Every medoid is in its own cluster, and no stop is closer to another cluster's medoid.
+        """
+        vertices = list(range(1, self.graph.num_vertices))
+        medoids, assignment = Cluster.k_medoids(self.graph, vertices, 4)
+
+        self.assertEqual(len(medoids), 4)
+        self.assertEqual(sorted(assignment), vertices)
+        for index, medoid in enumerate(medoids):
+            self.assertEqual(assignment[medoid], index)
+        for vertex, index in assignment.items():
+            distances = [self.graph.get_edge(vertex, medoid) for medoid in medoids]
+            self.assertEqual(distances[index], min(distances))
+
+    # Partitioning the WGUPS packages gives the same clusters every time, with every package in one
+    def test_partition_packages(self):
+        """
+        partition_packages puts each package in exactly one cluster, in deadline order, the same way twice.
+        """
+        packages = list(Package.read_packages(os.path.join(_ROOT, "WGUPS Package File.csv"),
+                                              self.address_ids).values())
+        hub = self.address_ids["HUB"]
+        clusters = Cluster.partition_packages(self.graph, hub, packages, 16)
+
+        self.assertEqual(sorted(package.id for cluster in clusters for package in cluster),
+                         sorted(package.id for package in packages))
+        for cluster in clusters:
+            deadlines = [package.deadline_seconds for package in cluster]
+            self.assertEqual(deadlines, sorted(deadlines))
+        self.assertEqual([[package.id for package in cluster] for cluster in clusters],
+                         [[package.id for package in cluster]
+                          for cluster in Cluster.partition_packages(self.graph, hub, packages, 16)])
+
+
+if __name__ == "__main__":
+    unittest.main()
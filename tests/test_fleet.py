@@ -0,0 +1,105 @@
+"""
+test_fleet.py
+Tests packing packages onto the fleet.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_fleet.py
+# Purpose: Checks that no truck is loaded past its package count or weight limit
+
+# Standard Library
+import os
+import unittest
+
+# Created Imports
+import Fleet
+import Graph
+import Package
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Packs the WGUPS packages onto fleets with different limits
+class PackFleetTest(unittest.TestCase):
+    """
+    Runs pack_fleet on the WGUPS packages.
+    """
+    def setUp(self):
+        """
+        Reads the WGUPS packages with their vertex ids.
+        """
+        _, address_ids, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+        self.packages = sorted(Package.read_packages(os.path.join(_ROOT, "WGUPS Package File.csv"),
+                                                     address_ids).values(),
+                               key=lambda package: (package.deadline_seconds, package.id))
+
+    # Checks every load against its truck's limits and that each package is placed once
+    def assert_packed(self, fleet: list, loads: list, leftover: list) -> None:
+        """
+        Checks that each load fits its truck, is marked with its number, and that every package is
+        either on one truck or left over.
+        Args:
+            fleet (list): Trucks the packages were packed onto.
+            loads (list): Packages on each truck.
+            leftover (list): Packages that didn't fit.
+        """
+        self.assertEqual(len(loads), len(fleet))
+        for spec, load in zip(fleet, loads):
+            self.assertLessEqual(len(load), spec.max_packages)
+            self.assertLessEqual(sum(package.weight for package in load), spec.max_weight)
+            for package in load:
+                self.assertEqual(package.truck, spec.number)
+
+        placed = [package.id for load in loads for package in load] + [package.id for package in leftover]
+        self.assertEqual(sorted(placed), sorted(package.id for package in self.packages))
+
+    # Identical trucks with room for everything leave nothing behind
+    def test_count_limit(self):
+        """
+        Three trucks of 16 packages carry all 40, with no truck over 16.
+        """
+        fleet = Fleet.make_fleet(3, 16)
+        loads, leftover = Fleet.pack_fleet(self.packages, fleet)
+
+        self.assert_packed(fleet, loads, leftover)
+        self.assertEqual(leftover, [])
+
+    # Weight limits split stops that would fit by count alone
+    def test_weight_limit(self):
+        """
+        Trucks of different sizes and a 60 kg limit on the small one never go over either limit.
+        """
+        fleet = [Fleet.TruckSpec(1, 8, 60), Fleet.TruckSpec(2, 16, 200), Fleet.TruckSpec(3, 16, 150)]
+        loads, leftover = Fleet.pack_fleet(self.packages, fleet)
+
+        self.assert_packed(fleet, loads, leftover)
+        self.assertTrue(all(loads))
+
+    # Packages that don't fit anywhere are handed back instead of overloading a truck
+    def test_leftover(self):
+        """
+        Two trucks of 10 packages and 100 kg can't take all 40 packages, so the rest come back as leftover.
+        """
+        fleet = Fleet.make_fleet(2, 10, 100)
+        loads, leftover = Fleet.pack_fleet(self.packages, fleet)
+
+        self.assert_packed(fleet, loads, leftover)
+        self.assertGreaterEqual(len(leftover), 20)
+
+    # Every load split_loads makes fits on the truck it was split for
+    def test_split_loads(self):
+        """
+        Splitting the packages into loads of 16 packages and 100 kg keeps every package and every limit.
+        """
+        loads = Fleet.split_loads(self.packages, Fleet.TruckSpec(1, 16, 100))
+
+        self.assertEqual(sorted(package.id for load in loads for package in load),
+                         sorted(package.id for package in self.packages))
+        for load in loads:
+            self.assertLessEqual(len(load), 16)
+            self.assertLessEqual(sum(package.weight for package in load), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+test_graph.py
+Tests the distance graph and its shortest-path closure.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_graph.py
+# Purpose: Checks the shortest-path closure, next-hop paths, and binary sidecar against the WGUPS distance table
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+
+# Created Imports
+import Graph
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Compares the closure of the WGUPS table with the distances read straight from the CSV
+class ShortestPathClosureTest(unittest.TestCase):
+    """
+    Builds the closure of the WGUPS distance table.
+    """
+    def setUp(self):
+        """
+        Reads the WGUPS distance table and builds its closure.
+        """
+        self.graph, self.address_ids, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+        self.closure = self.graph.shortest_path_closure()
+
+    # The table's direct distance between these two is longer than going through 177 W Price Ave
+    def test_two_hop_shorter_than_direct_edge(self):
+        """
+        The closure replaces the 13.6 mile direct edge with the 1.4 + 5.5 mile path through a third
+        address, and path() rebuilds that route from the next-hop table.
+        """
+        start = self.address_ids["3575 W Valley Central Station bus Loop"]
+        middle = self.address_ids["177 W Price Ave"]
+        end = self.address_ids["6351 South 900 East"]
+        two_hops = self.graph.get_edge(start, middle) + self.graph.get_edge(middle, end)
+
+        self.assertEqual(self.graph.get_edge(start, end), 13.6)
+        self.assertAlmostEqual(self.closure.get_edge(start, end), two_hops)
+        self.assertAlmostEqual(self.closure.get_edge(end, start), two_hops)
+        self.assertEqual(self.closure.path(start, end), [start, middle, end])
+        self.assertEqual(self.closure.path(end, start), [end, middle, start])
+
+    # Every closure distance is the length of its rebuilt path and never longer than the direct edge
+    def test_paths_match_distances(self):
+        """
+        Summing the CSV distances along path(i, j) gives the closure's distance for every pair.
+        """
+        n = self.graph.num_vertices
+        for i in range(n):
+            for j in range(n):
+                path = self.closure.path(i, j)
+                self.assertEqual((path[0], path[-1]), (i, j))
+                length = sum(self.graph.get_edge(path[k], path[k + 1]) for k in range(len(path) - 1))
+                self.assertAlmostEqual(self.closure.get_edge(i, j), length)
+                self.assertLessEqual(self.closure.get_edge(i, j), self.graph.get_edge(i, j) + 1e-9)
+
+    # A graph without a next-hop table only knows its direct edges
+    def test_path_without_closure(self):
+        """
+        path() on the graph read from the CSV gives the direct edge, and on a sparse graph it gives
+        nothing for vertices with no edge between them until the closure is built.
+        """
+        self.assertEqual(self.graph.path(0, 5), [0, 5])
+
+        graph = Graph.Graph(4)
+        graph.add_edge(0, 1, 2.0)
+        graph.add_edge(1, 2, 3.0)
+        self.assertEqual(graph.path(0, 2), [])
+
+        closure = graph.shortest_path_closure()
+        self.assertEqual(closure.path(0, 2), [0, 1, 2])
+        self.assertEqual(closure.get_edge(0, 2), 5.0)
+        self.assertEqual(closure.path(0, 3), [])
+        self.assertEqual(closure.get_edge(0, 3), -1.0)
+
+
+# Loads the distance table through its binary sidecar
+class DistanceSidecarTest(unittest.TestCase):
+    """
+    Loads a copy of the WGUPS distance table through a .wgdm sidecar in a temporary directory.
+    """
+    def setUp(self):
+        """
+        Copies the distance table into a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.csv_file = os.path.join(self.directory.name, "distances.csv")
+        self.sidecar_file = os.path.join(self.directory.name, "cache", "distances.wgdm")
+        shutil.copyfile(os.path.join(_ROOT, "WGUPS Distance Table.csv"), self.csv_file)
+
+    # Editing the CSV changes its digest, so the sidecar built from the old table is replaced
+    def test_rebuilt_when_csv_changes(self):
+        """
+        The first load writes the sidecar. After one distance in the CSV changes, the next load
+        rebuilds the sidecar with the new distance and digest instead of mapping the old one.
+        """
+        graph, _, _ = Graph.load_distances(self.csv_file, self.sidecar_file)
+        self.assertEqual(graph.get_edge(2, 1), 7.1)
+        old_digest = Graph.file_digest(self.csv_file)
+        with self.assertRaises(ValueError):
+            Graph.read_distance_table(self.sidecar_file, b"\0" * 32)
+
+        with open(self.csv_file) as file:
+            lines = file.readlines()
+        self.assertEqual(lines[1], '"1060 Dalton Ave S",7.2,0.0\n')
+        lines[1] = '"1060 Dalton Ave S",9.9,0.0\n'
+        with open(self.csv_file, mode='w') as file:
+            file.writelines(lines)
+
+        new_digest = Graph.file_digest(self.csv_file)
+        self.assertNotEqual(new_digest, old_digest)
+        with self.assertRaises(ValueError):
+            Graph.read_distance_table(self.sidecar_file, new_digest)
+
+        graph, address_ids, _ = Graph.load_distances(self.csv_file, self.sidecar_file)
+        self.assertEqual(graph.get_edge(1, 0), 9.9)
+        self.assertEqual(graph.get_edge(0, 1), 9.9)
+        self.assertEqual(address_ids["1060 Dalton Ave S"], 1)
+        Graph.read_distance_table(self.sidecar_file, new_digest)
+
+    # Weights mapped from the sidecar are read-only, which set_weight reports instead of raising
+    def test_mapped_weights_are_read_only(self):
+        """
+        set_weight on a graph loaded from the sidecar returns False and leaves the weight alone.
+        """
+        Graph.load_distances(self.csv_file, self.sidecar_file)
+        graph, _, _ = Graph.load_distances(self.csv_file, self.sidecar_file)
+
+        self.assertFalse(graph.adjacency_matrix.set_weight(0, 1, 1.0))
+        self.assertEqual(graph.get_edge(0, 1), 7.2)
+        self.assertFalse(graph.adjacency_matrix.set_weight(0, graph.num_vertices, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
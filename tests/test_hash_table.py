@@ -0,0 +1,198 @@
+"""
+test_hash_table.py
+Tests the open addressing hash table.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_hash_table.py
+# Purpose: Checks probing past removed slots, reusing them, and growing the table
+
+# Standard Library
+import unittest
+
+# Created Imports
+from HashTable import HashTable
+
+
+# Stores, removes, and finds keys in a HashTable
+class HashTableTest(unittest.TestCase):
+    """
+    Checks the probing and resizing of HashTable. Small ints hash to themselves, so keys that are
+    a multiple of the capacity apart start probing at the same slot.
+    """
+    # A key further along a probe chain is still found after the key before it is removed
+    def test_lookup_past_removed_slot(self):
+        """
+        1, 9, and 17 share a slot in a table of 8. Removing 9 leaves a marker that lookups probe past.
+        """
+        table = HashTable(8)
+        for key in (1, 9, 17):
+            table.insert(key, str(key))
+        table.remove(9)
+
+        self.assertEqual(table.lookup(17), "17")
+        self.assertIsNone(table.lookup(9))
+        self.assertNotIn(9, table)
+        self.assertIn(17, table)
+        self.assertEqual(len(table), 2)
+
+    # A new key goes into the first removed slot on its probe chain
+    def test_removed_slot_is_reused(self):
+        """
+        After 9 is removed, 25 starts probing at the same slot and takes the slot 9 left, so no new
+        slot is used.
+        """
+        table = HashTable(8)
+        for key in (1, 9, 17):
+            table.insert(key, str(key))
+        slot = table.key_slots.index(9)
+        used = table.used
+        table.remove(9)
+        table.insert(25, "25")
+
+        self.assertEqual(table.key_slots[slot], 25)
+        self.assertEqual(table.used, used)
+        self.assertEqual(table.lookup(25), "25")
+        self.assertEqual(table.lookup(17), "17")
+
+    # Inserting an existing key replaces its value instead of adding it again
+    def test_insert_replaces(self):
+        """
+        The value is replaced, even when the key is past a removed slot.
+        """
+        table = HashTable(8)
+        for key in (1, 9, 17):
+            table.insert(key, str(key))
+        table.remove(9)
+        table.insert(17, "seventeen")
+
+        self.assertEqual(table.lookup(17), "seventeen")
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.key_slots.count(17), 1)
+
+    # The capacity is always a power of two and doubles as the table fills
+    def test_resize_to_next_power_of_two(self):
+        """
+        A capacity of 20 is rounded up to 32, which doubles to 64 once more than half of it is used,
+        and every key is still found afterwards.
+        """
+        table = HashTable(20)
+        self.assertEqual(table.capacity, 32)
+
+        for key in range(16):
+            table.insert(key, key * 10)
+        self.assertEqual(table.capacity, 32)
+
+        table.insert(16, 160)
+        self.assertEqual(table.capacity, 64)
+        self.assertEqual([table.lookup(key) for key in range(17)], [key * 10 for key in range(17)])
+
+    # Removed slots are cleared out by rebuilding at the same size rather than growing
+    def test_removed_slots_cleared_without_growing(self):
+        """
+        Inserting and removing keys over and over keeps the table at its starting size.
+        """
+        table = HashTable(8)
+        for key in range(100):
+            table.insert(key, key)
+            table.remove(key)
+
+        self.assertEqual(table.capacity, 8)
+        self.assertEqual(len(table), 0)
+
+    # None and keys that are false are stored like any other key
+    def test_none_and_falsy_keys(self):
+        """
+        None, 0, the empty string, and the empty tuple are all separate keys.
+        """
+        table = HashTable()
+        for key in (None, 0, "", ()):
+            table.insert(key, repr(key))
+
+        for key in (None, 0, "", ()):
+            self.assertIn(key, table)
+            self.assertEqual(table.lookup(key), repr(key))
+
+        self.assertEqual(table.remove(None).value, "None")
+        self.assertNotIn(None, table)
+        self.assertEqual(table.lookup(0), "0")
+        self.assertEqual(len(table), 3)
+
+    # A load factor outside 0 and 1 can't work
+    def test_bad_load_factor(self):
+        """
+        A load factor of 0 or 1 raises a ValueError.
+        """
+        for load_factor in (0, 1):
+            with self.assertRaises(ValueError):
+                HashTable(load_factor=load_factor)
+
+
+
+# Uses the batch and iteration methods of a HashTable
+class HashTableBatchTest(unittest.TestCase):
+    """
+    Checks insert_many, lookup_many, and iterating over a HashTable.
+    """
+    # insert_many stores every pair and grows the table once
+    def test_insert_many(self):
+        """
+        A thousand pairs go into a small table, which ends up at the size they need, and a key given
+        twice keeps its last value.
+        """
+        table = HashTable(8)
+        table.insert(1, "old")
+        table.insert_many([(key, key * 2) for key in range(1000)] + [(5, "last")])
+
+        self.assertEqual(len(table), 1000)
+        self.assertEqual(table.capacity, 2048)
+        self.assertEqual(table.lookup(1), 2)
+        self.assertEqual(table.lookup(5), "last")
+        self.assertEqual(table.lookup(999), 1998)
+
+    # lookup_many keeps the order of the keys and gives None for missing ones
+    def test_lookup_many_with_missing_keys(self):
+        """
+        Missing and removed keys come back as None in their place.
+        """
+        table = HashTable()
+        table.insert_many((key, str(key)) for key in range(1, 11))
+        table.remove(4)
+
+        self.assertEqual(table.lookup_many([10, 4, 99, 1, 10]), ["10", None, None, "1", "10"])
+        self.assertEqual(table.lookup_many(iter([])), [])
+
+    # items, values, and iterating give every live key once and skip removed slots
+    def test_iteration(self):
+        """
+        After removing some keys, items, values, and keys all match what's left.
+        """
+        table = HashTable(8)
+        table.insert_many((key, key * key) for key in range(20))
+        for key in range(0, 20, 3):
+            table.remove(key)
+        left = [key for key in range(20) if key % 3]
+
+        self.assertEqual(sorted(table.items()), [(key, key * key) for key in left])
+        self.assertEqual(sorted(table.values()), [key * key for key in left])
+        self.assertEqual(sorted(table), left)
+        self.assertEqual(len(table), len(left))
+
+    # in checks membership without confusing missing keys with stored None values
+    def test_contains(self):
+        """
+        A key stored with a None value is in the table, and a removed key isn't.
+        """
+        table = HashTable()
+        table.insert("a", None)
+        table.insert("b", 2)
+        table.remove("b")
+
+        self.assertIn("a", table)
+        self.assertNotIn("b", table)
+        self.assertNotIn("c", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
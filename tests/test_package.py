@@ -0,0 +1,143 @@
+"""
+test_package.py
+Tests reading packages and sorting their constraints onto trucks.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_package.py
+# Purpose: Checks that bad rows are rejected and co-delivery groups go out whole with the constraints of their packages
+
+# Standard Library
+import csv
+import os
+import tempfile
+import unittest
+
+# Created Imports
+import Package
+
+
+# Writes a small package file, one row per (id, deadline, notes)
+def write_package_file(filename: str, rows: list) -> None:
+    """
+    Writes packages to one address with the given deadlines and special notes.
+    Args:
+        filename (str): Path to write.
+        rows (list): (package id, deadline, special notes) for each package.
+    """
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Package ID", "Address", "City", "State", "Zip", "Delivery Deadline", "Weight KILO",
+                         "Special Notes"])
+        for package_id, deadline, notes in rows:
+            writer.writerow([package_id, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, deadline, 2, notes])
+
+
+# Reads package files with rows that can't be loaded
+class ReadPackagesTest(unittest.TestCase):
+    """
+    Reads a small package file with a bad deadline, a short row, a repeated id, and an unknown address.
+    """
+    def setUp(self):
+        """
+        Writes the package file in a temporary directory.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.package_file = os.path.join(directory.name, "packages.csv")
+        with open(self.package_file, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(["Package ID", "Address", "City", "State", "Zip", "Delivery Deadline", "Weight KILO",
+                             "Special Notes"])
+            writer.writerow([1, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, "10:30 AM", 21, ""])
+            writer.writerow([2, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, "noon", 44, ""])
+            writer.writerow([3, "195 W Oakland Ave", "Salt Lake City", "UT", 84115])
+            writer.writerow([1, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, "EOD", 2, ""])
+            writer.writerow([4, "1 Nowhere St", "Salt Lake City", "UT", 84115, "EOD", 2, ""])
+            writer.writerow([5, "195 W Oakland Ave", "Salt Lake City", "UT", 84115, "EOD", 9, ""])
+        self.address_ids = {"HUB": 0, "195 W Oakland Ave": 1}
+
+    # Every bad row goes to the callback with its row number, and the good rows are still loaded
+    def test_bad_rows_go_to_callback(self):
+        """
+        Rows 3 to 6 are rejected in order, and packages 1 and 5 are read.
+        """
+        rejected = []
+        packages = Package.read_packages(self.package_file, self.address_ids, rejected.append)
+
+        self.assertEqual([row.line_number for row in rejected], [3, 4, 5, 6])
+        self.assertEqual([row.row[0] for row in rejected], ["2", "3", "1", "4"])
+        self.assertIn("already read", rejected[2].reason)
+        self.assertIn("1 Nowhere St", rejected[3].reason)
+        self.assertEqual(sorted(packages), [1, 5])
+        self.assertEqual(packages.lookup(1).vertex_id, 1)
+
+    # Without a callback, the bad rows are raised together after the file is read
+    def test_bad_rows_raise_without_callback(self):
+        """
+        The ValueError lists every rejected row, not just the first.
+        """
+        with self.assertRaises(ValueError) as raised:
+            Package.read_packages(self.package_file, self.address_ids)
+
+        for line_number in (3, 4, 5, 6):
+            self.assertIn("Row " + str(line_number) + ":", str(raised.exception))
+        self.assertNotIn("Row 2:", str(raised.exception))
+
+
+# Sorts constrained packages onto the trucks' runs
+class FilterConstrainedPackagesTest(unittest.TestCase):
+    """
+    Runs filter_constrained_packages on small package files.
+    """
+    # Reads a package file and sorts its constrained packages onto three trucks
+    def filter(self, rows: list) -> list:
+        """
+        Writes rows to a package file and runs filter_constrained_packages on it.
+        Args:
+            rows (list): (package id, deadline, special notes) for each package.
+        Returns:
+            list: Packages queued for each run of each truck.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            package_file = os.path.join(directory, "packages.csv")
+            write_package_file(package_file, rows)
+            packages = Package.read_packages(package_file)
+
+        normal, constrained = Package.separate_packages(packages)
+        return Package.filter_constrained_packages(normal, constrained, packages, 16, 3)
+
+    # A group member that must be on one truck takes the whole group onto that truck
+    def test_group_follows_required_truck(self):
+        """
+        Packages 1 and 2 go together, and package 2 can only be on truck 3, so both are queued on
+        one run of truck 3.
+        """
+        trucks = self.filter([(1, "EOD", "Must be delivered with 2"), (2, "EOD", "Can only be on truck 3"),
+                              (3, "EOD", "")])
+
+        self.assertEqual(trucks[:2], [[], []])
+        self.assertEqual([[package.id for package in run] for run in trucks[2]], [[1, 2]])
+
+    # A group can't be split between two required trucks
+    def test_group_on_two_trucks_raises(self):
+        """
+        Packages 1, 2, and 3 go together, but 2 and 3 can only be on different trucks.
+        """
+        with self.assertRaises(ValueError):
+            self.filter([(1, "EOD", "Must be delivered with 2, 3"), (2, "EOD", "Can only be on truck 2"),
+                         (3, "EOD", "Can only be on truck 3")])
+
+    # A group with a package that reaches the hub late can't go out together at the start of the day
+    def test_group_with_delayed_package_raises(self):
+        """
+        Package 2 is delayed, so it can't be queued with package 1.
+        """
+        with self.assertRaises(ValueError):
+            self.filter([(1, "EOD", "Must be delivered with 2"),
+                         (2, "EOD", "Delayed on flight---will not arrive to depot until 9:05 am")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+test_package_repository.py
+Tests the package repository's secondary indexes.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_package_repository.py
+# Purpose: Checks that the status, address, truck, and deadline indexes follow every change to a package
+
+# Standard Library
+import datetime
+import os
+import unittest
+
+# Created Imports
+import Graph
+import Package
+from Package import PackageStatus
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Changes packages in a repository and compares every index against a scan of the packages
+class PackageRepositoryTest(unittest.TestCase):
+    """
+    Reads the WGUPS packages into a repository.
+    """
+    def setUp(self):
+        """
+        Reads the WGUPS packages with their vertex ids.
+        """
+        _, address_ids, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+        self.packages = Package.read_packages(os.path.join(_ROOT, "WGUPS Package File.csv"), address_ids)
+
+    # Checks every query against a scan of the packages
+    def assert_indexes_agree(self):
+        """
+        Runs each query for every value in the repository and compares it to a full scan.
+        """
+        packages = self.packages
+        values = list(packages.values())
+        for status in PackageStatus:
+            expected = sorted(package.id for package in values if package.status == status)
+            self.assertEqual([package.id for package in packages.with_status(status)], expected)
+            self.assertEqual(packages.count_status(status), len(expected))
+
+        for address in {package.address for package in values}:
+            expected = sorted(package.id for package in values if package.address == address)
+            self.assertEqual([package.id for package in packages.at_address(address)], expected)
+
+        for truck in range(4):
+            expected = sorted(package.id for package in values if package.truck == truck)
+            self.assertEqual([package.id for package in packages.on_truck(truck)], expected)
+
+        expected = sorted((package.deadline_seconds, package.id) for package in values)
+        self.assertEqual([package.id for package in packages.next_deadlines(len(values))],
+                         [package_id for _, package_id in expected])
+        after = datetime.datetime(1, 1, 1, 10, 30)
+        self.assertEqual([package.id for package in packages.next_deadlines(3, after)],
+                         [package_id for deadline, package_id in expected if deadline >= 10 * 3600 + 30 * 60][:3])
+
+    # The indexes start out matching the packages
+    def test_after_loading(self):
+        """
+        Every query agrees with a scan right after reading.
+        """
+        self.assert_indexes_agree()
+
+    # Setting a status, truck, address, or deadline moves the package in its index
+    def test_after_changes(self):
+        """
+        Changes fields of several packages, some more than once, and checks the indexes after each round.
+        """
+        for package_id in (1, 2, 3):
+            self.packages.lookup(package_id).status = PackageStatus.EN_ROUTE
+        self.packages.lookup(2).status = PackageStatus.DELIVERED
+        self.packages.lookup(1).truck = 2
+        self.packages.lookup(3).truck = 1
+        self.packages.lookup(3).truck = 3
+        self.assert_indexes_agree()
+
+        self.packages.lookup(9).address = "410 S State St"
+        self.packages.lookup(1).address = self.packages.lookup(2).address
+        for hour in (9, 11, 9, 17):
+            self.packages.lookup(6).deadline = datetime.datetime(1, 1, 1, hour)
+        self.packages.lookup(40).deadline = datetime.datetime(1, 1, 1, 8)
+        self.assert_indexes_agree()
+
+    # A removed package leaves every index, and putting it back adds it again
+    def test_after_remove_and_insert(self):
+        """
+        Removes two packages, checks the indexes, then inserts one of them again with a new deadline.
+        """
+        package = self.packages.lookup(15)
+        self.packages.remove(15)
+        self.packages.remove(16)
+        self.assertIsNone(package.repository)
+        self.assert_indexes_agree()
+
+        package.deadline = datetime.datetime(1, 1, 1, 12)
+        self.packages.insert(15, package)
+        self.assert_indexes_agree()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+test_route.py
+Tests building and improving truck tours.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_route.py
+# Purpose: Checks that insertion meets deadlines and local search never makes a tour longer or later
+
+# Standard Library
+import os
+import random
+import unittest
+
+# Created Imports
+import Graph
+import Route
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Improves tours over the closure of the WGUPS distance table
+class ImproveTourTest(unittest.TestCase):
+    """
+    Runs improve_tour on random sets of WGUPS stops.
+    """
+    def setUp(self):
+        """
+        Reads the WGUPS distance table and builds its closure.
+        """
+        graph, _, _ = Graph.read_distances_to_graph(os.path.join(_ROOT, "WGUPS Distance Table.csv"))
+        self.graph = graph.shortest_path_closure()
+
+    # Local search keeps every stop and never makes the tour longer
+    def test_never_longer(self):
+        """
+        For nearest-neighbor and randomized starting tours of many stop sets, the improved tour visits
+        the same stops and is no longer than the tour it started from.
+        """
+        rng = random.Random(7)
+        vertices = range(1, self.graph.num_vertices)
+        for _ in range(50):
+            stops = rng.sample(vertices, rng.randint(2, 16))
+            tours = (Route.nearest_neighbor_tour(self.graph, 0, stops),
+                     Route.randomized_tour(self.graph, 0, stops, rng))
+            for tour in tours:
+                improved = Route.improve_tour(self.graph, 0, tour)
+                self.assertEqual(sorted(improved), sorted(tour))
+                self.assertLessEqual(Route.tour_distance(self.graph, 0, improved),
+                                     Route.tour_distance(self.graph, 0, tour) + Route.EPSILON)
+
+    # With deadlines, a shorter tour is only kept if it isn't any later
+    def test_never_later(self):
+        """
+        With deadlines on some of the stops, the improved tour is no longer and no later in total
+        than the tour it started from.
+        """
+        rng = random.Random(11)
+        vertices = range(1, self.graph.num_vertices)
+        for _ in range(50):
+            stops = rng.sample(vertices, rng.randint(2, 16))
+            deadlines = {stop: rng.uniform(10, 90) for stop in stops if rng.random() < 0.4}
+            tour = Route.randomized_tour(self.graph, 0, stops, rng)
+            improved = Route.improve_tour(self.graph, 0, tour, deadlines)
+            self.assertLessEqual(Route.tour_distance(self.graph, 0, improved),
+                                 Route.tour_distance(self.graph, 0, tour) + Route.EPSILON)
+            self.assertLessEqual(Route.tour_lateness(self.graph, 0, improved, deadlines, 18),
+                                 Route.tour_lateness(self.graph, 0, tour, deadlines, 18) + Route.EPSILON)
+
+    # The search is bounded by moves, so the same tour always improves the same way
+    def test_same_result_every_run(self):
+        """
+        Improving the same tour twice gives the same visit order.
+        """
+        stops = list(range(1, self.graph.num_vertices))
+        tour = Route.randomized_tour(self.graph, 0, stops, random.Random(3))
+        self.assertEqual(Route.improve_tour(self.graph, 0, tour, max_moves=5),
+                         Route.improve_tour(self.graph, 0, tour, max_moves=5))
+
+
+# Builds tours with deadlines on a small graph where the closest stop first is the wrong order
+class InsertionTourTest(unittest.TestCase):
+    """
+    Builds tours over four vertices on a line: the hub at mile 0, one stop 10 miles west, and two
+    stops 1 and 2 miles east.
+    """
+    def setUp(self):
+        """
+        Builds the graph with the distance between two vertices as the gap between their miles.
+        """
+        miles = [0, -10, 1, 2]
+        self.graph = Graph.Graph(len(miles))
+        for i in range(len(miles)):
+            for j in range(i, len(miles)):
+                self.graph.add_edge(i, j, abs(miles[i] - miles[j]))
+
+        # At 18 mph, the west stop is 33.3 minutes from the hub, so it's only on time if it's first
+        self.deadlines = {1: 36.0}
+
+    # Nearest-neighbor takes the close stops first and is late to the far one
+    def test_meets_deadline_nearest_neighbor_misses(self):
+        """
+        Nearest-neighbor reaches the west stop after 14 miles, while insertion goes there first and
+        reports no late stops.
+        """
+        nearest = Route.nearest_neighbor_tour(self.graph, 0, [1, 2, 3])
+        self.assertEqual(nearest, [2, 3, 1])
+        self.assertGreater(Route.tour_lateness(self.graph, 0, nearest, self.deadlines, 18), 0)
+
+        tour, late = Route.insertion_tour(self.graph, 0, [1, 2, 3], self.deadlines)
+        self.assertEqual(tour[0], 1)
+        self.assertEqual(sorted(tour), [1, 2, 3])
+        self.assertEqual(late, [])
+        self.assertEqual(Route.tour_lateness(self.graph, 0, tour, self.deadlines, 18), 0.0)
+
+    # A deadline nothing can meet is still visited, and reported as late
+    def test_reports_deadline_it_cannot_meet(self):
+        """
+        With 20 minutes to reach the west stop, it's late in any order, so insertion still visits every
+        stop and lists it as late.
+        """
+        tour, late = Route.insertion_tour(self.graph, 0, [1, 2, 3], {1: 20.0})
+        self.assertEqual(sorted(tour), [1, 2, 3])
+        self.assertEqual(late, [1])
+        self.assertEqual(tour[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
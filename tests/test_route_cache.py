@@ -0,0 +1,79 @@
+"""
+test_route_cache.py
+Tests the planned route cache.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_route_cache.py
+# Purpose: Checks that planned routes are reused, evicted least recently used first, and keyed on the whole load
+
+# Standard Library
+import os
+import unittest
+
+# Created Imports
+from Context import RoutingContext
+from RouteCache import CachedRoute, RouteCache
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Checks the cache on its own and through RoutingContext.plan_route
+class RouteCacheTest(unittest.TestCase):
+    """
+    Looks routes up in a RouteCache.
+    """
+    # The same stops and deadlines leaving at the same time hit, whatever order they're given in
+    def test_hit(self):
+        """
+        A key built from the same deadlines in another order finds the stored route.
+        """
+        cache = RouteCache(2)
+        cached = CachedRoute([3, 1, 2], {})
+        cache.put(RouteCache.make_key({1: 60.0, 2: 90.0, 3: 30.0}, 28800), cached)
+
+        self.assertIs(cache.get(RouteCache.make_key({3: 30.0, 2: 90.0, 1: 60.0}, 28800)), cached)
+        self.assertIsNone(cache.get(RouteCache.make_key({1: 60.0, 2: 90.0, 3: 30.0}, 30000)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    # A full cache drops the route used longest ago
+    def test_eviction(self):
+        """
+        Looking up the first route makes the second the least recently used, so it's the one evicted.
+        """
+        cache = RouteCache(2)
+        keys = [RouteCache.make_key({stop: 60.0}, 28800) for stop in (1, 2, 3)]
+        cache.put(keys[0], CachedRoute([1], {}))
+        cache.put(keys[1], CachedRoute([2], {}))
+        cache.get(keys[0])
+        cache.put(keys[2], CachedRoute([3], {}))
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.get(keys[0]).route, (1,))
+        self.assertEqual(cache.get(keys[2]).route, (3,))
+
+    # A load holding only part of a cached load is planned on its own
+    def test_partial_load(self):
+        """
+        Planning a truck load twice hits the cache, while a load with only some of its stops misses
+        and gets a route over just those stops.
+        """
+        context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                 package_file=os.path.join(_ROOT, "WGUPS Package File.csv"), cache_directory=None)
+        packages = context.read_packages()
+        load = packages.lookup_many([1, 4, 7, 29, 30, 40])
+
+        route = context.plan_route(load, 28800)
+        self.assertEqual(context.plan_route(load, 28800), route)
+        self.assertEqual((context.route_cache.hits, context.route_cache.misses), (1, 1))
+
+        partial = context.plan_route(load[:3], 28800)
+        self.assertEqual(context.route_cache.misses, 2)
+        self.assertEqual(sorted(partial), sorted({package.vertex_id for package in load[:3]}))
+
+
+if __name__ == "__main__":
+    unittest.main()
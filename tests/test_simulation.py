@@ -0,0 +1,143 @@
+"""
+test_simulation.py
+Tests the discrete-event delivery engine.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_simulation.py
+# Purpose: Checks that every package gets delivered however the trucks and drivers are set up
+
+# Standard Library
+import csv
+import datetime
+import os
+import tempfile
+import unittest
+
+# Created Imports
+import Package
+import Simulation
+from Context import RoutingContext
+from Package import PackageStatus
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Writes the WGUPS package file with every note replaced, so only the given packages have a required truck
+def write_required_truck_file(filename: str, required: dict) -> None:
+    """
+    Copies the WGUPS package file without its special notes, then pins packages to trucks.
+    Args:
+        filename (str): Path to write.
+        required (dict): Truck number for each package id that must go on one truck.
+    """
+    with open(os.path.join(_ROOT, "WGUPS Package File.csv"), encoding="utf-8-sig", newline='') as file:
+        rows = list(csv.reader(file))
+
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(rows[0])
+        for row in rows[1:]:
+            package_id = int(row[0])
+            row[7] = "Can only be on truck " + str(required[package_id]) if package_id in required else ""
+            writer.writerow(row)
+
+
+# Runs the day with more trucks than drivers
+class DeliveryEngineTest(unittest.TestCase):
+    """
+    Simulates whole days with the engine.
+    """
+    # Packages placed on a truck the only driver doesn't take first still go out
+    def test_required_truck_with_fewer_drivers(self):
+        """
+        With one driver and three trucks, the packages required on truck 3 are delivered once the
+        driver is back from the run on truck 1.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            package_file = os.path.join(directory, "packages.csv")
+            write_required_truck_file(package_file, {3: 3, 18: 3, 36: 3, 38: 3})
+            context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                     package_file=package_file, cache_directory=None, max_packages=100,
+                                     num_trucks=3, num_drivers=1)
+            packages = context.read_packages()
+            context.simulate_day(packages, datetime.datetime(1, 1, 1, 8), datetime.datetime(1, 1, 1, 23, 59))
+
+        delivered = packages.with_status(PackageStatus.DELIVERED)
+        self.assertEqual(len(delivered), len(packages))
+
+    # Packages required on a truck that's already full wait for its next run
+    def test_required_truck_over_capacity(self):
+        """
+        Five packages required on truck 2 of a fleet of trucks that carry three go out over two of
+        truck 2's runs.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            package_file = os.path.join(directory, "packages.csv")
+            write_required_truck_file(package_file, {1: 2, 3: 2, 18: 2, 36: 2, 38: 2})
+            context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                     package_file=package_file, cache_directory=None, max_packages=3,
+                                     num_trucks=2, num_drivers=2)
+            packages = context.read_packages()
+            log = Simulation.EventLog(context.speed)
+            log.capture(packages)
+            context.simulate_day(packages, datetime.datetime(1, 1, 1, 8), datetime.datetime(1, 1, 1, 23, 59), log)
+
+        delivered = packages.with_status(PackageStatus.DELIVERED)
+        self.assertEqual(len(delivered), len(packages))
+        for package_id in (1, 3, 18, 36, 38):
+            self.assertEqual(log.timelines[package_id].truck, 2)
+
+    # A package required on a truck the fleet doesn't have is an error, not a package left at the hub
+    def test_required_truck_missing_from_fleet(self):
+        """
+        A package that can only be on truck 4 of a three truck fleet raises a ValueError.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            package_file = os.path.join(directory, "packages.csv")
+            write_required_truck_file(package_file, {3: 4})
+            context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                     package_file=package_file, cache_directory=None, num_trucks=3)
+            packages = context.read_packages()
+            with self.assertRaises(ValueError):
+                context.simulate_day(packages, datetime.datetime(1, 1, 1, 8), datetime.datetime(1, 1, 1, 23, 59))
+
+    # Packages the planned routes will deliver late go to the callback instead of being printed
+    def test_late_packages_go_to_callback(self):
+        """
+        With one driver and six packages per truck, the early deadlines can't all be met, and every
+        package that's warned about is then delivered after its deadline.
+        """
+        late = []
+        context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                 package_file=os.path.join(_ROOT, "WGUPS Package File.csv"), cache_directory=None,
+                                 max_packages=6, num_trucks=3, num_drivers=1, warn_late=late.append)
+        packages = context.read_packages()
+        context.simulate_day(packages, datetime.datetime(1, 1, 1, 8), datetime.datetime(1, 1, 1, 23, 59))
+
+        self.assertTrue(late)
+        for package in late:
+            self.assertGreater(package.delivery_seconds, package.deadline_seconds)
+
+    # Packages due at the end of the day are warned about too when their route gets back after 17:00
+    def test_end_of_day_packages_go_to_callback(self):
+        """
+        Starting the day at 16:30, some routes reach their stops after 17:00, so packages with an EOD
+        deadline are warned about, and each of them is delivered after 17:00.
+        """
+        late = []
+        context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                 package_file=os.path.join(_ROOT, "WGUPS Package File.csv"), cache_directory=None,
+                                 warn_late=late.append)
+        packages = context.read_packages()
+        context.simulate_day(packages, datetime.datetime(1, 1, 1, 16, 30), datetime.datetime(1, 1, 1, 23, 59))
+
+        end_of_day = [package for package in late if package.deadline_seconds == Package.END_OF_DAY]
+        self.assertTrue(end_of_day)
+        for package in late:
+            self.assertGreater(package.delivery_seconds, package.deadline_seconds)
+
+
+if __name__ == "__main__":
+    unittest.main()
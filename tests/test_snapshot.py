@@ -0,0 +1,109 @@
+"""
+test_snapshot.py
+Tests saving the delivery day to snapshot files and restoring it.
+"""
+# Author: Zack Mathias | 010868562
+# Course: C950 - Data Structures and Algorithms II
+# Project: WGUPS Routing Program
+# File: test_snapshot.py
+# Purpose: Checks that a full snapshot and its incremental snapshots restore the packages, trucks, and event log
+
+# Standard Library
+import os
+import tempfile
+import unittest
+
+# Created Imports
+import Clock
+import Simulation
+import Snapshot
+from Context import RoutingContext
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Returns every field a snapshot saves for each package
+def package_fields(packages) -> dict:
+    """
+    Collects the snapshot's package columns from every package.
+    Args:
+        packages (PackageRepository): Packages to read.
+    Returns:
+        dict: Tuple of field values for each package id.
+    """
+    return {package.id: tuple(getattr(package, name) for name, _ in Snapshot.PACKAGE_COLUMNS)
+            for package in packages.values()}
+
+
+# Returns everything an event log records, as plain values
+def log_fields(log: Simulation.EventLog) -> tuple:
+    """
+    Collects the speed, every event, and every package timeline of an event log.
+    Args:
+        log (Simulation.EventLog): Event log to read.
+    Returns:
+        tuple: Speed, list of event fields, and timeline fields for each package id.
+    """
+    events = [tuple(getattr(event, name) for name in Simulation.Event.__slots__) for event in log.events]
+    timelines = {package_id: tuple(getattr(timeline, name) for name in Simulation.PackageTimeline.__slots__)
+                 for package_id, timeline in log.timelines.items()}
+    return log.speed, events, timelines
+
+
+# Saves the WGUPS day at several times and restores each chain of files
+class SnapshotRoundTripTest(unittest.TestCase):
+    """
+    Simulates the WGUPS day once, then snapshots it at several times.
+    """
+    # A full snapshot followed by incremental ones restores the day as it was at the last one
+    def test_full_then_incremental(self):
+        """
+        Writes a full snapshot at 9:00 and incremental ones at 10:30 and 13:00. After each file, the
+        chain so far is restored and its packages, trucks, and event log are compared with the day
+        at that time.
+        """
+        context = RoutingContext(distance_file=os.path.join(_ROOT, "WGUPS Distance Table.csv"),
+                                 package_file=os.path.join(_ROOT, "WGUPS Package File.csv"), cache_directory=None)
+        packages = context.read_packages()
+        log = Simulation.EventLog(context.speed)
+        log.capture(packages)
+        context.simulate_day(packages, Clock.to_datetime(8 * 3600), Clock.to_datetime(23 * 3600 + 59 * 60), log)
+        log.finish()
+
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            parent = None
+            for time in ("9:00", "10:30", "13:00"):
+                state = log.apply(packages, Clock.parse_seconds(time))
+                snapshot = Snapshot.capture(packages, state, log)
+                Snapshot.write_snapshot(os.path.join(directory, time + ".wgss"),
+                                        snapshot if parent is None else Snapshot.diff(parent, snapshot))
+                files.append(os.path.join(directory, time + ".wgss"))
+                parent = snapshot
+
+                restored = Snapshot.restore(files)
+                self.assertFalse(restored.incremental)
+                self.assertEqual(restored.time, state.time)
+
+                restored_packages = restored.to_packages(context.address_to_ids)
+                self.assertEqual(package_fields(restored_packages), package_fields(packages))
+
+                restored_state = restored.to_state(restored_packages)
+                self.assertEqual({number: [package.id for package in load]
+                                  for number, load in restored_state.trucks.items()},
+                                 {number: [package.id for package in load] for number, load in state.trucks.items()})
+                self.assertEqual(restored_state.distances, state.distances)
+                self.assertEqual([package.id for package in restored_state.waiting],
+                                 [package.id for package in state.waiting])
+                self.assertEqual([package.id for package in restored_state.delayed],
+                                 [package.id for package in state.delayed])
+
+                self.assertEqual(log_fields(restored.to_log()), log_fields(log))
+
+            # Only the first file is full, so a chain can't start from an incremental one
+            with self.assertRaises(ValueError):
+                Snapshot.restore(files[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()